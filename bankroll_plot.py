@@ -35,7 +35,17 @@ def main():
         df['GameNumber'] = df['GameNumber'].astype(int) + 1
 
         label = label_map.get(agent, agent.title())
-        plt.plot(df['GameNumber'], df['Bankroll'], label=label)
+        line, = plt.plot(df['GameNumber'], df['Bankroll'], label=label)
+
+        # Shade the replicate mean's confidence band when a summary exists
+        summary_path = os.path.join(data_dir, f'{agent}_replicates.csv')
+        if os.path.exists(summary_path):
+            summary = pd.read_csv(summary_path)
+            # Summaries written before the level was stored are 95% intervals
+            confidence = summary['confidence'].iloc[0] if 'confidence' in summary else 0.95
+            plt.fill_between(summary['game'] + 1, summary['ci_low'], summary['ci_high'],
+                             color=line.get_color(), alpha=0.2, linewidth=0,
+                             label=f'{label} mean {100 * confidence:g}% CI ({summary["replicates"].max()} runs)')
 
         final = df['Bankroll'].iloc[-1]
         plt.text(df['GameNumber'].iloc[-1], final, f'{final:.0f}', fontsize=8, ha='left', va='center')
@@ -1,7 +1,5 @@
-import numpy as np
 import csv
 import os
-import time
 from src.agents.classical_agent import ClassicalAgent
 from src.agents.quantum_agent import QuantumAgent
 from src.agents.qbist_agent import QBistAgent
@@ -22,44 +20,45 @@ def save_bankroll_history(filename, bankroll_history):
             writer.writerow([i, bankroll])
 
 def run_and_export():
-    rng = np.random.default_rng(seed=42)
+    seed = 42
     num_games = 100
 
-    agents = {
-        "Classical": ClassicalAgent(
+    agent_specs = [
+        ("Classical", ClassicalAgent, dict(
             payout_table=PAYOUT_TABLE,
             outcome_probs=OUTCOME_PROBS,
             flat_bets=FLAT_BETS,
             starting_bankroll=1000,
-            table_minimum=10),
-        "Quantum": QuantumAgent(
+            table_minimum=10)),
+        ("Quantum", QuantumAgent, dict(
             max_combo_size=10,
             max_dim=6,
             starting_bankroll=1000,
-            table_minimum=10),
-        "QBist": QBistAgent(
+            table_minimum=10)),
+        ("QBist", QBistAgent, dict(
             max_combo_size=10,
             max_dim=4,
             starting_bankroll=1000,
-            table_minimum=10),
-        "Random": RandomAgent(
+            table_minimum=10)),
+        ("Random", RandomAgent, dict(
             max_combo_size=10,
             starting_bankroll=1000,
-            table_minimum=10)
-    }
+            table_minimum=10))
+    ]
 
-    from src.simulator.simulator import simulate_agent
+    from src.simulator.parallel import run_agents_parallel
 
-    for name, agent in agents.items():
-        start_time = time.time()
-        bankroll_history = simulate_agent(agent, rng, num_games)
-        elapsed = time.time() - start_time
+    # Each agent plays its own dice stream spawned from `seed`, in parallel
+    for run in run_agents_parallel(agent_specs, seed, num_games):
+        name, bankroll_history = run.key, run.history
 
         print(f"{name} agent final bankroll after {num_games} games: ${bankroll_history[-1]:.2f}")
-        print(f"{name} agent simulation time: {elapsed:.4f} seconds")
+        print(f"{name} agent simulation time: {run.elapsed:.4f} seconds")
 
         save_bankroll_history(f"{name.lower()}_bankrolls.csv", bankroll_history)
         print(f"Saved bankroll history to {os.path.join(DATA_DIR, name.lower() + '_bankrolls.csv')}\n")
+        # Delete the history's spill file, if it grew past SPILL_AFTER games
+        bankroll_history.release()
 
 if __name__ == "__main__":
     run_and_export()
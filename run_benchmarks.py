@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# run_benchmarks.py
+
+"""
+Time the simulation hot paths and compare them with a saved baseline.
+
+    python run_benchmarks.py --save          # record data/benchmarks/baseline.json
+    python run_benchmarks.py                 # rerun and flag regressions
+"""
+
+import argparse
+import os
+import sys
+from src.utils.benchmark import (
+    run_suite, save_results, load_results, compare,
+    DEFAULT_COMBO_SIZES, DEFAULT_DIMS, DEFAULT_TOLERANCE
+)
+
+DEFAULT_BASELINE = os.path.join("data", "benchmarks", "baseline.json")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--save", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--output", help="also write this run's results to a JSON file")
+    parser.add_argument("--combo-sizes", type=int, nargs="+", default=list(DEFAULT_COMBO_SIZES))
+    parser.add_argument("--dims", type=int, nargs="+", default=list(DEFAULT_DIMS))
+    parser.add_argument("--games", type=int, default=200, help="games per simulate_agent call")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="flag benchmarks more than this fraction slower than the baseline")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.combo_sizes, args.dims, games=args.games, repeat=args.repeat)
+
+    if args.output:
+        save_results(args.output, results)
+
+    if args.save or not os.path.exists(args.baseline):
+        for name, seconds in sorted(results.items()):
+            print(f"{name:<45} {seconds * 1e6:>12.2f} µs")
+        save_results(args.baseline, results)
+        print(f"\n✅ Saved baseline to: {args.baseline}")
+        return 0
+
+    rows = compare(results, load_results(args.baseline), args.tolerance)
+    print(f"{'benchmark':<45} {'baseline µs':>12} {'now µs':>12} {'ratio':>7}")
+    for name, before, now, ratio, regressed in rows:
+        flag = "  ⚠️ regression" if regressed else ""
+        print(f"{name:<45} {before * 1e6:>12.2f} {now * 1e6:>12.2f} {ratio:>7.2f}{flag}")
+
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) more than {args.tolerance:.0%} slower than {args.baseline}")
+        return 1
+    print(f"\n✅ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,31 @@
 # src/agents/base_agent.py
 
 from abc import ABC, abstractmethod
-import re
+import inspect
+import numpy as np
+from simulator.bets import as_bet, COME_ODDS
+from simulator.table_state import TableState
+from simulator.payout_matrix import compile_payouts, PAYOUT_MATRIX
+from simulator.ledger import BetLedger
+from simulator.action_cache import composite_incidence, incidence_matrix
 
 class BaseAgent(ABC):
+    # Agents whose choice depends only on table state and bankroll can let the
+    # engine skip decisions when neither has changed since the last roll
+    deterministic_policy = False
+    # Whether only a pending come bet (rather than any come bet on the table)
+    # stops the agent from making another one; see TableState.game_state
+    come_flat_pending_only = True
+    # Constructor arguments that belong to a run's state rather than the
+    # agent's setup (see params)
+    run_state_params = ()
+
+    def __new__(cls, *args, **kwargs):
+        agent = super().__new__(cls)
+        # Kept so checkpoints can tell whether an agent is set up the same way
+        agent._init_args = (args, kwargs)
+        return agent
+
     def __init__(
         self,
         starting_bankroll=1000,
@@ -23,6 +45,12 @@ class BaseAgent(ABC):
         self.point_established = False
         self.active_come_points = set()
         self.current_point = None
+        self.table = TableState()
+        # Game state the legal actions were last built for (see run_state)
+        self.decision_state = None
+        # Atomic actions behind the cached composites last handed out
+        self._atomic = []
+        self._composites = None
 
     def adjust_bankroll(self, delta):
         self.bankroll += delta
@@ -30,10 +58,54 @@ class BaseAgent(ABC):
     def start_new_game(self):
         self.bankroll = self.initial_bankroll
         self.bets.clear()
-        self.legal_actions.clear()
+        self.legal_actions = []  # may be a shared, cached list; never clear in place
         self.point_established = False
         self.active_come_points = set()
         self.current_point = None
+        self.table.reset()
+
+    def game_state(self):
+        self.decision_state = self.table.game_state(self.current_point, self.active_come_points,
+                                                    self.table_min, self.come_flat_pending_only)
+        return self.decision_state
+
+    def params(self):
+        """
+        The agent's setup: every constructor argument by name, defaults
+        filled in, less run_state_params.
+        """
+        params = {}
+        for cls in reversed(type(self).__mro__):
+            init = cls.__dict__.get('__init__')
+            if init is not None:
+                params.update((param.name, param.default) for param in inspect.signature(init).parameters.values()
+                              if param.default is not param.empty)
+
+        signature = inspect.signature(type(self).__init__)
+        args, kwargs = self._init_args
+        for name, value in signature.bind(self, *args, **kwargs).arguments.items():
+            kind = signature.parameters[name].kind
+            if kind == inspect.Parameter.VAR_KEYWORD:
+                params.update(value)
+            elif kind != inspect.Parameter.VAR_POSITIONAL and name != 'self':
+                params[name] = value
+        for name in self.run_state_params:
+            params.pop(name, None)
+        return params
+
+    def run_state(self):
+        """
+        What a run carries from one game to the next, for checkpoints: the
+        bankroll and the game state of the last decision (its legal actions
+        are looked up again on restore rather than saved).
+        """
+        return {'bankroll': self.bankroll, 'decision_state': self.decision_state}
+
+    def restore_run_state(self, state):
+        self.bankroll = state['bankroll']
+        self.decision_state = state['decision_state']
+        if self.decision_state is not None:
+            self.update_action_space(self.decision_state)
 
     def can_continue(self):
         return (
@@ -41,14 +113,111 @@ class BaseAgent(ABC):
             and (self.walkaway_threshold is None or self.bankroll < self.walkaway_threshold)
         )
 
+    @property
+    def bets(self):
+        # The BetLedger of bets on the table
+        return self._bets
+
+    @bets.setter
+    def bets(self, placed):
+        self._bets = placed if isinstance(placed, BetLedger) else BetLedger(placed)
+
+    @property
+    def payout_table(self):
+        # The payout dict; the engine reads the compiled self.payouts
+        return self.payouts.table
+
+    @payout_table.setter
+    def payout_table(self, table):
+        # Assign a new dict rather than editing one in place, so it is recompiled
+        self.payouts = compile_payouts(table)
+
     def lookup_payout(self, key, outcome):
         """
         Look up the payout for a given (bet_type, outcome) key from the payout table.
         """
         return self.payout_table.get((key, outcome), 0.0)
 
+    def resolve_game(self, outcome):
+        """
+        Settle every bet on the table under `outcome`: lost bets (negative
+        multiples) leave the table, winners pay amount * multiple.
+        """
+        paid = self.bets.settle(self._settlement_rates(outcome))
+        if paid:
+            self.adjust_bankroll(paid)
+
+    def _settlement_rates(self, outcome):
+        # One payout multiple per bet on the table, in list order
+        return PAYOUT_MATRIX.matrix(self.bets.records(), [outcome])[:, 0]
+
+    def _atomic_payout(self, bet):
+        # Payout of a single bet when it wins
+        return self.lookup_payout((as_bet(bet).key, 'win'), 'win')
+
+    def _atomic_payouts(self, atomic_set):
+        # A composite's payout is the sum of its atomic actions' payouts
+        return np.array([self._atomic_payout(bet) for bet in atomic_set], dtype=float)
+
+    def _atomic_amounts(self, atomic_set):
+        return np.array([self._get_bet_amount(bet) for bet in atomic_set], dtype=float)
+
+    # --- Scoring composites as states ---
+
+    @staticmethod
+    def composite_vectors(members, d):
+        """
+        |A> for every composite at once: row A of `members` marks the atomic
+        actions in composite A, and |A> puts 1/sqrt(|A|) on each of them that
+        falls within the first d basis states.
+        """
+        sizes = members.sum(axis=1)
+        vectors = np.zeros((len(members), d))
+        basis = min(d, members.shape[1])
+        vectors[:, :basis] = members[:, :basis] / np.sqrt(sizes)[:, None]
+        return vectors
+
+    def _composite_members(self):
+        """
+        legal_actions' atomic actions as sorted Bets, and the incidence
+        matrix of the composites over them (rows in legal_actions order).
+        Composites from the action cache share one incidence matrix per
+        atomic count, with its columns put in bet order.
+        """
+        if self.legal_actions is self._composites:
+            atomic = [as_bet(bet) for bet in self._atomic]
+            order = sorted(range(len(atomic)), key=atomic.__getitem__)
+            incidence = composite_incidence(len(atomic), self.action_cache.max_combo_size)
+            return [atomic[i] for i in order], incidence[:, order]
+        atomic_set = sorted({as_bet(bet) for combo in self.legal_actions for bet in combo})
+        return incidence_matrix(self.legal_actions, atomic_set)
+
+    def _best_weighted_composite(self, weigh, max_dim):
+        """
+        The affordable composite with the highest weigh(members, d) times its
+        payout, where d = len(atomic actions) clamped to [2, max_dim]. Ties go
+        to the composite whose sorted bets come first.
+        """
+        if not self.legal_actions:
+            return None
+        atomic_set, members = self._composite_members()
+        d = max(2, min(len(atomic_set), max_dim))
+
+        affordable = np.flatnonzero(members @ self._atomic_amounts(atomic_set) <= self.bankroll)
+        if not len(affordable):
+            return None
+        members = members[affordable]
+        scores = weigh(members, d) * (members @ self._atomic_payouts(atomic_set))
+
+        # Sorted member columns, padded so a composite sorts before its extensions
+        best = np.flatnonzero(scores == scores.max())
+        n = members.shape[1]
+        keys = np.sort(np.where(members[best] > 0, np.arange(n), n), axis=1)
+        keys[keys == n] = -1
+        return self.legal_actions[affordable[best[np.lexsort(keys.T[::-1])[0]]]]
+
     def can_afford_action(self, action):
-        total = sum(self._get_bet_amount(bet_str) for bet_str in action)
+        total = sum(self._get_bet_amount(bet) for bet in action)
         return self.bankroll >= total
 
     @abstractmethod
@@ -67,17 +236,33 @@ class BaseAgent(ABC):
     def place_bets(self, action):
         pass
 
-    def _get_bet_amount(self, bet_str):
-        if bet_str.startswith('pass_line_odds_$'):
-            match = re.match(r'pass_line_odds_\$(\d+)', bet_str)
-            return int(match.group(1)) if match else self.table_min
-        elif bet_str.startswith('come_odds_$'):
-            match = re.match(r'come_odds_\$(\d+)_\d+', bet_str)
-            return int(match.group(1)) if match else self.table_min
-        else:
-            return self.table_min
-
-    def _extract_come_point(self, bet_str):
-        import re
-        match = re.match(r'come_odds_\$\d+_(\d+)', bet_str)
-        return int(match.group(1)) if match else None
+    def _get_bet_amount(self, bet):
+        # Flat bets carry no amount of their own; they are sized by the table minimum
+        amount = as_bet(bet).amount
+        return self.table_min if amount is None else amount
+
+    def _extract_come_point(self, bet):
+        return as_bet(bet).point
+
+    def add_bet(self, bet, amount):
+        """
+        Put a bet on the table: record it, take the stake from the bankroll
+        and update the incremental table state.
+        """
+        placed = self._make_bet(bet, amount)
+        record = placed['bet']
+        self._bets.add(placed, record)
+        self.adjust_bankroll(-amount)
+        self.table.record_bet(record, amount)
+        return placed
+
+    def _make_bet(self, bet, amount):
+        """
+        Build the placed-bet dict for a Bet (or label). The label is kept under
+        'type' for output; the record itself rides along under 'bet'.
+        """
+        bet = as_bet(bet)
+        placed = {'type': bet.label, 'amount': amount, 'bet': bet}
+        if bet.kind == COME_ODDS:
+            placed['point'] = bet.point
+        return placed
@@ -1,15 +1,33 @@
 # src/agents/classical_agent.py
 
+import numpy as np
 from agents.base_agent import BaseAgent
 from simulator.atomic_actions import AtomicActionGenerator
-from itertools import combinations
-import re
+from simulator.action_cache import get_action_cache, composite_incidence, incidence_matrix
+from simulator.bets import BETS, as_bet
+from simulator.composite_search import best_composite, quantize_scores
+from simulator.ev_table import point_ev_table, POINT_INDEX
+
+SEARCH_MODES = ('exhaustive', 'branch_and_bound')
+# 'point' (the default): true EV given the point (see ev_table); 'outcomes': EV
+# over the agent's outcome_probs, which prices every bet as an even-money coin flip
+EV_MODELS = ('outcomes', 'point')
 
 
 class ClassicalAgent(BaseAgent):
-    def __init__(self, payout_table=None, name="classical", outcome_probs=None, flat_bets=None, max_combo_size=6, **kwargs):
+    deterministic_policy = True
+
+    def __init__(self, payout_table=None, name="classical", outcome_probs=None, flat_bets=None, max_combo_size=6,
+                 search='exhaustive', ev_model='point', **kwargs):
         super().__init__(payout_table=payout_table, **kwargs)
 
+        if search not in SEARCH_MODES:
+            raise ValueError(f"search must be one of {SEARCH_MODES}")
+        self.search = search
+        if ev_model not in EV_MODELS:
+            raise ValueError(f"ev_model must be one of {EV_MODELS}")
+        self.ev_model = ev_model
+
         self.outcome_probs = outcome_probs or {
             'win': 0.4929,
             'lose': 0.5071
@@ -18,119 +36,134 @@ class ClassicalAgent(BaseAgent):
         self.flat_bets = flat_bets or ['pass_line_flat', 'come_flat']
         self.max_combo_size = max_combo_size
         self.action_gen = AtomicActionGenerator()
+        self.action_cache = get_action_cache(max_combo_size)
         self.name = name
 
+        # EV per bet code under outcome_probs, and what it was computed from
+        self._bet_evs = None
+        self._bet_evs_key = None
+
     def place_pass_line_bet(self):
         if self.bankroll >= self.table_min:
-            bet = {'type': 'pass_line_flat', 'amount': self.table_min}
-            self.bets.append(bet)
-            self.adjust_bankroll(-self.table_min)
-
-    def update_action_space(self):
-        game_state = {
-            'pass_line_odds_levels': sorted([
-                self._extract_odds_amount(bet['type'])
-                for bet in self.bets
-                if bet['type'].startswith('pass_line_odds_')
-            ]),
-            'come_flat_active': any(b['type'] == 'come_flat' and 'point' not in b for b in self.bets),
-            'active_come_points': sorted(self.active_come_points),
-            'come_odds_levels': {},
-            'current_point': self.current_point,
-            'table_min': self.table_min,
-        }
-
-        for bet in self.bets:
-            if bet['type'].startswith('come_odds_'):
-                _, pt = self._parse_come_odds(bet['type'])
-                pt_str = str(pt)
-                if pt_str not in game_state['come_odds_levels']:
-                    game_state['come_odds_levels'][pt_str] = []
-                game_state['come_odds_levels'][pt_str].append(bet['amount'])
-
-        atomic = self.action_gen.generate_atomic_actions(game_state)
-        self.legal_actions = self._enumerate_composites(atomic)
+            self.add_bet('pass_line_flat', self.table_min)
+
+    def update_action_space(self, game_state=None):
+        state = self.game_state() if game_state is None else game_state
+        if self.search == 'branch_and_bound':
+            # Composites are searched directly and never enumerated
+            atomic = self.action_cache.lookup_atomic(state)
+            self.legal_actions = []
+        else:
+            atomic, self.legal_actions = self.action_cache.lookup(state)
+        self.action_gen.latest_atomic_actions = atomic
+        self._atomic = atomic
+        self._composites = self.legal_actions
 
     def choose_action(self):
+        """
+        Highest-EV affordable composite, breaking ties by the smallest total
+        wager (committed flat bets are the same for every composite, so they
+        cannot change the order) and then by enumeration order.
+        """
+        if self.search == 'branch_and_bound' and self.legal_actions is self._composites:
+            return self._search_composite()
         if not self.legal_actions:
             return None
-        legal = [a for a in self.legal_actions if self.can_afford_action(a)]
-        if not legal:
-            return None
 
-        max_ev = float('-inf')
-        best_actions = []
+        atomic, incidence = self._composite_matrix()
+        wagers = incidence @ self._atomic_amounts(atomic)
+        affordable = wagers <= self.bankroll
+        if not affordable.any():
+            return None
 
-        for combo in self.legal_actions:
-            ev = self.compute_expected_value(combo)
-            if ev > max_ev:
-                max_ev = ev
-                best_actions = [combo]
-            elif ev == max_ev:
-                best_actions.append(combo)
+        # Integer scores make composite EVs exact sums of atomic EVs
+        scores = incidence @ self.atomic_scores(atomic)
+        scores[~affordable] = -np.inf
+        best = np.flatnonzero(scores == scores.max())
+        return self.legal_actions[best[np.argmin(wagers[best])]]
+
+    def composite_expected_values(self, atomic, incidence):
+        """
+        EV of every composite at once: payout by outcome for each atomic
+        action, summed per composite through the incidence matrix, then
+        weighted by outcome probability.
+        """
+        totals = incidence @ self._payoff_matrix(atomic)
+        ev = np.zeros(len(incidence))
+        for j, prob in enumerate(self.outcome_probs.values()):
+            ev += prob * totals[:, j]
+        return ev
 
-        # Break ties by minimizing total wager
-        def total_wager(action):
-            wager = sum(self._get_bet_amount(bet) for bet in action)
-            committed = sum(b['amount'] for b in self.bets if b['type'] in ('pass_line_flat', 'come_flat'))
-            return wager + committed
+    def atomic_expected_values(self, atomic):
+        # Table reads by bet code (the bets are registered, so every code
+        # has a row); neither model depends on the bankroll
+        codes = np.fromiter((as_bet(bet).code for bet in atomic), dtype=np.intp, count=len(atomic))
+        if self.ev_model == 'point':
+            return point_ev_table(self.table_min, self.payouts)[codes, POINT_INDEX[self.current_point]]
+        return self._outcome_evs()[codes]
 
-        return min(best_actions, key=total_wager)
+    def atomic_scores(self, atomic):
+        # Atomic EVs as exact integers; a composite scores the sum of its bets
+        return quantize_scores(self.atomic_expected_values(atomic))
 
     def compute_expected_value(self, combo):
         ev = 0.0
         for outcome, prob in self.outcome_probs.items():
             payout = 0.0
-            for bet_str in combo:
-                payout += self.payout_table.get(((bet_str.lower(),), outcome), 0.0)
+            for bet in combo:
+                payout += self.payouts.rate(bet, outcome)
             ev += prob * payout
         return ev
 
     def place_bets(self, action):
         if not action or not self.can_afford_action(action):
             return
-        for bet_str in action:
-            amt = self._get_bet_amount(bet_str)
+        for bet in action:
+            amt = self._get_bet_amount(bet)
             if amt is None or amt < self.table_min or self.bankroll < amt:
                 continue
 
-            bet = {'type': bet_str.lower(), 'amount': amt}
-
-            if 'come_odds_' in bet_str:
-                bet['point'] = self._extract_come_point(bet_str)
-
-            self.bets.append(bet)
-            self.adjust_bankroll(-amt)
+            self.add_bet(bet, amt)
 
     # --- Internal Utilities ---
 
-    def _enumerate_composites(self, atomic):
-        all_combos = []
-        for r in range(1, min(len(atomic), self.max_combo_size) + 1):
-            all_combos.extend(combinations(atomic, r))
-        return [list(combo) for combo in all_combos]
-
-    def _extract_odds_amount(self, bet_type):
-        match = re.match(r'pass_line_odds_\$(\d+)', bet_type)
-        return int(match.group(1)) if match else None
-
-    def _parse_come_odds(self, bet_type):
-        match = re.match(r'come_odds_\$(\d+)_([4-6]|[8-9]|10)', bet_type)
-        if match:
-            amt = int(match.group(1))
-            pt = int(match.group(2))
-            return amt, pt
-        return None, None
-
-    def resolve_game(self, outcome):
-        remaining = []
-        for bet in self.bets:
-            key = ((bet['type'],), outcome)
-            mult = self.lookup_payout(key, outcome)
-            if mult < 0:
-                continue  # lost
-            if mult > 0:
-                self.adjust_bankroll(bet['amount'] * mult)
-            remaining.append(bet)
-        self.bets = remaining
+    def _search_composite(self):
+        atomic = self._atomic
+        members = best_composite(
+            self.atomic_scores(atomic),
+            self._atomic_amounts(atomic),
+            self.max_combo_size,
+            self.bankroll
+        )
+        if members is None:
+            return None
+        return tuple(atomic[i] for i in members)
+
+    def _outcome_evs(self):
+        # EV of every registered bet under outcome_probs, rebuilt only when
+        # the payouts, the probabilities or the set of bets change
+        key = (self.payouts, tuple(self.outcome_probs.items()), len(BETS))
+        if key != self._bet_evs_key:
+            payoff = self._payoff_matrix(BETS[:key[2]])
+            ev = np.zeros(len(payoff))
+            for j, prob in enumerate(self.outcome_probs.values()):
+                ev += prob * payoff[:, j]
+            self._bet_evs = ev
+            self._bet_evs_key = key
+        return self._bet_evs
+
+    def _payoff_matrix(self, atomic):
+        # Payout of each atomic action under each outcome
+        return self.payouts.matrix(atomic, list(self.outcome_probs))
+
+    def _composite_matrix(self):
+        # Cached composites share an incidence matrix per atomic count;
+        # anything else (e.g. hand-built legal_actions) is indexed directly
+        if self.legal_actions is self._composites:
+            return self._atomic, composite_incidence(len(self._atomic), self.max_combo_size)
+        return incidence_matrix(self.legal_actions)
+
+    def _settlement_rates(self, outcome):
+        # Rates from the agent's own payout dict, keyed as lookup_payout expects
+        return [self.lookup_payout((bet.key, outcome), outcome) for bet in self.bets.records()]
 
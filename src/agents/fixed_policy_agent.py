@@ -0,0 +1,68 @@
+# src/agents/fixed_policy_agent.py
+
+from agents.base_agent import BaseAgent
+from simulator.atomic_actions import legal_odds_bet_amounts, MAX_MULTIPLIER
+from simulator.payouts import PAYOUT_TABLE
+from simulator.bets import get_bet, COME_FLAT, PASS_LINE_ODDS, COME_ODDS
+
+
+class FixedPolicyAgent(BaseAgent):
+    """
+    Baseline strategy: pass line, odds at a constant multiple behind the
+    pass line and every come point, and at most `max_come_bets` come bets
+    on the table at once.
+
+    This is the scalar reference for simulator.vector_engine, which plays
+    the same policy for many games at once.
+    """
+
+    deterministic_policy = True
+
+    def __init__(self, odds_multiple=1, max_come_bets=0, name="fixed", payout_table=None, **kwargs):
+        super().__init__(payout_table=payout_table or PAYOUT_TABLE, **kwargs)
+        if not 0 <= odds_multiple <= MAX_MULTIPLIER:
+            raise ValueError(f"odds_multiple must be between 0 and {MAX_MULTIPLIER}")
+        self.odds_multiple = odds_multiple
+        self.max_come_bets = max_come_bets
+        self.name = name
+
+    def place_pass_line_bet(self):
+        if self.bankroll >= self.table_min:
+            self.add_bet('pass_line_flat', self.table_min)
+
+    def update_action_space(self):
+        action = []
+        table = self.table
+
+        if self.odds_multiple and self.current_point is not None:
+            if not table.pass_line_odds_levels:
+                amt = self._odds_amount(self.current_point)
+                action.append(get_bet(PASS_LINE_ODDS, amt))
+
+        if self.odds_multiple:
+            for pt in sorted(self.active_come_points):
+                if pt not in table.come_odds_levels:
+                    amt = self._odds_amount(pt)
+                    action.append(get_bet(COME_ODDS, amt, int(pt)))
+
+        if not table.pending_come and table.come_bets < self.max_come_bets:
+            action.append(get_bet(COME_FLAT))
+
+        self.legal_actions = [action] if action else []
+
+    def choose_action(self):
+        return self.legal_actions[0] if self.legal_actions else None
+
+    def place_bets(self, action):
+        if not action or not self.can_afford_action(action):
+            return
+        for bet in action:
+            amt = self._get_bet_amount(bet)
+            self.add_bet(bet, amt)
+
+    def resolve_game(self, outcome):
+        # Only called on a seven-out, which takes down every bet on the table
+        self.bets.clear()
+
+    def _odds_amount(self, point):
+        return legal_odds_bet_amounts(point, self.odds_multiple)[-1]
@@ -1,101 +1,76 @@
 # src/agents/quantum_agent.py
 
-import itertools
 import numpy as np
 from agents.base_agent import BaseAgent
 from simulator.atomic_actions import AtomicActionGenerator
-from simulator.payouts import PAYOUT_TABLE
-from simulator.game_engine import build_game_state
-import re
+from simulator.action_cache import get_action_cache
 
 class QuantumAgent(BaseAgent):
-    def __init__(self, max_dim=6, name="quantum", **kwargs):
+    deterministic_policy = True
+    # Any come bet on the table, pending or travelled, stops another
+    come_flat_pending_only = False
+
+    def __init__(self, max_dim=6, name="quantum", rho=None, **kwargs):
+        """
+        `rho` is the belief state used to score actions: None for the
+        maximally mixed state, a callable returning a d x d density matrix
+        for dimension d, or a square matrix of at least max_dim x max_dim
+        whose leading d x d block (renormalized to unit trace) is used.
+        """
         super().__init__(**kwargs)
         self.max_dim = max_dim
+        self.rho = rho
         self.action_gen = AtomicActionGenerator()
+        self.action_cache = get_action_cache(3)  # composites of up to three bets
         self.name = name
 
     def place_pass_line_bet(self):
         if self.bankroll >= self.table_min:
-            self.bets.append({'type': 'pass_line_flat', 'amount': self.table_min})
-            self.adjust_bankroll(-self.table_min)
+            self.add_bet('pass_line_flat', self.table_min)
 
     def update_action_space(self, game_state=None):
         if game_state is None:
-            game_state = build_game_state(self)
-        atomic_actions = self.action_gen.generate_atomic_actions(game_state)
-        self.legal_actions = []
-        n = len(atomic_actions)
-        for r in range(1, min(n, 3) + 1):
-            self.legal_actions.extend(list(itertools.combinations(atomic_actions, r)))
+            game_state = self.game_state()
+        atomic_actions, self.legal_actions = self.action_cache.lookup(game_state)
+        self.action_gen.latest_atomic_actions = atomic_actions
+        self._atomic = atomic_actions
+        self._composites = self.legal_actions
 
     def choose_action(self):
-        if not self.legal_actions:
-            return None
-
-        atomic_set = sorted({a for combo in self.legal_actions for a in combo})
-        d = max(2, min(len(atomic_set), self.max_dim))  # ensure d >= 2
-        rho = np.eye(d) / d  # maximally mixed state
-
-        # ✅ Filter for affordable actions only
-        legal = sorted(
-            [a for a in self.legal_actions if self.can_afford_action(a)],
-            key=lambda x: tuple(sorted(x))
-        )
-
-        if not legal:
-            return None
-
-        scores = []
-        for combo in legal:
-            # Build unit vector |A⟩
-            action_vec = np.zeros((d, 1), dtype=float)
-            for atomic_label in combo:
-                if atomic_label in atomic_set:
-                    idx = atomic_set.index(atomic_label)
-                    if idx < d:
-                        action_vec[idx, 0] = 1 / np.sqrt(len(combo))
-
-            E_A = action_vec @ action_vec.T  # rank-1 projector
-            payout = self._lookup_composite_payout(combo)
-            score = np.trace(rho @ E_A) * payout
-            scores.append(score)
-
-        return legal[int(np.argmax(scores))] if scores else None
+        return self._best_weighted_composite(self.action_overlaps, self.max_dim)
+
+    def density_matrix(self, d):
+        """
+        d x d belief state used to score actions.
+        """
+        if self.rho is None:
+            return np.eye(d) / d  # maximally mixed state
+        if callable(self.rho):
+            rho = np.asarray(self.rho(d))
+        else:
+            rho = np.asarray(self.rho)[:d, :d]
+            rho = rho / np.trace(rho)
+        if rho.shape != (d, d):
+            raise ValueError(f"Density matrix must be {d}x{d}, got {rho.shape}")
+        return rho
+
+    def action_overlaps(self, members, d):
+        """
+        tr(rho E_A) for every composite at once. Row A of `members` marks the
+        atomic actions in composite A and E_A = |A><A| (see
+        composite_vectors), so the trace is the quadratic form <A|rho|A>.
+        """
+        vectors = self.composite_vectors(members, d)
+        rho = self.density_matrix(d)
+        return np.einsum('ci,ij,cj->c', vectors.conj(), rho, vectors, optimize=True).real
 
     def place_bets(self, action):
         if not action or not self.can_afford_action(action):
             return
 
-        for bet_str in action:
-            amt = self._get_bet_amount(bet_str)
+        for bet in action:
+            amt = self._get_bet_amount(bet)
             if amt is None or amt < self.table_min or self.bankroll < amt:
                 continue
 
-            bet = {'type': bet_str.lower(), 'amount': amt}
-
-            if 'come_odds_' in bet_str:
-                bet['point'] = self._extract_come_point(bet_str)
-
-            self.bets.append(bet)
-            self.adjust_bankroll(-amt)
-
-    def resolve_game(self, outcome):
-        remaining = []
-        for bet in self.bets:
-            key = ((bet['type'],), outcome)
-            mult = PAYOUT_TABLE.get(key, 0)
-            if mult < 0:
-                continue
-            if mult > 0:
-                self.adjust_bankroll(bet['amount'] * mult)
-            remaining.append(bet)
-        self.bets = remaining
-
-    def _lookup_composite_payout(self, combo):
-        total = 0.0
-        for bet_str in combo:
-            key = ((bet_str.lower(),), 'win')
-            payout = self.lookup_payout(key, 'win')
-            total += payout
-        return total
+            self.add_bet(bet, amt)
@@ -1,83 +1,78 @@
 # src/agents/random_agent.py
 
 import random
-import itertools
-import re
 from agents.base_agent import BaseAgent
 from simulator.atomic_actions import AtomicActionGenerator
-from simulator.payouts import PAYOUT_TABLE
-from simulator.game_engine import build_game_state
+from simulator.action_cache import get_action_cache
+from simulator.action_space import ActionSpace
 
 
 class RandomAgent(BaseAgent):
-    def __init__(self, max_combo_size=6, name="random", **kwargs,):
+    # Any come bet on the table, pending or travelled, stops another
+    come_flat_pending_only = False
+    # The stream actions are drawn from; its state is saved with the run
+    run_state_params = ('rng',)
+
+    def __init__(self, max_combo_size=6, name="random", rng=None, **kwargs,):
         super().__init__(**kwargs)
         self.action_gen = AtomicActionGenerator()
         self.max_combo_size = max_combo_size
+        self.action_cache = get_action_cache(max_combo_size)
         self.name = name
+        # Generator (or random.Random) actions are drawn from; the global
+        # `random` module by default, which parallel.seeded_rng seeds
+        self.rng = rng
+
+    def run_state(self):
+        state = super().run_state()
+        if self.rng is not None:
+            state['rng'] = (self.rng.bit_generator.state if hasattr(self.rng, 'bit_generator')
+                            else self.rng.getstate())
+        return state
+
+    def restore_run_state(self, state):
+        if self.rng is not None:
+            if hasattr(self.rng, 'bit_generator'):
+                self.rng.bit_generator.state = state['rng']
+            else:
+                self.rng.setstate(state['rng'])
+        super().restore_run_state(state)
 
     def place_pass_line_bet(self):
         if self.bankroll >= self.table_min:
-            self.bets.append({'type': 'pass_line_flat', 'amount': self.table_min})
-            self.adjust_bankroll(-self.table_min)
+            self.add_bet('pass_line_flat', self.table_min)
 
     def update_action_space(self, game_state=None):
         if game_state is None:
-            game_state = build_game_state(self)
-        atomic_actions = self.action_gen.generate_atomic_actions(game_state)
-        self.legal_actions = []
-        n = len(atomic_actions)
-        max_r = min(self.max_combo_size, n)
-        for r in range(1, max_r + 1):
-            self.legal_actions.extend(itertools.combinations(atomic_actions, r))
+            game_state = self.game_state()
+        # An ActionSpace: composites are unranked on demand, never listed
+        atomic_actions, self.legal_actions = self.action_cache.lookup_space(game_state)
+        self.action_gen.latest_atomic_actions = atomic_actions
 
     def choose_action(self):
         if not self.legal_actions:
             return None
+        rng = random if self.rng is None else self.rng
+
+        if isinstance(self.legal_actions, ActionSpace):
+            # Some composite is affordable exactly when the cheapest single bet is
+            if min(self._get_bet_amount(bet) for bet in self.legal_actions.atomic) > self.bankroll:
+                return None
+            return self.legal_actions.sample(rng)
 
         legal = [a for a in self.legal_actions if self.can_afford_action(a)]
         if not legal:
             return None
-        return random.choice(self.legal_actions)
+        if hasattr(rng, 'integers'):
+            return self.legal_actions[int(rng.integers(len(self.legal_actions)))]
+        return rng.choice(self.legal_actions)
 
     def place_bets(self, action):
         if not action or not self.can_afford_action(action):
             return
 
 
-        for bet_str in action:
-            amt = self._extract_bet_amount(bet_str)
+        for bet in action:
+            amt = self._get_bet_amount(bet)
             if self.bankroll >= amt:
-                bet = {'type': bet_str.lower(), 'amount': amt}
-                if 'come_odds_' in bet_str:
-                    bet['point'] = self._extract_come_point(bet_str)
-                self.bets.append(bet)
-                self.adjust_bankroll(-amt)
-
-    def resolve_game(self, outcome):
-        remaining = []
-        for bet in self.bets:
-            key = ((bet['type'],), outcome)
-            mult = PAYOUT_TABLE.get(key, 0)
-            if mult < 0:
-                continue
-            if mult > 0:
-                self.adjust_bankroll(bet['amount'] * mult)
-            remaining.append(bet)
-        self.bets = remaining
-
-    # --- Internal Utilities ---
-
-    def _extract_bet_amount(self, bet_str):
-        if bet_str.startswith('pass_line_odds_$'):
-            match = re.match(r'pass_line_odds_\$(\d+)', bet_str)
-            return int(match.group(1)) if match else self.table_min
-        elif bet_str.startswith('come_odds_$'):
-            match = re.match(r'come_odds_\$(\d+)_\d+', bet_str)
-            return int(match.group(1)) if match else self.table_min
-        else:
-            return self.table_min
-
-    def _extract_come_point(self, bet_str):
-        match = re.match(r'come_odds_\$\d+_(\d+)', bet_str)
-        return int(match.group(1)) if match else None
+                self.add_bet(bet, amt)
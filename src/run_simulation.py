@@ -3,10 +3,14 @@
 
 import os
 import json
+import argparse
 import importlib
 import numpy as np
 import pandas as pd
-from simulator.simulator import simulate_agent
+from simulator.parallel import run_agents_parallel
+from simulator.replicates import run_replicates, write_summary
+from simulator.dice import DiceTape
+from simulator.history import SPILL_AFTER
 
 # Load config files
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config", "config.json")
@@ -20,45 +24,87 @@ TABLE_MINIMUM = config["table_minimum"]
 # WALKAWAY_THRESHOLD = config["walkaway_threshold"] # Not currently using this, because no one profitable.
 SEED = config["fixed_seed"]
 AGENT_SPECS = config["agents"]
+WORKERS = config.get("workers")  # None: one process per agent, up to the CPU count
+REPLICATES = config.get("replicates", 0)  # extra independent runs per agent for CIs
+DICE_TAPE = config.get("dice_tape")  # file under data/ holding dice shared by every agent, suffixed with the seed
+TAPE_ROLLS_PER_GAME = 100  # tape length budget; games average well under 10 rolls
+PHASE_TIMING = config.get("phase_timing", False)  # per-phase play_game timings in diagnostics
+HISTORY_SPILL_AFTER = config.get("history_spill_after", SPILL_AFTER)  # games per history kept in RAM
+CHECKPOINT_EVERY = config.get("checkpoint_every")  # games between checkpoints; 0 for end of run only, unset for none
 
 # Output directory (This is just the csv's to export to)
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
 os.makedirs(DATA_DIR, exist_ok=True)
+CHECKPOINT_DIR = os.path.join(DATA_DIR, 'checkpoints')
 
-def main():
-    # Populate all
+def main(resume=False):
+    # Resolve every agent class up front; the simulations then run in parallel
+    agent_specs = []
     for agent_key, agent_info in AGENT_SPECS.items():
-        # Debug
-        print(f"\nSimulating: {agent_key.capitalize()} Agent")
-
         # Grab agent to update
         module = importlib.import_module(agent_info["module"])
         # Get actual agent by name
         AgentClass = getattr(module, agent_info["name"])
 
-        rng = np.random.default_rng(SEED)
-
-        # Update the specs for that agent (needed when running through
-        agent = AgentClass(
+        params = dict(
             starting_bankroll=STARTING_BANKROLL,
-            table_minimum=TABLE_MINIMUM
+            table_minimum=TABLE_MINIMUM,
             # walkaway_threshold=WALKAWAY_THRESHOLD unused right now
+            **agent_info.get("params", {})
         )
+        agent_specs.append((agent_key, AgentClass, params))
+
+    print(f"\nSimulating: {', '.join(key.capitalize() for key, _, _ in agent_specs)} Agents")
 
-        # Update history
-        history = simulate_agent(agent, rng, num_games=NUM_GAMES)
+    # Common random numbers: replay one saved tape for every agent, creating it if needed
+    tape_path = None
+    if DICE_TAPE:
+        # Named after SEED, so a run with another seed never replays this one's dice
+        stem, ext = os.path.splitext(DICE_TAPE)
+        tape_path = os.path.join(DATA_DIR, f"{stem}_seed{SEED}{ext}")
+        tape_length = NUM_GAMES * TAPE_ROLLS_PER_GAME
+        # A tape saved for fewer games would run out partway through every agent
+        if os.path.exists(tape_path) and len(DiceTape.load(tape_path)) < tape_length:
+            print(f" → Dice tape {tape_path} is too short for {NUM_GAMES} games; regenerating")
+            os.remove(tape_path)
+        if not os.path.exists(tape_path):
+            DiceTape.generate(np.random.default_rng(SEED), tape_length, path=tape_path)
+            print(f" → Dice tape written to {tape_path}")
 
-        # Get data to put in CSV (two columns)
+    # Each agent gets its own stream spawned from SEED; results come back in config order
+    # With checkpoint_every set (or --resume), checkpoints go to data/checkpoints/<agent>.ckpt
+    # and --resume picks up from them
+    checkpoint_dir = CHECKPOINT_DIR if CHECKPOINT_EVERY is not None or resume else None
+    runs = run_agents_parallel(agent_specs, SEED, NUM_GAMES, max_workers=WORKERS, tape=tape_path,
+                               phase_timing=PHASE_TIMING, spill_after=HISTORY_SPILL_AFTER,
+                               checkpoint_dir=checkpoint_dir, checkpoint_every=CHECKPOINT_EVERY, resume=resume)
+
+    for run in runs:
+        # Get data to put in CSV (two columns); the history array is used without copying
         df = pd.DataFrame({
-            'game': list(range(len(history))),
-            'bankroll': history
-        })
+            'game': np.arange(len(run.history)),
+            'bankroll': run.history.values
+        }, copy=False)
 
         # Basic CSV update
-        out_path = os.path.join(DATA_DIR, f"{agent_key}_bankrolls.csv")
+        out_path = os.path.join(DATA_DIR, f"{run.key}_bankrolls.csv")
         df.to_csv(out_path, index=False)
-        print(f" → Saved to {out_path}")
+        print(f" → {run.key.capitalize()} ({run.elapsed:.2f}s) saved to {out_path}")
+        run.history.release()
+
+    # Per-game mean and confidence intervals over independent replicates
+    if REPLICATES > 1:
+        # Replicate streams descend from a child of SEED the single runs above never use
+        streams = np.random.SeedSequence(SEED).spawn(len(agent_specs) + 1)[-1].spawn(len(agent_specs))
+        for (agent_key, AgentClass, params), stream in zip(agent_specs, streams):
+            stats = run_replicates(AgentClass, params, REPLICATES, NUM_GAMES, stream, max_workers=WORKERS)
+            out_path = os.path.join(DATA_DIR, f"{agent_key}_replicates.csv")
+            write_summary(stats, out_path)
+            print(f" → {agent_key.capitalize()}: {REPLICATES} replicates summarized in {out_path}")
 
 # Run main when when file called
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Simulate the agents in config/config.json")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue each agent from its last checkpoint in data/checkpoints")
+    main(resume=parser.parse_args().resume)
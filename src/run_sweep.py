@@ -0,0 +1,29 @@
+# Runs a parameter sweep (see simulator/sweep.py) from a JSON grid spec.
+# Cells already computed with the same code are read back instead of rerun.
+
+import os
+import json
+import argparse
+from simulator.sweep import run_sweep, SWEEP_DIR
+
+SWEEP_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config", "sweep.json")
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+def main(spec_path=SWEEP_CONFIG_PATH, workers=None):
+    with open(spec_path, "r") as f:
+        spec = json.load(f)
+
+    summary = run_sweep(spec, results_dir=SWEEP_DIR, max_workers=workers)
+    computed = int((~summary['cached']).sum())
+    print(f"\nSweep: {len(summary)} cells, {computed} computed, {len(summary) - computed} cached")
+
+    out_path = os.path.join(DATA_DIR, "sweep_summary.csv")
+    summary.to_csv(out_path, index=False)
+    print(f" → Summary saved to {out_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a parameter sweep over agent configurations")
+    parser.add_argument("spec", nargs="?", default=SWEEP_CONFIG_PATH, help="JSON grid spec (config/sweep.json)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+    main(args.spec, args.workers)
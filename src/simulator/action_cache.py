@@ -0,0 +1,163 @@
+# src/simulator/action_cache.py
+
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+from itertools import combinations
+import numpy as np
+from simulator.atomic_actions import AtomicActionGenerator
+from simulator.action_space import ActionSpace
+from simulator.bets import as_bet
+
+DEFAULT_MAXSIZE = 4096
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+def state_key(game_state):
+    """
+    Canonical, hashable form of the parts of a game state that determine the
+    atomic action set.
+    """
+    points = tuple(game_state.get('active_come_points', ()))
+    come_odds_levels = game_state.get('come_odds_levels', {})
+    return (
+        game_state.get('current_point'),
+        tuple(sorted(game_state.get('pass_line_odds_levels', ()))),
+        bool(game_state.get('come_flat_active', False)),
+        points,
+        tuple(tuple(sorted(come_odds_levels.get(str(pt), ()))) for pt in points),
+    )
+
+
+def enumerate_composites(atomic, max_combo_size):
+    composites = []
+    for r in range(1, min(len(atomic), max_combo_size) + 1):
+        composites.extend(combinations(atomic, r))
+    return composites
+
+
+@lru_cache(maxsize=32)
+def composite_incidence(num_atomic, max_combo_size):
+    """
+    0/1 matrix with one row per composite (in enumerate_composites order)
+    and one column per atomic action. It only depends on how many atomic
+    actions there are, so it is shared by every state of that size.
+    """
+    rows = []
+    for r in range(1, min(num_atomic, max_combo_size) + 1):
+        members = np.array(list(combinations(range(num_atomic), r)), dtype=np.intp)
+        block = np.zeros((len(members), num_atomic))
+        block[np.arange(len(members))[:, None], members] = 1.0
+        rows.append(block)
+    if not rows:
+        return np.zeros((0, num_atomic))
+    incidence = np.vstack(rows)
+    incidence.setflags(write=False)
+    return incidence
+
+
+def incidence_matrix(composites, atomic=None):
+    """
+    Atomic actions (as Bets) and the 0/1 incidence matrix for an arbitrary
+    list of composites. Columns follow `atomic` when given (every bet in the
+    composites must be in it), otherwise order of first appearance.
+    """
+    index = {} if atomic is None else {as_bet(bet): i for i, bet in enumerate(atomic)}
+    rows = []
+    for combo in composites:
+        rows.append([index.setdefault(as_bet(bet), len(index)) for bet in combo])
+    incidence = np.zeros((len(composites), len(index)))
+    for i, members in enumerate(rows):
+        incidence[i, members] = 1.0
+    return list(index), incidence
+
+
+class ActionSpaceCache:
+    """
+    Bounded LRU cache from canonical table state to the atomic actions and
+    the composites (all combinations up to `max_combo_size`) built from them.
+
+    Composites are only enumerated the first time a state is looked up with
+    lookup(); lookup_atomic() and lookup_space() never enumerate them. The
+    returned lists are shared between every agent using the cache and must
+    be treated as read-only.
+    """
+
+    def __init__(self, max_combo_size, maxsize=DEFAULT_MAXSIZE):
+        self.max_combo_size = max_combo_size
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._generator = AtomicActionGenerator()
+
+    def __reduce__(self):
+        # Entries are rebuilt on demand, so a pickled cache travels empty;
+        # a shared cache unpickles as the shared cache of the new process
+        if _SHARED_CACHES.get(self.max_combo_size) is self:
+            return (get_action_cache, (self.max_combo_size, self.maxsize))
+        return (ActionSpaceCache, (self.max_combo_size, self.maxsize))
+
+    def lookup(self, game_state):
+        """
+        Return (atomic_actions, composite_actions) for a game state.
+        """
+        entry = self._entry(game_state)
+        if entry[1] is None:
+            entry[1] = enumerate_composites(entry[0], self.max_combo_size)
+        return entry[0], entry[1]
+
+    def lookup_space(self, game_state):
+        """
+        Return (atomic_actions, ActionSpace) for a game state; the space
+        indexes the same composites as lookup() without building them.
+        """
+        entry = self._entry(game_state)
+        if entry[2] is None:
+            entry[2] = ActionSpace(entry[0], self.max_combo_size)
+        return entry[0], entry[2]
+
+    def lookup_atomic(self, game_state):
+        """
+        Return just the atomic actions for a game state.
+        """
+        return self._entry(game_state)[0]
+
+    def _entry(self, game_state):
+        # [atomic_actions, composite_actions or None, ActionSpace or None]
+        key = state_key(game_state)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        entry = [self._generator.generate_atomic_actions(game_state), None, None]
+        self._entries[key] = entry
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def cache_info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def cache_clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_SHARED_CACHES = {}
+
+
+def get_action_cache(max_combo_size, maxsize=DEFAULT_MAXSIZE):
+    """
+    Cache shared by every agent in this process that builds composites up to
+    `max_combo_size`.
+    """
+    cache = _SHARED_CACHES.get(max_combo_size)
+    if cache is None:
+        cache = ActionSpaceCache(max_combo_size, maxsize)
+        _SHARED_CACHES[max_combo_size] = cache
+    return cache
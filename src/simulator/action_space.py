@@ -0,0 +1,211 @@
+# src/simulator/action_space.py
+
+"""
+Composite action spaces that are never materialized.
+
+A state's composites are every combination of 1..max_combo_size of its
+atomic actions, which at larger combo sizes runs to tens of thousands of
+tuples. An ActionSpace stands in for that list: it knows its length and
+produces the composite at any position by unranking it from binomial
+counts, so agents that only need a few composites (RandomAgent draws one)
+never build the rest.
+
+Positions follow enumerate_composites: by size, then in
+itertools.combinations order, so an ActionSpace and the list it replaces
+index the same composites.
+"""
+
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+
+
+@lru_cache(maxsize=64)
+def _binomials(n):
+    # table[m][r] = C(m, r) for 0 <= m, r <= n
+    return tuple(tuple(comb(m, r) for r in range(n + 1)) for m in range(n + 1))
+
+
+class ActionSpace:
+    """
+    Read-only sequence of the composites of `atomic` up to
+    `max_combo_size` actions, built on demand.
+
+    Besides len(), indexing and iteration, composites can be moved between
+    three forms: position (index/rank), member indices into `atomic`
+    (unrank_indices) and bitmask (bit i set for atomic[i]).
+    """
+
+    __slots__ = ('atomic', 'max_combo_size', '_comb', '_starts', '_len', '_positions')
+
+    def __init__(self, atomic, max_combo_size):
+        self.atomic = atomic
+        self.max_combo_size = max_combo_size
+        n = len(atomic)
+        self._comb = _binomials(n)
+
+        # _starts[r - 1] = position of the first composite of size r
+        self._starts = []
+        total = 0
+        for r in range(1, min(n, max_combo_size) + 1):
+            self._starts.append(total)
+            total += self._comb[n][r]
+        self._len = total
+        self._positions = None
+
+    def __len__(self):
+        return self._len
+
+    def __repr__(self):
+        return f"ActionSpace({len(self.atomic)} atomic actions, {self._len} composites)"
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._len))]
+        atomic = self.atomic
+        return tuple(atomic[i] for i in self.unrank_indices(index))
+
+    def __iter__(self):
+        for r in range(1, len(self._starts) + 1):
+            yield from combinations(self.atomic, r)
+
+    def __contains__(self, composite):
+        try:
+            self.index(composite)
+        except ValueError:
+            return False
+        return True
+
+    # --- Ranking ---
+
+    def unrank_indices(self, index):
+        """
+        Member indices (ascending) of the composite at `index`.
+        """
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("ActionSpace index out of range")
+
+        r = bisect_right(self._starts, index)
+        rank = index - self._starts[r - 1]
+
+        # Walk the combinations of size r in lexicographic order, skipping
+        # whole blocks that start with the same member
+        n, table = len(self.atomic), self._comb
+        members = []
+        c = 0
+        for remaining in range(r - 1, -1, -1):
+            while True:
+                block = table[n - c - 1][remaining]
+                if rank < block:
+                    break
+                rank -= block
+                c += 1
+            members.append(c)
+            c += 1
+        return tuple(members)
+
+    def rank(self, members):
+        """
+        Position of the composite with the given member indices (ascending).
+        """
+        r = len(members)
+        n = len(self.atomic)
+        if not 1 <= r <= len(self._starts):
+            raise ValueError(f"Composites here have 1 to {len(self._starts)} actions, not {r}")
+        table = self._comb
+        rank = 0
+        c = 0
+        for remaining, m in zip(range(r - 1, -1, -1), members):
+            if not c <= m < n:
+                raise ValueError(f"Member indices must be ascending and below {n}: {members}")
+            while c < m:
+                rank += table[n - c - 1][remaining]
+                c += 1
+            c = m + 1
+        return self._starts[r - 1] + rank
+
+    def index(self, composite):
+        """
+        Position of a composite given as a tuple of atomic actions.
+        """
+        if self._positions is None:
+            self._positions = {action: i for i, action in enumerate(self.atomic)}
+        try:
+            members = [self._positions[action] for action in composite]
+        except (KeyError, TypeError):
+            raise ValueError(f"{composite!r} is not in this action space") from None
+        return self.rank(members)
+
+    # --- Bitmasks ---
+
+    def mask(self, index):
+        """
+        Bitmask of the composite at `index`: bit i is set for atomic[i].
+        """
+        mask = 0
+        for i in self.unrank_indices(index):
+            mask |= 1 << i
+        return mask
+
+    def rank_mask(self, mask):
+        """
+        Position of the composite with the given bitmask.
+        """
+        if mask <= 0 or mask >> len(self.atomic):
+            raise ValueError(f"Mask {mask:#x} does not name a composite of {len(self.atomic)} actions")
+        return self.rank([i for i in range(mask.bit_length()) if mask >> i & 1])
+
+    def from_mask(self, mask):
+        # The composite (tuple of atomic actions) with the given bitmask
+        return self[self.rank_mask(mask)]
+
+    # --- Filtering and sampling ---
+
+    def filter(self, predicate=None, costs=None, budget=None):
+        """
+        Iterate, in order, over the composites whose total cost (from
+        `costs`, one non-negative cost per atomic action) is within `budget`
+        and for which `predicate(composite)` holds. Over-budget branches are
+        pruned rather than enumerated.
+        """
+        atomic = self.atomic
+        if costs is None or budget is None:
+            for composite in self:
+                if predicate is None or predicate(composite):
+                    yield composite
+            return
+
+        costs = [float(cost) for cost in costs]
+        n = len(atomic)
+
+        def extend(start, chosen, total, need):
+            if not need:
+                composite = tuple(atomic[i] for i in chosen)
+                if predicate is None or predicate(composite):
+                    yield composite
+                return
+            for c in range(start, n - need + 1):
+                spent = total + costs[c]
+                if spent <= budget:
+                    chosen.append(c)
+                    yield from extend(c + 1, chosen, spent, need - 1)
+                    chosen.pop()
+
+        for r in range(1, len(self._starts) + 1):
+            yield from extend(0, [], 0.0, r)
+
+    def sample(self, rng):
+        """
+        Uniformly drawn composite. `rng` is a NumPy Generator or anything
+        with randrange() (the `random` module, random.Random); with the
+        latter the draw is the one random.choice would make on the full
+        list.
+        """
+        if not self._len:
+            raise IndexError("Cannot sample from an empty action space")
+        if hasattr(rng, 'integers'):
+            return self[int(rng.integers(self._len))]
+        return self[rng.randrange(self._len)]
@@ -1,6 +1,7 @@
 # src/simulator/atomic_actions.py
 
 from typing import List, Dict, Any
+from simulator.bets import get_bet, COME_FLAT, PASS_LINE_ODDS, COME_ODDS
 
 POINT_DENOMINATORS = {
     '4': 1,
@@ -22,7 +23,7 @@ def legal_odds_bet_amounts(point: str, max_mult: int = MAX_MULTIPLIER) -> List[i
 
 class AtomicActionGenerator:
     def __init__(self):
-        self.come_flat_bet = 'come_flat'
+        self.come_flat_bet = get_bet(COME_FLAT)
         self.latest_atomic_actions = []
 
     def generate_atomic_actions(self, game_state):
@@ -37,7 +38,7 @@ class AtomicActionGenerator:
         available_plo = legal_odds_bet_amounts(point)
         for amt in available_plo:
             if amt not in existing_plo_levels:
-                atomic_actions.append(f'pass_line_odds_${amt}')
+                atomic_actions.append(get_bet(PASS_LINE_ODDS, amt))
 
         # --- Come Flat Bet ---
         # Allow placement of come bet if one is not already pending
@@ -54,8 +55,7 @@ class AtomicActionGenerator:
             used = come_odds_levels.get(pt_str, [])
             for amt in available_amt:
                 if amt not in used:
-                    label = f'come_odds_${amt}_{pt_str}'
-                    atomic_actions.append(label)
+                    atomic_actions.append(get_bet(COME_ODDS, amt, int(pt)))
 
         self.latest_atomic_actions = atomic_actions
 
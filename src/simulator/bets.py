@@ -0,0 +1,127 @@
+# src/simulator/bets.py
+
+"""
+Compact, interned bet records.
+
+Every bet is a `Bet` holding its kind, dollar amount, point and a small
+integer code. Records are created once and shared, so hot paths compare
+kinds and read amounts instead of re-parsing labels like 'come_odds_$10_6'.
+Labels are only needed at the edges: CSV output, debugging, and payout
+tables keyed by label.
+"""
+
+import re
+from simulator.payouts import POINTS, MAX_MULTIPLIER
+
+# Bet kinds
+PASS_LINE_FLAT = 0
+COME_FLAT = 1
+PASS_LINE_ODDS = 2
+COME_ODDS = 3
+
+KIND_NAMES = ('pass_line_flat', 'come_flat', 'pass_line_odds', 'come_odds')
+
+_LABEL_RE = re.compile(r'(pass_line_odds|come_odds)_\$(\d+)(?:_(\d+))?$')
+
+
+class Bet:
+    __slots__ = ('code', 'kind', 'amount', 'point', 'label', 'key')
+
+    def __init__(self, code, kind, amount, point, label):
+        self.code = code
+        self.kind = kind
+        self.amount = amount    # None for flat bets, which are sized by the table minimum
+        self.point = point      # only set for come odds
+        self.label = label
+        self.key = (label,)     # bet part of a payout-table key
+
+    def __repr__(self):
+        return self.label
+
+    def __lt__(self, other):
+        # Order like the old string labels so sorted action sets are unchanged
+        return self.label < other.label
+
+    def __reduce__(self):
+        # Unpickle to the interned record rather than a copy
+        return (get_bet, (self.kind, self.amount, self.point))
+
+
+BETS = []          # indexed by code
+_BY_KEY = {}       # (kind, amount, point) -> Bet
+_BY_LABEL = {}     # label -> Bet
+
+
+def make_label(kind, amount=None, point=None):
+    if kind == PASS_LINE_ODDS:
+        return f'pass_line_odds_${amount}'
+    if kind == COME_ODDS:
+        return f'come_odds_${amount}_{point}'
+    return KIND_NAMES[kind]
+
+
+def get_bet(kind, amount=None, point=None):
+    """
+    Return the interned record for a bet, creating it on first use.
+    """
+    key = (kind, amount, point)
+    bet = _BY_KEY.get(key)
+    if bet is None:
+        bet = Bet(len(BETS), kind, amount, point, make_label(kind, amount, point))
+        BETS.append(bet)
+        _BY_KEY[key] = bet
+        _BY_LABEL[bet.label] = bet
+    return bet
+
+
+def parse_bet(label):
+    """
+    Return the interned record for a label such as 'pass_line_odds_$6' or
+    'come_odds_$10_6'. Labels are only parsed the first time they are seen.
+    """
+    bet = _BY_LABEL.get(label)
+    if bet is not None:
+        return bet
+
+    lowered = label.lower()
+    if lowered in ('pass_line_flat', 'come_flat'):
+        bet = get_bet(KIND_NAMES.index(lowered))
+    else:
+        match = _LABEL_RE.match(lowered)
+        if match is None:
+            raise ValueError(f"Unknown bet label: {label}")
+        name, amount, point = match.groups()
+        if name == 'come_odds':
+            if point is None:
+                raise ValueError(f"Come odds bet without a point: {label}")
+            bet = get_bet(COME_ODDS, int(amount), int(point))
+        else:
+            bet = get_bet(PASS_LINE_ODDS, int(amount))
+
+    _BY_LABEL[label] = bet
+    return bet
+
+
+def as_bet(bet):
+    """
+    Accept a Bet or a label and return the Bet.
+    """
+    return bet if isinstance(bet, Bet) else parse_bet(bet)
+
+
+def bet_of(placed):
+    """
+    Return the record behind a placed-bet dict. Agents store it under 'bet';
+    dicts built elsewhere fall back to parsing their 'type' label.
+    """
+    bet = placed.get('bet')
+    return bet if bet is not None else parse_bet(placed['type'])
+
+
+# Register the full bet universe up front so codes are stable across runs
+get_bet(PASS_LINE_FLAT)
+get_bet(COME_FLAT)
+for _point, (_num, _denom) in POINTS.items():
+    for _m in range(1, MAX_MULTIPLIER + 1):
+        get_bet(PASS_LINE_ODDS, _m * _denom)
+        get_bet(COME_ODDS, _m * _denom, int(_point))
@@ -0,0 +1,90 @@
+# src/simulator/checkpoint.py
+
+"""
+Checkpoints for long simulate_agent runs.
+
+A checkpoint is taken between games and holds everything the rest of a run
+depends on: the agent's run state (BaseAgent.run_state: its bankroll, the
+game state of its last decision and any stream of its own), the roll
+source's state (the
+Generator's bit_generator state and any buffered sums, or a tape cursor),
+the `random` module's state (RandomAgent draws from it), the number of
+games played, the bankroll history so far and how far the diagnostics
+files had been written. Resuming from one carries on exactly as the run
+would have without the interruption. Caches and the agent's setup are not
+saved: the setup comes from the agent resumed into, which must match the
+one saved (BaseAgent.params, compared by digest).
+
+Checkpoints are pickles written to a temporary file and renamed over the
+previous one, so a crash mid-write leaves the last good checkpoint behind.
+"""
+
+import hashlib
+import os
+import pickle
+import random
+import numpy as np
+
+CHECKPOINT_VERSION = 2
+
+
+def params_digest(agent):
+    """
+    {parameter: digest of its value} for the agent's setup.
+    """
+    return {name: hashlib.sha1(pickle.dumps(value, protocol=4)).hexdigest()
+            for name, value in agent.params().items()}
+
+
+def save_checkpoint(path, agent, rolls, games_played, history, diagnostics, stopped=False):
+    """
+    Write a checkpoint after `games_played` games. `diagnostics` is the
+    state from DiagnosticsSink.checkpoint(); `stopped` marks a run that
+    ended early because the agent could not continue.
+    """
+    state = {
+        'version': CHECKPOINT_VERSION,
+        'agent_class': type(agent).__qualname__,
+        'agent_params': params_digest(agent),
+        'agent': agent.run_state(),
+        'rolls': rolls.getstate(),
+        'random': random.getstate(),
+        'games_played': games_played,
+        'history': np.array(history.values),
+        'diagnostics': diagnostics,
+        'stopped': stopped,
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    with open(path, 'rb') as f:
+        state = pickle.load(f)
+    if state.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"{path} is not a version {CHECKPOINT_VERSION} checkpoint")
+    return state
+
+
+def restore_checkpoint(state, agent, rolls):
+    """
+    Put `agent`, the roll source and the `random` module back as they were
+    when `state` was saved. The agent must be of the class that was saved
+    and set up with the same parameters.
+    """
+    if type(agent).__qualname__ != state['agent_class']:
+        raise ValueError(f"Checkpoint is for a {state['agent_class']}, not a {type(agent).__qualname__}")
+    saved, current = state['agent_params'], params_digest(agent)
+    changed = sorted(name for name in saved.keys() | current.keys() if saved.get(name) != current.get(name))
+    if changed:
+        raise ValueError(f"Checkpoint was saved by a {state['agent_class']} with different {', '.join(changed)}")
+    agent.restore_run_state(state['agent'])
+    rolls.setstate(state['rolls'])
+    random.setstate(state['random'])
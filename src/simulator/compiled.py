@@ -0,0 +1,292 @@
+# src/simulator/compiled.py
+
+"""
+Deterministic policies compiled to integer state-transition tables.
+
+Under a policy that maps the table state to its bets (see markov), the table
+states a game can reach are finite. compile_policy() walks them from the
+come-out, numbers them, and tabulates for every state:
+
+    wager[s], placed[s]       what the policy stakes, and the state after
+    next_state[s, roll]       state after a roll (-1 when the game ends)
+    payout[s, roll]           dollars paid on that roll
+
+play_compiled() is then play_game as a loop over integer lookups, and
+play_compiled_vectorized() plays many games at once. The bankroll is not
+part of the state: the can-continue and affordability checks are made on
+it at run time, so one table serves every starting bankroll.
+
+Tables can be cached on disk (an .npz per rules/policy key).
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+from simulator.markov import MarkovEvaluator, AgentPolicy, ChainState, COME_OUT, fixed_policy
+from simulator.payouts import PAYOUT_TABLE
+from simulator.vector_engine import NUM_SUMS
+from simulator.game_engine import get_roller
+
+COMPILED_CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'compiled_cache')
+
+# Bump when the game rules in markov/play_game change, so old caches miss
+RULES_VERSION = 1
+
+DEFAULT_MAX_STATES = 200_000
+
+
+class CompiledPolicy:
+    """
+    Transition, payout and action tables for one policy at one table
+    minimum. States are numbered from 0 (the come-out); `states[s]` is the
+    ChainState behind ID s and `actions[s]` the bet labels the policy
+    places there.
+    """
+
+    def __init__(self, table_min, states, actions, wager, placed, next_state, payout):
+        self.table_min = table_min
+        self.states = states
+        self.actions = actions
+        self.wager = wager
+        self.placed = placed
+        self.next_state = next_state
+        self.payout = payout
+        self.in_point = np.array([state.point is not None for state in states])
+        for array in (self.wager, self.placed, self.next_state, self.payout, self.in_point):
+            array.setflags(write=False)
+
+        # Nested lists for the scalar loop
+        self._rows = (
+            self.in_point.tolist(), self.wager.tolist(), self.placed.tolist(),
+            self.next_state.tolist(), self.payout.tolist()
+        )
+
+    def __len__(self):
+        return len(self.states)
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+        np.savez(
+            tmp_path,
+            table_min=self.table_min,
+            states=json.dumps([list(state) for state in self.states]),
+            actions=json.dumps(self.actions),
+            wager=self.wager,
+            placed=self.placed,
+            next_state=self.next_state,
+            payout=self.payout,
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as stored:
+            states = [
+                ChainState(point, tuple(pass_odds), pending,
+                           tuple(map(tuple, come_flats)), tuple(map(tuple, come_odds)))
+                for point, pass_odds, pending, come_flats, come_odds in json.loads(str(stored['states']))
+            ]
+            return cls(
+                stored['table_min'].item(), states, json.loads(str(stored['actions'])),
+                stored['wager'], stored['placed'], stored['next_state'], stored['payout']
+            )
+
+
+def compile_policy(policy, table_minimum=10, payout_table=None, max_states=DEFAULT_MAX_STATES,
+                   cache_key=None, cache_dir=None):
+    """
+    Compile `policy(state)` (as in markov.MarkovEvaluator) into a
+    CompiledPolicy. With `cache_key`, a string naming the policy and its
+    configuration, the tables are read from and saved to `cache_dir`.
+
+    Raises ValueError if more than `max_states` states are reachable (a
+    policy that can keep adding come bets forever, for instance).
+    """
+    payout_table = PAYOUT_TABLE if payout_table is None else payout_table
+    path = None
+    if cache_key is not None:
+        cache_dir = COMPILED_CACHE_DIR if cache_dir is None else cache_dir
+        path = os.path.join(cache_dir, f'{_cache_name(cache_key, table_minimum, payout_table)}.npz')
+        if os.path.exists(path):
+            return CompiledPolicy.load(path)
+
+    # Each state's action is asked for once
+    chosen = {}
+
+    def choose(state):
+        action = chosen.get(state)
+        if action is None:
+            action = chosen[state] = list(policy(state))
+        return action
+
+    # The Markov evaluator already knows how the rules move the table; a
+    # half-dollar unit covers every payout the standard table makes
+    rules = MarkovEvaluator(choose, table_minimum=table_minimum, payout_table=payout_table, unit=0.5)
+
+    ids = {COME_OUT: 0}
+    states = [COME_OUT]
+
+    def state_id(state):
+        sid = ids.get(state)
+        if sid is None:
+            if len(states) >= max_states:
+                raise ValueError(f"Policy reaches more than {max_states} table states")
+            sid = ids[state] = len(states)
+            states.append(state)
+        return sid
+
+    actions, wager, placed, next_state, payout = [], [], [], [], []
+    s = 0
+    while s < len(states):
+        state = states[s]
+        action, units, after = [], 0, s
+        if state.point is not None:
+            units, placed_state = rules.decision(state)
+            if placed_state is not None:
+                action = [bet.label for bet in choose(state)]
+                after = state_id(placed_state)
+        actions.append(action)
+        wager.append(units * rules.unit)
+        placed.append(after)
+
+        # A roll from this state as it stands (placing first moves to `after`)
+        trans = [-1] * NUM_SUMS
+        pays = [0.0] * NUM_SUMS
+        for roll in range(2, NUM_SUMS):
+            nxt, won = rules.roll(state, roll)
+            trans[roll] = -1 if nxt is None else state_id(nxt)
+            pays[roll] = won * rules.unit
+        next_state.append(trans)
+        payout.append(pays)
+        s += 1
+
+    compiled = CompiledPolicy(
+        table_minimum, states, actions,
+        np.array(wager, dtype=float), np.array(placed, dtype=np.int32),
+        np.array(next_state, dtype=np.int32), np.array(payout, dtype=float)
+    )
+    if path is not None:
+        compiled.save(path)
+    return compiled
+
+
+def _cache_name(cache_key, table_minimum, payout_table):
+    # Rules version, policy key, table minimum and a digest of the payouts
+    payouts = json.dumps(sorted((repr(key), value) for key, value in payout_table.items()))
+    digest = hashlib.sha1(f'{RULES_VERSION}|{cache_key}|{table_minimum}|{payouts}'.encode()).hexdigest()
+    return f'{cache_key}_{digest[:16]}'
+
+
+def compile_fixed_policy(odds_multiple=1, max_come_bets=0, table_minimum=10, cache_dir=None):
+    """
+    Compiled tables of FixedPolicyAgent's policy, cached on disk.
+    """
+    return compile_policy(
+        fixed_policy(odds_multiple, max_come_bets),
+        table_minimum=table_minimum,
+        cache_key=f'fixed_o{odds_multiple}_c{max_come_bets}',
+        cache_dir=cache_dir
+    )
+
+
+def agent_policy(agent):
+    """
+    policy(state) for an agent with a deterministic policy (see
+    markov.AgentPolicy). Compiled tables hold the decision made with no
+    bankroll limit, so this is only exact for agents whose choice does not
+    depend on the bankroll (like FixedPolicyAgent, and unlike
+    ClassicalAgent, which only picks what it can afford; MarkovEvaluator
+    covers those).
+    """
+    return AgentPolicy(agent)
+
+
+# --- Engines ---
+
+def play_compiled(compiled, rng, starting_bankroll=1000, walkaway_threshold=None):
+    """
+    One game of the compiled policy; returns the final bankroll, as
+    play_game would for the same rolls. `rng` is a roll source or a
+    Generator (see game_engine.get_roller).
+    """
+    roll_next = get_roller(rng)
+    in_point, wager, placed, next_state, payout = compiled._rows
+    tm = compiled.table_min
+    walkaway = float('inf') if walkaway_threshold is None else walkaway_threshold
+
+    bankroll = starting_bankroll
+    if bankroll >= tm:
+        bankroll -= tm  # pass line flat bet
+    s = 0
+    while True:
+        if in_point[s]:
+            if bankroll < tm or bankroll >= walkaway:
+                break
+            w = wager[s]
+            if w and bankroll >= w:
+                bankroll -= w
+                s = placed[s]
+        roll = roll_next()
+        bankroll += payout[s][roll]
+        s = next_state[s][roll]
+        if s < 0:
+            break
+    return bankroll
+
+
+def play_compiled_vectorized(compiled, num_games, rng=None, starting_bankroll=1000, walkaway_threshold=None,
+                             rolls=None):
+    """
+    Play `num_games` games of the compiled policy in lockstep and return the
+    final bankrolls. Dice are drawn and consumed exactly as in
+    vector_engine.play_games_vectorized, so the same `rng` or `rolls` give
+    the same games.
+    """
+    if rng is None and rolls is None:
+        raise ValueError("Either rng or rolls must be given")
+    tm = float(compiled.table_min)
+
+    final = np.empty(num_games)
+    ids = np.arange(num_games)
+    bankroll = np.full(num_games, float(starting_bankroll))
+    bankroll -= tm * (bankroll >= tm)
+    state = np.zeros(num_games, dtype=np.int32)
+
+    step = 0
+    while ids.size:
+        in_point = compiled.in_point[state]
+        can_continue = bankroll >= tm
+        if walkaway_threshold is not None:
+            can_continue &= bankroll < walkaway_threshold
+        done = in_point & ~can_continue
+
+        wager = compiled.wager[state]
+        place = in_point & ~done & (wager > 0) & (bankroll >= wager)
+        bankroll -= wager * place
+        state = np.where(place, compiled.placed[state], state)
+
+        if rolls is not None:
+            if step >= len(rolls):
+                raise ValueError("Ran out of pre-drawn rolls")
+            roll = np.asarray(rolls[step])[ids]
+        else:
+            roll = rng.integers(1, 7, size=(ids.size, 2)).sum(axis=1)
+        step += 1
+
+        active = ~done
+        bankroll += active * compiled.payout[state, roll]
+        state = np.where(active, compiled.next_state[state, roll], state)
+        done |= state < 0
+
+        if done.any():
+            final[ids[done]] = bankroll[done]
+            keep = ~done
+            ids = ids[keep]
+            bankroll = bankroll[keep]
+            state = state[keep]
+
+    return final
@@ -0,0 +1,112 @@
+# src/simulator/composite_search.py
+
+"""
+Best-composite search for agents whose composite score is the sum of its
+atomic actions' scores.
+
+Picking the best composite under a bankroll is a small knapsack problem with
+a cap on the number of bets, so instead of scoring every combination the
+search walks the atomic actions best-first and prunes any branch that cannot
+beat the best composite found so far.
+"""
+
+import numpy as np
+
+# Scores are compared as integers in units of 1e-12 so that sums are exact
+# and independent of summation order
+SCORE_SCALE = 1e12
+
+
+def quantize_scores(values):
+    """
+    Convert float scores to exact integer units of 1 / SCORE_SCALE.
+    """
+    return np.rint(np.asarray(values, dtype=float) * SCORE_SCALE).astype(np.int64)
+
+
+def _better(score, wager, members, best):
+    # Exhaustive-search order: higher score, lower wager, fewer bets, then
+    # earlier in itertools.combinations order
+    if best is None:
+        return True
+    best_score, best_wager, best_members = best
+    if score != best_score:
+        return score > best_score
+    if wager != best_wager:
+        return wager < best_wager
+    if len(members) != len(best_members):
+        return len(members) < len(best_members)
+    return members < best_members
+
+
+def best_composite(scores, amounts, max_size, budget):
+    """
+    Return the indices (ascending) of the composite an exhaustive search
+    over all combinations of 1..max_size atomic actions would choose, among
+    those whose total amount fits within `budget`. Returns None if no single
+    action is affordable.
+
+    `scores` must be integers (see quantize_scores) and `amounts` positive.
+    """
+    n = len(scores)
+    if n == 0 or max_size < 1:
+        return None
+
+    scores = [int(s) for s in scores]
+    amounts = [float(a) for a in amounts]
+
+    # Explore best-scoring (then cheapest) actions first
+    order = sorted(range(n), key=lambda i: (-scores[i], amounts[i], i))
+    s = [scores[i] for i in order]
+    w = [amounts[i] for i in order]
+
+    # positive[j] = sum of the positive scores in order[:j]; because scores are
+    # sorted, the best m additions from position j sum to at most
+    # positive[j + m] - positive[j]
+    positive = [0]
+    for v in s:
+        positive.append(positive[-1] + max(v, 0))
+
+    # cheapest[j] = smallest amount among order[j:]
+    cheapest = [float('inf')] * (n + 1)
+    for j in range(n - 1, -1, -1):
+        cheapest[j] = min(w[j], cheapest[j + 1])
+
+    best = None
+    # (next position, score, wager, chosen original indices, score bound)
+    stack = [(0, 0, 0.0, (), float('inf'))]
+
+    while stack:
+        start, score, wager, chosen, bound = stack.pop()
+        # The best may have improved since this branch was queued
+        if best is not None and not _may_improve(bound, wager + cheapest[start], best):
+            continue
+        size = len(chosen)
+
+        # Children are pushed in reverse so positions are expanded in order
+        for j in range(n - 1, start - 1, -1):
+            new_wager = wager + w[j]
+            if new_wager > budget:
+                continue
+            new_score = score + s[j]
+            new_chosen = chosen + (order[j],)
+            members = tuple(sorted(new_chosen))
+            if _better(new_score, new_wager, members, best):
+                best = (new_score, new_wager, members)
+
+            if size + 1 >= max_size or j + 1 >= n:
+                continue
+            room = max_size - size - 1
+            new_bound = new_score + positive[min(n, j + 1 + room)] - positive[j + 1]
+            if _may_improve(new_bound, new_wager + cheapest[j + 1], best):
+                stack.append((j + 1, new_score, new_wager, new_chosen, new_bound))
+
+    return best[2] if best is not None else None
+
+
+def _may_improve(bound, min_wager, best):
+    # Whether a branch whose composites score at most `bound` and wager at
+    # least `min_wager` could still contain something better than `best`
+    if bound != best[0]:
+        return bound > best[0]
+    return min_wager <= best[1]
@@ -0,0 +1,152 @@
+# src/simulator/dice.py
+
+"""
+Roll sources for the game engine.
+
+A roll source is any object with a ``roll()`` method returning the sum of two
+fair dice. ``play_game`` accepts either a roll source or a raw NumPy
+``Generator``.
+"""
+
+import os
+import numpy as np
+
+DEFAULT_BLOCK_SIZE = 4096
+
+
+class DiceRoller:
+    """
+    Draws dice sums from a NumPy Generator in large blocks and hands them out
+    one at a time, refilling when the block runs out.
+
+    Blocks are drawn with the same ``rng.integers(1, 7)`` calls that
+    ``roll_dice`` makes, so for a given seed the sequence of sums is identical
+    to rolling one at a time.
+    """
+
+    def __init__(self, rng, block_size=DEFAULT_BLOCK_SIZE):
+        if block_size < 1:
+            raise ValueError("block_size must be positive")
+        self.rng = rng
+        self.block_size = block_size
+        self._block = []
+        self._pos = 0
+
+    def roll(self):
+        if self._pos >= len(self._block):
+            self._refill()
+        total = self._block[self._pos]
+        self._pos += 1
+        return total
+
+    def getstate(self):
+        """
+        Everything needed to continue the same sequence of rolls: the
+        Generator's bit_generator state and the sums still buffered.
+        """
+        return {'bit_generator': self.rng.bit_generator.state, 'buffered': self._block[self._pos:]}
+
+    def setstate(self, state):
+        self.rng.bit_generator.state = state['bit_generator']
+        self._block = list(state['buffered'])
+        self._pos = 0
+
+    def _refill(self):
+        dice = self.rng.integers(1, 7, size=(self.block_size, 2))
+        self._block = dice.sum(axis=1).tolist()
+        self._pos = 0
+
+
+class DiceTape:
+    """
+    A fixed, replayable sequence of dice sums (uint8), in memory or backed by
+    a .npy file opened as a memmap.
+
+    Each reader() is an independent roll source with its own cursor, so
+    several agents (or processes) can play exactly the same dice. A tape
+    generated from a Generator holds the same sums a DiceRoller on that
+    Generator would produce.
+    """
+
+    def __init__(self, sums):
+        self.sums = sums
+
+    def __len__(self):
+        return len(self.sums)
+
+    @classmethod
+    def generate(cls, rng, length, path=None, block_size=1 << 20):
+        """
+        Draw `length` sums from `rng`. With `path`, they are written straight
+        to a .npy file in blocks and the tape is memory-mapped from it.
+        """
+        if path is None:
+            return cls(rng.integers(1, 7, size=(length, 2)).sum(axis=1).astype(np.uint8))
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        sums = np.lib.format.open_memmap(path, mode='w+', dtype=np.uint8, shape=(length,))
+        for start in range(0, length, block_size):
+            stop = min(start + block_size, length)
+            sums[start:stop] = rng.integers(1, 7, size=(stop - start, 2)).sum(axis=1)
+        sums.flush()
+        del sums
+        return cls.load(path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        return cls(np.load(path, mmap_mode='r' if mmap else None))
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.save(path, np.asarray(self.sums, dtype=np.uint8))
+
+    def reader(self, start=0, block_size=DEFAULT_BLOCK_SIZE):
+        return TapeReader(self, start, block_size)
+
+
+class TapeReader:
+    """
+    Roll source replaying a DiceTape from `start`. `cursor` is the index of
+    the next sum to be rolled. Raises ValueError when the tape runs out.
+    """
+
+    def __init__(self, tape, start=0, block_size=DEFAULT_BLOCK_SIZE):
+        if block_size < 1:
+            raise ValueError("block_size must be positive")
+        self.tape = tape
+        self.block_size = block_size
+        self._block_start = start
+        self._block = []
+        self._pos = 0
+
+    @property
+    def cursor(self):
+        return self._block_start + self._pos
+
+    def roll(self):
+        if self._pos >= len(self._block):
+            self._refill()
+        total = self._block[self._pos]
+        self._pos += 1
+        return total
+
+    def getstate(self):
+        return {'cursor': self.cursor}
+
+    def setstate(self, state):
+        # Rolling continues from the saved cursor
+        self._block_start = state['cursor']
+        self._block = []
+        self._pos = 0
+
+    def _refill(self):
+        start = self.cursor
+        if start >= len(self.tape):
+            raise ValueError(f"Dice tape exhausted after {start} rolls")
+        self._block = self.tape.sums[start:start + self.block_size].tolist()
+        self._block_start = start
+        self._pos = 0
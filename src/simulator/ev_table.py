@@ -0,0 +1,71 @@
+# src/simulator/ev_table.py
+
+"""
+Expected value of every atomic bet, conditioned on the point.
+
+A bet's EV only depends on the bet and the point it is working on: flat bets
+win with the pass line's overall probability, pass-line odds win when the
+current point comes before a seven, and come odds when their own number
+does. The table holds EV in dollars for every registered bet (rows, by
+code) and every table point (columns, see POINT_COLUMNS), so agents read
+EVs instead of summing over outcomes on each decision.
+"""
+
+from functools import lru_cache
+import numpy as np
+from simulator.bets import BETS, PASS_LINE_FLAT, COME_FLAT, COME_ODDS
+from simulator.payout_matrix import PAYOUT_MATRIX, WIN, LOSE, WIN_CODES
+from simulator.probabilities import POINT_PROBS, P_WIN_CO, _ODDS_P
+
+# Column order: come-out (no point), then each point
+POINT_COLUMNS = (None, 4, 5, 6, 8, 9, 10)
+POINT_INDEX = {point: col for col, point in enumerate(POINT_COLUMNS)}
+
+# A flat bet wins on a come-out 7/11 or by making its point
+P_FLAT_WIN = P_WIN_CO + sum(pn * _ODDS_P[n] for n, pn in POINT_PROBS.items())
+
+
+def bet_win_probability(bet, point):
+    """
+    Probability that `bet` wins, with `point` the current point (None on the
+    come-out). Pass-line odds cannot work without a point; they get 0.
+    """
+    if bet.kind in (PASS_LINE_FLAT, COME_FLAT):
+        return P_FLAT_WIN
+    if bet.kind == COME_ODDS:
+        return _ODDS_P[bet.point]
+    return _ODDS_P[point] if point is not None else 0.0
+
+
+def bet_expected_value(bet, point, table_min, payouts=PAYOUT_MATRIX):
+    """
+    EV in dollars of one bet. Flat payouts are per table-minimum unit; odds
+    payouts are already in dollars.
+    """
+    p = bet_win_probability(bet, point)
+    if bet.kind in (PASS_LINE_FLAT, COME_FLAT):
+        rates = payouts.rates[bet.code]
+        return table_min * (p * rates[WIN] + (1 - p) * rates[LOSE])
+
+    number = bet.point if bet.kind == COME_ODDS else point
+    if number is None:
+        return 0.0
+    return p * payouts.rate(bet, WIN_CODES[number]) + (1 - p) * payouts.rate(bet, LOSE)
+
+
+@lru_cache(maxsize=16)
+def _build(table_min, payouts, num_bets):
+    table = np.zeros((num_bets, len(POINT_COLUMNS)))
+    for bet in BETS[:num_bets]:
+        for col, point in enumerate(POINT_COLUMNS):
+            table[bet.code, col] = bet_expected_value(bet, point, table_min, payouts)
+    table.setflags(write=False)
+    return table
+
+
+def point_ev_table(table_min, payouts=PAYOUT_MATRIX):
+    """
+    (bet code, POINT_INDEX[point]) -> EV in dollars, built once per table
+    minimum and payout matrix (and again if new bets have been registered).
+    """
+    return _build(table_min, payouts, len(BETS))
@@ -0,0 +1,249 @@
+# src/simulator/events.py
+
+"""
+Per-roll event stream for one game, and a compact binary log of events.
+
+The game engine (game_steps) yields a report of everything that happens
+in a game as it happens; this module turns those reports into Events.
+play_game runs the same engine with reports switched off, so games played
+without a listener pay one flag check per report point for them.
+
+Every Event is a flat tuple of numbers, in the field order of EVENT_DTYPE,
+so a buffer of events converts straight to a structured array. The bet an
+event refers to is stored as (kind, point, amount) rather than its interned
+code, since codes are only stable within one process. Amounts are float64,
+so bankrolls replayed from a log are exactly the simulated ones.
+"""
+
+import os
+from collections import namedtuple
+import numpy as np
+from simulator.bets import get_bet
+from simulator.dice import DiceRoller, DiceTape
+from simulator.history import BankrollHistory
+from simulator.game_engine import (
+    play_game, game_steps, GAME_START, POINT_SET, BET_PLACED, BET_WON, BET_LOST, SEVEN_OUT, GAME_END,
+    ROLL_EVENT as ROLL
+)
+
+EVENT_NAMES = (
+    'game_start', 'roll', 'point_set', 'bet_placed', 'bet_won', 'bet_lost', 'seven_out', 'game_end'
+)
+
+NO_BET = -1
+
+# One log record. bet_kind is NO_BET when the event has no bet; bet_point
+# and bet_amount are 0 where the Bet has None.
+EVENT_DTYPE = np.dtype([
+    ('kind', 'u1'),
+    ('number', 'u1'),
+    ('bet_kind', 'i1'),
+    ('bet_point', 'u1'),
+    ('bet_amount', '<u2'),
+    ('amount', '<f8'),
+])
+
+
+class Event(namedtuple('Event', EVENT_DTYPE.names)):
+    __slots__ = ()
+
+    @property
+    def name(self):
+        return EVENT_NAMES[self.kind]
+
+    @property
+    def bet(self):
+        # The interned Bet record, or None
+        if self.bet_kind == NO_BET:
+            return None
+        return get_bet(self.bet_kind, self.bet_amount or None, self.bet_point or None)
+
+    def __repr__(self):
+        bet = self.bet
+        label = '' if bet is None else f' {bet.label}'
+        return f'Event({self.name}{label} number={self.number} amount={self.amount})'
+
+
+def event_fields(kind, number, bet, amount):
+    """
+    One game_steps report as a plain tuple in EVENT_DTYPE field order.
+    """
+    if bet is None:
+        return (kind, number, NO_BET, 0, 0, amount)
+    return (kind, number, bet.kind, bet.point or 0, bet.amount or 0, amount)
+
+
+def make_event(kind, number, bet, amount):
+    # Event for one game_steps report
+    return Event._make(event_fields(kind, number, bet, amount))
+
+
+# --- Event stream ---
+
+def play_game_events(agent, rng):
+    """
+    Play one game and yield its Events in order, from GAME_START to
+    GAME_END, each as soon as it happens: the game advances only as far as
+    the events asked for. The generator's return value is the final
+    bankroll.
+    """
+    steps = game_steps(agent, rng)
+    while True:
+        try:
+            report = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        yield make_event(*report)
+
+
+def simulate_events(agent, rng, num_games):
+    """
+    Events of `num_games` consecutive games, as one stream. Like
+    simulate_agent, a raw Generator is rolled through a DiceRoller.
+    """
+    rng = rng if hasattr(rng, 'roll') else DiceRoller(rng)
+    for _ in range(num_games):
+        yield from play_game_events(agent, rng)
+
+
+# --- Binary event log ---
+
+# File layout: magic, then EVENT_DTYPE records back to back
+EVENT_LOG_MAGIC = b"QCEVENT1"
+
+
+class EventLogWriter:
+    """
+    Appends Events to a binary log, buffering `flush_events` of them in
+    memory and writing each batch as one packed array.
+
+    Use as a context manager, or call close(), so the last batch is written.
+    """
+
+    def __init__(self, path, flush_events=1 << 16):
+        self.path = path
+        self.flush_events = flush_events
+        self.events_written = 0
+        self.closed = False
+        self._buffer = []
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'wb')
+        self._file.write(EVENT_LOG_MAGIC)
+
+    def write(self, event):
+        self._buffer.append(event)
+        if len(self._buffer) >= self.flush_events:
+            self.flush()
+
+    def report(self, kind, number, bet, amount):
+        """
+        Write one game_steps report without building an Event; usable as
+        play_game's on_event.
+        """
+        buffer = self._buffer
+        if bet is None:
+            buffer.append((kind, number, NO_BET, 0, 0, amount))
+        else:
+            buffer.append((kind, number, bet.kind, bet.point or 0, bet.amount or 0, amount))
+        if len(buffer) >= self.flush_events:
+            self.flush()
+
+    def extend(self, events):
+        """
+        Write every event from an iterable (e.g. a play_game_events stream).
+        """
+        buffer = self._buffer
+        limit = self.flush_events
+        for event in events:
+            buffer.append(event)
+            if len(buffer) >= limit:
+                self.flush()
+
+    def flush(self):
+        if self._buffer:
+            np.array(self._buffer, dtype=EVENT_DTYPE).tofile(self._file)
+            self.events_written += len(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        self._file.close()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class EventLogReader:
+    """
+    Memory-mapped view of an event log. `records` is the structured array
+    of every event; iterating replays them as Events.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            magic = f.read(len(EVENT_LOG_MAGIC))
+        if magic != EVENT_LOG_MAGIC:
+            raise ValueError(f"{path} is not an event log")
+        self.path = path
+        size = os.path.getsize(path) - len(EVENT_LOG_MAGIC)
+        if size % EVENT_DTYPE.itemsize:
+            raise ValueError(f"{path} ends in a partial event record")
+        if size:
+            self.records = np.memmap(path, dtype=EVENT_DTYPE, mode='r', offset=len(EVENT_LOG_MAGIC))
+        else:
+            self.records = np.zeros(0, dtype=EVENT_DTYPE)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        for record in self.records.tolist():
+            yield Event(*record)
+
+    def of_kind(self, kind):
+        """
+        Structured array of the events of one kind.
+        """
+        return self.records[self.records['kind'] == kind]
+
+    def games(self):
+        """
+        Yield the records of each game, GAME_START through GAME_END.
+        """
+        starts = np.flatnonzero(self.records['kind'] == GAME_START)
+        bounds = np.append(starts, len(self.records))
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            yield self.records[lo:hi]
+
+    def final_bankrolls(self):
+        return np.array(self.of_kind(GAME_END)['amount'])
+
+    def dice_tape(self):
+        """
+        The logged dice as a DiceTape, to replay the same games.
+        """
+        return DiceTape(np.ascontiguousarray(self.of_kind(ROLL)['number']))
+
+
+def record_games(agent, rng, num_games, path, flush_events=1 << 16):
+    """
+    Play `num_games` games, logging every event to `path`. Returns the final
+    bankrolls (the same as simulate_agent's history for the same rng, for
+    agents that do not draw from `random`).
+    """
+    rng = rng if hasattr(rng, 'roll') else DiceRoller(rng)
+    history = BankrollHistory(num_games)
+    with EventLogWriter(path, flush_events) as log:
+        for _ in range(num_games):
+            history.append(play_game(agent, rng, on_event=log.report))
+    return history
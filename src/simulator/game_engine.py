@@ -1,122 +1,315 @@
 # src/simulator/game_engine.py
 
-import re
+from functools import partial
+from time import perf_counter
+from simulator.bets import parse_bet, bet_of, get_bet, COME_FLAT, PASS_LINE_FLAT, PASS_LINE_ODDS, COME_ODDS
+from simulator.payout_matrix import compile_payouts, WIN_CODES
+from simulator.ledger import BetLedger
+from simulator.table_state import TableState
 
 def roll_dice(rng):
     # Simulate the roll of two fair dice
     return rng.integers(1, 7) + rng.integers(1, 7)
 
+def get_roller(rng):
+    # Accept either a roll source (e.g. DiceRoller) or a raw NumPy Generator
+    if hasattr(rng, 'roll'):
+        return rng.roll
+    return partial(roll_dice, rng)
+
+def payout_rates(agent):
+    """
+    Scalar payout rows (bet code -> outcome code -> payout) for an agent.
+    Agents outside BaseAgent that only have a payout_table dict get it
+    compiled on the spot.
+    """
+    payouts = getattr(agent, 'payouts', None)
+    if payouts is None:
+        payouts = compile_payouts(getattr(agent, 'payout_table', {}))
+    return payouts.rates
+
+def bet_ledger(agent):
+    """
+    The agent's bets as a BetLedger. BaseAgent keeps one already; any other
+    agent's bet list is wrapped (and put back on the agent).
+    """
+    bets = agent.bets
+    if not isinstance(bets, BetLedger):
+        bets = BetLedger(bets)
+        agent.bets = bets
+    return bets
+
+# --- Optional per-phase timing ---
+
+PHASES = ('update', 'choose', 'place', 'roll', 'resolve')
+UPDATE, CHOOSE, PLACE, ROLL, RESOLVE = range(len(PHASES))
+
+
+class PhaseTimings:
+    """
+    Wall time and call counts per phase of play_game, accumulated across
+    calls until reset(). Pass one as play_game(..., timings=...) to turn
+    timing on.
+    """
+
+    __slots__ = ('seconds', 'calls')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.seconds = [0.0] * len(PHASES)
+        self.calls = [0] * len(PHASES)
+
+    def add(self, phase, seconds):
+        self.seconds[phase] += seconds
+        self.calls[phase] += 1
+
+    def as_dict(self):
+        out = {}
+        for phase, name in enumerate(PHASES):
+            out[f'{name}_sec'] = self.seconds[phase]
+            out[f'{name}_calls'] = self.calls[phase]
+        return out
+
+# --- Optional event reports ---
+
+# Event kinds reported by game_steps and play_game's on_event (see simulator.events)
+GAME_START = 0   # amount: bankroll at the start of the game
+ROLL_EVENT = 1   # number: dice sum
+POINT_SET = 2    # number: the point
+BET_PLACED = 3   # amount: stake taken from the bankroll
+BET_WON = 4      # number: winning roll; amount: paid to the bankroll
+BET_LOST = 5     # number: losing roll; amount: stake lost
+SEVEN_OUT = 6    # amount: bankroll change from resolve_game('seven_out')
+GAME_END = 7     # amount: final bankroll
+
+PASS_LINE = get_bet(PASS_LINE_FLAT)
+
+
+def _new_bet_reports(agent, start):
+    # BET_PLACED for every bet added to agent.bets after position `start`
+    for placed in agent.bets[start:]:
+        yield (BET_PLACED, 0, bet_of(placed), placed['amount'])
+
 # --- Helpers to parse new-style bet labels ---
 
 def parse_pass_line_odds_bet(bet_type: str):
-    match = re.match(r'pass_line_odds_\$(\d+)', bet_type)
-    return int(match.group(1)) if match else None
+    try:
+        bet = parse_bet(bet_type)
+    except ValueError:
+        return None
+    return bet.amount if bet.kind == PASS_LINE_ODDS else None
 
 def parse_come_odds_bet(bet_type: str):
-    match = re.match(r'come_odds_\$(\d+)_([4-6]|[8-9]|10)', bet_type)
-    if match:
-        amount = int(match.group(1))
-        point = int(match.group(2))
-        return amount, point
+    try:
+        bet = parse_bet(bet_type)
+    except ValueError:
+        return None, None
+    if bet.kind == COME_ODDS:
+        return bet.amount, bet.point
     return None, None
 
 # --- Game State Builder for Agent ---
 
 def build_game_state(agent):
-    game_state = {
-        'pass_line_odds_levels': sorted([
-            parse_pass_line_odds_bet(bet['type'])
-            for bet in agent.bets
-            if bet['type'].startswith('pass_line_odds_')
-        ]),
-        'come_flat_active': any(
-            bet['type'] == 'come_flat' for bet in agent.bets
-        ),
-        'active_come_points': sorted(agent.active_come_points),
-        'come_odds_levels': {},
-        'current_point': agent.current_point,
-        'table_min': agent.table_min
-    }
-
-    for point in game_state['active_come_points']:
-        levels = []
-        for bet in agent.bets:
-            if bet['type'].startswith('come_odds_'):
-                amount, bet_point = parse_come_odds_bet(bet['type'])
-                if bet_point == point:
-                    levels.append(amount)
-        game_state['come_odds_levels'][str(point)] = sorted(set(levels)) if levels else []
-
-    return game_state
+    """
+    Game state derived from agent.bets, by the same rules as the agent's
+    incremental TableState. Agents outside BaseAgent get the original
+    rule that any come bet on the table stops another.
+    """
+    table = TableState.from_bets(agent.bets)
+    return table.game_state(agent.current_point, agent.active_come_points, agent.table_min,
+                            pending_only=getattr(agent, 'come_flat_pending_only', False))
 
 # --- Main Game Function ---
 
-def play_game(agent, rng):
+def play_game(agent, rng, timings=None, on_event=None):
+    """
+    Play one game and return the final bankroll. With a PhaseTimings,
+    time spent updating the action space, choosing, placing bets, rolling
+    and resolving rolls is added to it.
+
+    With `on_event`, everything that happens is reported as
+    on_event(kind, number, bet, amount), as it happens (see game_steps).
+    """
+    steps = game_steps(agent, rng, timings, emit=on_event is not None)
+    while True:
+        try:
+            report = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        on_event(*report)
+
+
+def game_steps(agent, rng, timings=None, emit=True):
+    """
+    The game engine, as a generator returning the final bankroll. With
+    `emit`, it yields a (kind, number, bet, amount) report for everything
+    that happens, as it happens: kind is one of the event kinds above and
+    bet a Bet or None. When the game ends on a seven-out or a come-out
+    craps every bet still on the table is reported lost.
+
+    Without `emit` nothing is yielded, and the whole game is played by the
+    first next().
+    """
+    roll_next = get_roller(rng)
+    timed = timings is not None
+    rates = payout_rates(agent)
+    num_rates = len(rates)
+
     agent.start_new_game()
     agent.point_established = False
     agent.current_point = None
     agent.active_come_points = set()
+    if emit:
+        yield (GAME_START, 0, None, agent.bankroll)
+    bet_ledger(agent)
     agent.place_pass_line_bet()
+    if emit:
+        yield from _new_bet_reports(agent, 0)
+
+    # Incremental table state, if the agent keeps one (see BaseAgent.table)
+    table = getattr(agent, 'table', None)
+    reuse_decisions = table is not None and getattr(agent, 'deterministic_policy', False)
+    decided_bankroll = None
 
     game_over = False
 
     # --- Come-Out Round ---
     while not agent.point_established and not game_over:
-        roll = roll_dice(rng)
+        if timed:
+            t0 = perf_counter()
+            roll = roll_next()
+            t1 = perf_counter()
+            timings.add(ROLL, t1 - t0)
+        else:
+            roll = roll_next()
+        if emit:
+            yield (ROLL_EVENT, roll, None, 0.0)
         if roll in (7, 11):
             agent.bankroll += agent.table_min
+            if emit:
+                yield (BET_WON, roll, PASS_LINE, agent.table_min)
         elif roll in (2, 3, 12):
             game_over = True
+            if emit:
+                for placed in agent.bets:
+                    yield (BET_LOST, roll, bet_of(placed), placed['amount'])
         else:
             agent.point_established = True
             agent.current_point = roll
+            if table is not None:
+                table.point_set()
+            if emit:
+                yield (POINT_SET, roll, None, 0.0)
+        if timed:
+            timings.add(RESOLVE, perf_counter() - t1)
 
     # --- Point Round ---
     while not game_over:
         if not agent.can_continue():
             break
 
-        agent.update_action_space()
-        action = agent.choose_action()
-        if action:
-            agent.place_bets(action)
+        # A deterministic agent facing the same table and bankroll as last
+        # roll would make the same (unplaceable) choice again, so skip it
+        if not reuse_decisions or table.dirty or agent.bankroll != decided_bankroll:
+            if table is not None:
+                table.dirty = False
+            if timed:
+                t0 = perf_counter()
+            agent.update_action_space()
+            if timed:
+                t1 = perf_counter()
+                timings.add(UPDATE, t1 - t0)
+            action = agent.choose_action()
+            if timed:
+                t0 = perf_counter()
+                timings.add(CHOOSE, t0 - t1)
+            if action:
+                placed_before = len(agent.bets)
+                agent.place_bets(action)
+                if timed:
+                    timings.add(PLACE, perf_counter() - t0)
+                if emit:
+                    yield from _new_bet_reports(agent, placed_before)
+            decided_bankroll = agent.bankroll
 
-        roll = roll_dice(rng)
+        if timed:
+            t0 = perf_counter()
+            roll = roll_next()
+            t1 = perf_counter()
+            timings.add(ROLL, t1 - t0)
+        else:
+            roll = roll_next()
+        if emit:
+            yield (ROLL_EVENT, roll, None, 0.0)
 
         if roll == 7:
+            if emit:
+                on_table = list(agent.bets)
+                bankroll = agent.bankroll
             agent.resolve_game('seven_out')
+            if timed:
+                timings.add(RESOLVE, perf_counter() - t1)
+            if emit:
+                yield (SEVEN_OUT, roll, None, agent.bankroll - bankroll)
+                for placed in on_table:
+                    yield (BET_LOST, roll, bet_of(placed), placed['amount'])
             break
 
+        # Only the bets the rolled number touches are looked at
+        ledger = agent.bets
+
         # Pass Line win
         if roll == agent.current_point:
             agent.bankroll += agent.table_min
-            for bet in agent.bets:
-                if bet['type'].startswith('pass_line_odds_'):
-                    amt = parse_pass_line_odds_bet(bet['type'])
-                    if amt:
-                        agent.bankroll += agent.lookup_payout(('pass_line_odds_$' + str(amt),), f'win_{roll}')
+            if emit:
+                yield (BET_WON, roll, PASS_LINE, agent.table_min)
+            outcome = WIN_CODES[roll]
+            for _, b in ledger.pass_odds:
+                paid = rates[b.code][outcome] if b.code < num_rates else 0.0
+                agent.bankroll += paid
+                if emit:
+                    yield (BET_WON, roll, b, paid)
 
         # Come bet wins
         if roll in agent.active_come_points:
-            for bet in agent.bets:
-                if bet['type'] == 'come_flat' and bet.get('point') == roll:
-                    agent.bankroll += bet['amount']
-                elif bet['type'].startswith('come_odds_'):
-                    amt, pt = parse_come_odds_bet(bet['type'])
-                    if pt == roll:
-                        key = ('come_odds_$' + str(amt) + '_' + str(pt),)
-                        agent.bankroll += agent.lookup_payout(key, f'win_{roll}')
+            outcome = WIN_CODES[roll]
+            for placed, b in ledger.numbers.get(roll, ()):
+                if b.kind == COME_FLAT:
+                    paid = placed['amount']
+                else:
+                    paid = rates[b.code][outcome] if b.code < num_rates else 0.0
+                agent.bankroll += paid
+                if emit:
+                    yield (BET_WON, roll, b, paid)
 
         # Come bet progression (bet becomes come point)
-        for bet in agent.bets[:]:
-            if bet['type'] == 'come_flat' and 'point' not in bet:
-                if roll in (7, 11):
-                    agent.bankroll += bet['amount']
-                    agent.bets.remove(bet)
-                elif roll in (2, 3, 12):
-                    agent.bets.remove(bet)
-                else:
-                    bet['point'] = roll
-                    agent.active_come_points.add(roll)
+        if ledger.pending:
+            if roll in (7, 11):
+                for placed, b in ledger.drop_pending():
+                    agent.bankroll += placed['amount']
+                    if table is not None:
+                        table.come_bet_resolved()
+                    if emit:
+                        yield (BET_WON, roll, b, placed['amount'])
+            elif roll in (2, 3, 12):
+                for placed, b in ledger.drop_pending():
+                    if table is not None:
+                        table.come_bet_resolved()
+                    if emit:
+                        yield (BET_LOST, roll, b, placed['amount'])
+            else:
+                moved = ledger.move_pending(roll)
+                agent.active_come_points.add(roll)
+                if table is not None:
+                    for _ in range(moved):
+                        table.come_bet_moved()
+
+        if timed:
+            timings.add(RESOLVE, perf_counter() - t1)
 
+    if emit:
+        yield (GAME_END, 0, None, agent.bankroll)
     return agent.bankroll
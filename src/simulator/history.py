@@ -0,0 +1,164 @@
+# src/simulator/history.py
+
+"""
+Per-game bankroll history in a typed, growable buffer.
+
+Histories hold one float64 per game in a preallocated array that doubles
+when full. Past `spill_after` entries the buffer moves to a memory-mapped
+file, so very long runs do not have to fit in RAM. `values` is a view of the
+filled part, and NumPy, pandas and matplotlib read the history through it
+without copying.
+"""
+
+import os
+import tempfile
+import numpy as np
+
+# Entries kept in memory before spilling to disk (128 MB of float64)
+SPILL_AFTER = 1 << 24
+INITIAL_CAPACITY = 1024
+
+DTYPE = np.float64
+
+
+class BankrollHistory:
+    """
+    Append-only sequence of final bankrolls, one per game.
+
+    `capacity` preallocates room (e.g. the number of games planned). A
+    spilled history's file lives in `spill_dir` (the system temp directory
+    by default) until release() is called; pickling a spilled history sends
+    the file's path rather than its contents, so it can be returned from a
+    worker process cheaply.
+    """
+
+    def __init__(self, capacity=INITIAL_CAPACITY, spill_after=SPILL_AFTER, spill_dir=None):
+        self.spill_after = spill_after
+        self.spill_dir = spill_dir
+        self.path = None
+        self._size = 0
+        self._data = np.empty(0, dtype=DTYPE)
+        self._grow(max(1, capacity))
+
+    @classmethod
+    def from_values(cls, values, **kwargs):
+        values = np.asarray(values, dtype=DTYPE)
+        history = cls(capacity=len(values), **kwargs)
+        history.extend(values)
+        return history
+
+    @property
+    def spilled(self):
+        return self.path is not None
+
+    @property
+    def values(self):
+        # View of the games played so far
+        return self._data[:self._size]
+
+    def append(self, bankroll):
+        if self._size == len(self._data):
+            self._grow(2 * len(self._data))
+        self._data[self._size] = bankroll
+        self._size += 1
+
+    def extend(self, bankrolls):
+        bankrolls = np.asarray(bankrolls, dtype=DTYPE)
+        needed = self._size + len(bankrolls)
+        if needed > len(self._data):
+            capacity = len(self._data)
+            while capacity < needed:
+                capacity *= 2
+            self._grow(capacity)
+        self._data[self._size:needed] = bankrolls
+        self._size = needed
+
+    def tolist(self):
+        return self.values.tolist()
+
+    def release(self):
+        """
+        Drop the buffer and delete the spill file, if any. The history is
+        empty afterwards.
+        """
+        path = self.path
+        self._data = np.empty(0, dtype=DTYPE)
+        self._size = 0
+        self.path = None
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+
+    def _grow(self, capacity):
+        if capacity <= len(self._data):
+            return
+        if self.path is None and capacity <= self.spill_after:
+            data = np.empty(capacity, dtype=DTYPE)
+            data[:self._size] = self._data[:self._size]
+            self._data = data
+            return
+
+        if self.path is None:
+            fd, self.path = tempfile.mkstemp(prefix='bankrolls_', suffix='.f8', dir=self.spill_dir)
+            os.close(fd)
+            old = self._data[:self._size]
+        else:
+            old = None
+            self._data.flush()
+            self._data = None  # unmap before resizing the file
+
+        with open(self.path, 'r+b') as f:
+            f.truncate(capacity * np.dtype(DTYPE).itemsize)
+        self._data = np.memmap(self.path, dtype=DTYPE, mode='r+', shape=(capacity,))
+        if old is not None:
+            self._data[:len(old)] = old
+
+    # --- Sequence and array protocols ---
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __array__(self, dtype=None, copy=None):
+        if copy:
+            return np.array(self.values, dtype=dtype)
+        return self.values if dtype is None else self.values.astype(dtype, copy=False)
+
+    def __eq__(self, other):
+        # Sequence equality, like the lists simulate_agent used to return
+        try:
+            other = np.asarray(other, dtype=DTYPE)
+        except (TypeError, ValueError):
+            return NotImplemented
+        return other.shape == (self._size,) and bool(np.array_equal(self.values, other))
+
+    __hash__ = None
+
+    def __repr__(self):
+        where = f", spilled to {self.path}" if self.spilled else ""
+        return f"BankrollHistory({self._size} games{where})"
+
+    def __reduce__(self):
+        if self.spilled:
+            self._data.flush()
+            return (_open_spilled, (self.path, self._size, len(self._data), self.spill_after, self.spill_dir))
+        return (_restore, (np.array(self.values), self.spill_after, self.spill_dir))
+
+
+def _restore(values, spill_after, spill_dir):
+    return BankrollHistory.from_values(values, spill_after=spill_after, spill_dir=spill_dir)
+
+
+def _open_spilled(path, size, capacity, spill_after, spill_dir):
+    # Reattach to a spill file written by another BankrollHistory
+    history = BankrollHistory.__new__(BankrollHistory)
+    history.spill_after = spill_after
+    history.spill_dir = spill_dir
+    history.path = path
+    history._size = size
+    history._data = np.memmap(path, dtype=DTYPE, mode='r+', shape=(capacity,))
+    return history
@@ -0,0 +1,164 @@
+# src/simulator/ledger.py
+
+"""
+Bets on the table, indexed by the number they resolve on.
+
+A BetLedger is the list of placed-bet dicts an agent keeps as agent.bets,
+plus buckets that say which bets a roll can touch: pass-line odds (paid
+when the point is made), bets riding on each come number (come flats that
+have travelled there and the odds behind them), and come bets still
+waiting for their number. The engine reads the buckets for the rolled
+number instead of scanning every bet three times per roll.
+
+Only the list operations below keep the buckets in step; assign a new list
+to agent.bets (BaseAgent wraps it in a fresh ledger) rather than editing
+one with slice assignment.
+"""
+
+import numpy as np
+from simulator.bets import bet_of, COME_FLAT, PASS_LINE_ODDS, COME_ODDS
+
+
+class BetLedger(list):
+    """
+    list of placed-bet dicts with per-number buckets of (placed, Bet) pairs:
+
+        pass_odds   odds behind the pass line
+        numbers     come number -> come flats moved there and come odds on it
+        pending     come flats waiting for their number
+    """
+
+    __slots__ = ('pass_odds', 'numbers', 'pending')
+
+    def __init__(self, placed=()):
+        super().__init__()
+        self._reset_index()
+        self.extend(placed)
+
+    def __reduce__(self):
+        return (BetLedger, (list(self),))
+
+    def _reset_index(self):
+        self.pass_odds = []
+        self.numbers = {}
+        self.pending = []
+
+    def _index(self, placed, bet):
+        kind = bet.kind
+        if kind == PASS_LINE_ODDS:
+            self.pass_odds.append((placed, bet))
+        elif kind == COME_ODDS:
+            self.numbers.setdefault(bet.point, []).append((placed, bet))
+        elif kind == COME_FLAT:
+            if 'point' in placed:
+                self.numbers.setdefault(placed['point'], []).append((placed, bet))
+            else:
+                self.pending.append((placed, bet))
+
+    def _reindex(self):
+        self._reset_index()
+        for placed in self:
+            self._index(placed, bet_of(placed))
+
+    def add(self, placed, bet):
+        """
+        append() for callers that already hold the placed bet's record.
+        """
+        list.append(self, placed)
+        self._index(placed, bet)
+
+    # --- list operations that keep the buckets current ---
+
+    def append(self, placed):
+        list.append(self, placed)
+        self._index(placed, bet_of(placed))
+
+    def extend(self, placed):
+        for p in placed:
+            self.append(p)
+
+    def clear(self):
+        super().clear()
+        self._reset_index()
+
+    def remove(self, placed):
+        super().remove(placed)
+        self._reindex()
+
+    def pop(self, index=-1):
+        placed = super().pop(index)
+        self._reindex()
+        return placed
+
+    def insert(self, index, placed):
+        super().insert(index, placed)
+        self._reindex()
+
+    def __iadd__(self, placed):
+        self.extend(placed)
+        return self
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._reindex()
+
+    def __setitem__(self, index, placed):
+        super().__setitem__(index, placed)
+        self._reindex()
+
+    # --- Roll resolution ---
+
+    def move_pending(self, number):
+        """
+        Send every pending come bet to `number`. Returns how many moved.
+        """
+        moved = self.pending
+        bucket = self.numbers.setdefault(number, [])
+        for placed, bet in moved:
+            placed['point'] = number
+            bucket.append((placed, bet))
+        self.pending = []
+        return len(moved)
+
+    def drop_pending(self):
+        """
+        Take every pending come bet off the table (one pass over the list)
+        and return the (placed, Bet) pairs removed.
+        """
+        dropped = self.pending
+        if dropped:
+            gone = {id(placed) for placed, _ in dropped}
+            kept = [placed for placed in self if id(placed) not in gone]
+            super().clear()
+            super().extend(kept)
+            self.pending = []
+        return dropped
+
+    # --- Vectorized settlement ---
+
+    def amounts(self):
+        return np.array([placed['amount'] for placed in self], dtype=float)
+
+    def settle(self, rates):
+        """
+        Settle every bet at once against `rates` (one per bet, in list
+        order, as multiples of the bet amount): bets with a negative rate
+        are lost and leave the table, positive rates pay out. Returns the
+        total paid.
+        """
+        rates = np.asarray(rates, dtype=float)
+        if not len(self):
+            return 0.0
+        win = rates > 0
+        paid = float(self.amounts()[win] @ rates[win]) if win.any() else 0.0
+        lost = rates < 0
+        if lost.any():
+            kept = [placed for placed, gone in zip(self, lost) if not gone]
+            super().clear()
+            super().extend(kept)
+            self._reindex()
+        return paid
+
+    def records(self):
+        # Bet records in list order
+        return [bet_of(placed) for placed in self]
@@ -0,0 +1,705 @@
+# src/simulator/markov.py
+
+"""
+Exact evaluation of deterministic betting policies.
+
+One game of play_game is an absorbing Markov chain over table states (the
+point, the odds behind it, come bets pending or on their numbers and the
+odds behind those) and the bankroll. A policy maps the table state to the
+bets it places; the bankroll only matters through thresholds (what can be
+afforded, whether the agent can continue or walks away). evaluate() solves
+the chain one of two ways:
+
+- by table state, when the bankroll cannot come near a threshold: there is
+  no walkaway threshold, and a Chernoff bound on the total wagered in a
+  game puts the chance of the bankroll running low below `tol`. Every
+  decision is then the one made with no bankroll limit, so the net result
+  from each table state is solved once, successors first (table states
+  only move forward, apart from rolls that bring a state back to itself,
+  which are summed as a geometric series by FFT), and the game is the
+  come-out's distribution shifted by the opening bankroll.
+- roll by roll otherwise: the chain is pushed forward with the probability
+  of every bankroll held as an array per table state, and finished games
+  are collected as they absorb.
+
+Either way the result is the exact distribution of the final bankroll, up
+to the probability mass reported as truncated_mass.
+
+Decisions and roll transitions are memoized per table state, separately
+from the bankroll. The per-state rules (decision and roll) are public, so
+other engines built on the same chain (see compiled) share one copy of
+them.
+
+A policy is a function of the ChainState, or a deterministic agent (see
+AgentPolicy and evaluate_agent), which is asked for its own choices.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+import numpy as np
+from simulator.payouts import PAYOUT_TABLE
+from simulator.probabilities import P2, P3, P4, P5, P6, P7, P8, P9, P10, P11, P12
+from simulator.bets import bet_of, get_bet, PASS_LINE_FLAT, PASS_LINE_ODDS, COME_FLAT, COME_ODDS
+from simulator.atomic_actions import legal_odds_bet_amounts, MAX_MULTIPLIER
+
+ROLL_PROBS = {2: P2, 3: P3, 4: P4, 5: P5, 6: P6, 7: P7, 8: P8, 9: P9, 10: P10, 11: P11, 12: P12}
+
+METHODS = ('auto', 'by_state', 'roll_by_roll')
+
+# Table states beyond which evaluation gives up (a policy that keeps adding
+# come bets reaches ever more of them, and its chain has no finite solution)
+MAX_TABLE_STATES = 20_000
+
+# Chernoff parameters (per unit wagered) tried when bounding the total
+# wagered in a game
+CHERNOFF_THETAS = np.geomspace(1e-5, 1.0, 41)
+
+# Table state between rolls. Come-out is point=None.
+#   pass_odds   amounts of the odds bets behind the pass line
+#   pending     come bets waiting for their number
+#   come_flats  ((number, count), ...) come bets on their numbers
+#   come_odds   ((number, amount), ...) odds behind come numbers
+ChainState = namedtuple('ChainState', ['point', 'pass_odds', 'pending', 'come_flats', 'come_odds'])
+
+COME_OUT = ChainState(None, (), 0, (), ())
+
+GameDistribution = namedtuple(
+    'GameDistribution',
+    ['net_results', 'expected_bankroll', 'bust_probability', 'truncated_mass']
+)
+
+
+def fixed_policy(odds_multiple=1, max_come_bets=0):
+    """
+    The policy of agents.fixed_policy_agent.FixedPolicyAgent as a function
+    of the table state.
+    """
+    if not 0 <= odds_multiple <= MAX_MULTIPLIER:
+        raise ValueError(f"odds_multiple must be between 0 and {MAX_MULTIPLIER}")
+
+    def policy(state):
+        action = []
+        if odds_multiple and not state.pass_odds:
+            amt = legal_odds_bet_amounts(state.point, odds_multiple)[-1]
+            action.append(get_bet(PASS_LINE_ODDS, amt))
+        if odds_multiple:
+            backed = {pt for pt, _ in state.come_odds}
+            for pt, _ in state.come_flats:
+                if pt not in backed:
+                    amt = legal_odds_bet_amounts(pt, odds_multiple)[-1]
+                    action.append(get_bet(COME_ODDS, amt, pt))
+        come_bets = state.pending + sum(count for _, count in state.come_flats)
+        if not state.pending and come_bets < max_come_bets:
+            action.append(get_bet(COME_FLAT))
+        return action
+
+    return policy
+
+
+class AgentPolicy:
+    """
+    The policy of a deterministic agent, asked of the agent itself: it is
+    seated at a table state with a given bankroll (see seat_agent), and
+    whatever its choose_action and place_bets put on the table is the move.
+
+    Called as policy(state) it gives the bets placed with no bankroll
+    limit. placements() also covers smaller bankrolls, assuming (as holds
+    for agents that take their best affordable action, like ClassicalAgent)
+    that a smaller bankroll only ever rules choices out.
+    """
+
+    def __init__(self, agent):
+        if not getattr(agent, 'deterministic_policy', False):
+            raise ValueError(f"{type(agent).__name__} does not have a deterministic policy")
+        self.agent = agent
+
+    def __call__(self, state):
+        tiers = self.placements(state, limit=1)
+        return tiers[0][1] if tiers else []
+
+    def placements(self, state, unit=1, limit=None):
+        """
+        [(lowest bankroll, bets placed)] from the largest bankroll down. An
+        entry holds from its bankroll up to the previous entry's; below the
+        last one nothing is placed. `unit` is the bankroll step.
+        """
+        agent = self.agent
+        tiers = []
+        bankroll = float('inf')
+        while limit is None or len(tiers) < limit:
+            seat_agent(agent, state, bankroll)
+            agent.update_action_space()
+            action = agent.choose_action()
+            if not action:
+                break
+            cost = sum(agent._get_bet_amount(bet) for bet in action)
+            if cost > bankroll:
+                break
+            placed_before = len(agent.bets)
+            agent.place_bets(action)
+            tiers.append((cost, [bet_of(placed) for placed in agent.bets[placed_before:]]))
+            bankroll = cost - unit
+        return tiers
+
+
+def seat_agent(agent, state, bankroll=float('inf')):
+    """
+    Put an agent's bets, table state and bankroll in line with a ChainState.
+    """
+    tm = agent.table_min
+    agent.start_new_game()
+    agent.bankroll = float('inf')
+    agent.current_point = state.point
+    agent.point_established = True
+    agent.add_bet(get_bet(PASS_LINE_FLAT), tm)
+    for amount in state.pass_odds:
+        agent.add_bet(get_bet(PASS_LINE_ODDS, amount), amount)
+    for number, count in state.come_flats:
+        for _ in range(count):
+            agent.add_bet(get_bet(COME_FLAT), tm)
+            agent.table.come_bet_moved()
+        agent.bets.move_pending(number)
+        agent.active_come_points.add(number)
+    for number, amount in state.come_odds:
+        agent.add_bet(get_bet(COME_ODDS, amount, number), amount)
+    for _ in range(state.pending):
+        agent.add_bet(get_bet(COME_FLAT), tm)
+    agent.table.point_set()
+    agent.bankroll = bankroll
+
+
+class MarkovEvaluator:
+    """
+    Exact per-game outcome distribution of a deterministic policy.
+
+    `policy(state)` returns the bets (Bet records) to place before a
+    point-round roll; like place_bets, nothing is placed unless the whole
+    action is affordable. A deterministic agent can be passed instead (see
+    AgentPolicy, and for_agent to take the other settings from it too). The
+    remaining arguments mirror BaseAgent. All amounts and payouts must be
+    whole multiples of `unit` dollars.
+    """
+
+    def __init__(self, policy, starting_bankroll=1000, table_minimum=10, walkaway_threshold=None,
+                 payout_table=None, unit=1):
+        if hasattr(policy, 'choose_action'):
+            policy = AgentPolicy(policy)
+        self.policy = policy
+        self.starting_bankroll = starting_bankroll
+        self.table_min = table_minimum
+        self.walkaway_threshold = walkaway_threshold
+        self.payout_table = PAYOUT_TABLE if payout_table is None else payout_table
+        self.unit = unit
+        self._decisions = {}
+        self._moves = {}
+
+    @classmethod
+    def for_agent(cls, agent, unit=1):
+        """
+        Evaluator for a deterministic agent, with its bankroll, table
+        minimum, walkaway threshold and payouts.
+        """
+        return cls(AgentPolicy(agent), starting_bankroll=agent.initial_bankroll,
+                   table_minimum=agent.table_min, walkaway_threshold=agent.walkaway_threshold,
+                   payout_table=agent.payout_table, unit=unit)
+
+    def evaluate(self, tol=1e-12, max_steps=100_000, method='auto', max_states=MAX_TABLE_STATES):
+        """
+        Return a GameDistribution: {net result: probability}, the expected
+        final bankroll, the probability of finishing below the table minimum
+        and the probability mass the result leaves unresolved.
+
+        `method` is 'by_state', 'roll_by_roll' or 'auto' (by table state
+        where that is exact to within `tol`, see the module docstring).
+        Raises ValueError if the policy reaches more than `max_states`
+        table states.
+        """
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {METHODS}")
+        if method != 'roll_by_roll':
+            result = self._evaluate_by_state(tol, max_states)
+            if result is not None:
+                return result
+            if method == 'by_state':
+                raise ValueError("The bankroll can reach a threshold; this chain must be evaluated roll by roll")
+        return self._evaluate_roll_by_roll(tol, max_steps, max_states)
+
+    # --- Solving by table state ---
+
+    def _evaluate_by_state(self, tol, max_states):
+        # None when the bankroll may reach a threshold (or the table states
+        # cannot be solved in order)
+        if self.walkaway_threshold is not None:
+            return None
+        tm = self._units(self.table_min)
+        start = self._units(self.starting_bankroll)
+        if start < tm:
+            return None
+        opening = start - tm  # pass line flat bet
+
+        graph = self._state_graph(max_states)
+        order = None if graph is None else _successors_first(graph)
+        if order is None:
+            return None
+
+        # Below `margin` a decision may differ from the one made with no
+        # bankroll limit; the bankroll never falls below the opening
+        # bankroll less the total wagered
+        margin = max(tm, max(threshold for threshold, _, _ in graph.values()))
+        threshold_mass = _wager_tail_bound(graph, order, opening - margin + 1)
+        if threshold_mass > tol:
+            return None
+
+        lo, probs = _net_distributions(graph, order, tol / len(graph))
+        return self._distribution(opening + lo, probs, max(0.0, 1.0 - probs.sum()) + threshold_mass)
+
+    def _state_graph(self, max_states):
+        """
+        {table state before a decision: (bankroll the decision needs, wager,
+        moves of the roll that follows)} for every table state reachable
+        with no bankroll limit, or None if there are too many.
+        """
+        graph = {}
+        stack = [COME_OUT]
+        seen = {COME_OUT}
+        while stack:
+            state = stack.pop()
+            threshold, wager, rolled = 0, 0, state
+            if state.point is not None:
+                tiers = self.decisions(state)
+                if tiers:
+                    threshold, wager, placed = tiers[0]
+                    if placed is not None:
+                        rolled = placed
+            moves = self._moves_from(rolled, repeat=False)
+            graph[state] = (threshold, wager, moves)
+            for _, nxt, _ in moves:
+                if nxt is not None and nxt not in seen:
+                    if len(seen) >= max_states:
+                        return None
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return graph
+
+    # --- Pushing the chain forward roll by roll ---
+
+    def _evaluate_roll_by_roll(self, tol, max_steps, max_states):
+        tm = self._units(self.table_min)
+        start = self._units(self.starting_bankroll)
+        opening = start - tm if start >= tm else start  # pass line flat bet
+
+        # Bankroll distributions are (lowest bankroll in units, probabilities)
+        live = {COME_OUT: (opening, np.ones(1))}
+        final = {}
+
+        for _ in range(max_steps):
+            if sum(arr.sum() for _, arr in live.values()) <= tol:
+                break
+
+            nxt = {}
+            for state, dist in live.items():
+                for branch_state, mass, done, repeat in self._decide(state, dist):
+                    if done is not None:
+                        _accumulate(final, None, *done)
+                    if mass is None:
+                        continue
+                    lo, arr = mass
+                    for q, next_state, delta in self._moves_from(branch_state, repeat):
+                        _accumulate(final if next_state is None else nxt, next_state, lo + delta, arr, q)
+            live = nxt
+            if len(self._decisions) > max_states:
+                raise ValueError(f"Policy reaches more than {max_states} table states")
+
+        lo, probs = final.get(None, (0, np.zeros(0)))
+        return self._distribution(lo, probs, sum(arr.sum() for _, arr in live.values()))
+
+    def _distribution(self, lo, probs, truncated_mass):
+        # GameDistribution of final bankrolls lo, lo + 1, ... (in units)
+        keep = np.flatnonzero(probs)
+        probs = probs[keep]
+        dollars = (lo + keep) * self.unit
+        return GameDistribution(
+            net_results={
+                float(b - self.starting_bankroll): float(p) for b, p in zip(dollars, probs)
+            },
+            expected_bankroll=float(dollars @ probs),
+            bust_probability=float(probs[dollars < self.table_min].sum()),
+            truncated_mass=float(truncated_mass)
+        )
+
+    def _decide(self, state, dist):
+        """
+        Split the bankroll distribution at `state` into the branches the
+        engine would take: [(state rolled from, mass or None, mass that
+        stops here or None, whether the branch placed nothing)].
+        """
+        if state.point is None:
+            return [(state, dist, None, True)]
+
+        lo, arr = dist
+        idx = lo + np.arange(len(arr))
+        done = None
+        stop = idx < self._units(self.table_min)
+        if self.walkaway_threshold is not None:
+            stop |= idx * self.unit >= self.walkaway_threshold
+        if stop.any():
+            done = (lo, np.where(stop, arr, 0.0))
+            arr = np.where(stop, 0.0, arr)
+
+        # Each tier takes the bankrolls from its threshold up to the last one's
+        branches = []
+        idle = arr
+        upper = None
+        for threshold, wager, placed in self.decisions(state):
+            band = idx >= threshold
+            if upper is not None:
+                band &= idx < upper
+            upper = threshold
+            if placed is None or not band.any():
+                continue
+            branches.append((placed, (lo - wager, np.where(band, arr, 0.0)), None, False))
+            idle = np.where(band, 0.0, idle)
+
+        if not branches:
+            return [(state, (lo, arr), done, True)]
+        if idle.any():
+            branches.append((state, (lo, idle), None, True))
+        placed, mass, _, repeat = branches[0]
+        branches[0] = (placed, mass, done, repeat)
+        return branches
+
+    # --- Table rules ---
+
+    def decision(self, state):
+        """
+        What the policy does at a point-round table state with no bankroll
+        limit, as (wager in units, table state after placing), or (0, None)
+        if it places nothing.
+        """
+        tiers = self.decisions(state)
+        if not tiers:
+            return 0, None
+        _, wager, placed = tiers[0]
+        return (wager, placed) if placed is not None else (0, None)
+
+    def decisions(self, state):
+        """
+        What the policy does at a point-round table state, by bankroll:
+        [(lowest bankroll in units, wager in units, table state after
+        placing or None)], from the largest bankroll down. An entry holds
+        from its bankroll up to the previous entry's; below the last one
+        nothing is placed. Memoized per table state.
+        """
+        cached = self._decisions.get(state)
+        if cached is not None:
+            return cached
+
+        if isinstance(self.policy, AgentPolicy):
+            tiers = self.policy.placements(state, self.unit)
+        else:
+            action = self.policy(state)
+            tiers = [(sum(self._amount(bet) for bet in action), action)] if action else []
+
+        cached = []
+        for threshold, bets in tiers:
+            placed = self._placed(state, bets) if bets else None
+            cached.append((self._units(threshold), self._units(sum(self._amount(bet) for bet in bets)), placed))
+        self._decisions[state] = cached
+        return cached
+
+    def _placed(self, state, bets):
+        # Table state after placing `bets` at `state`
+        pass_odds = list(state.pass_odds)
+        come_odds = list(state.come_odds)
+        pending = state.pending
+        for bet in bets:
+            if bet.kind == PASS_LINE_ODDS:
+                pass_odds.append(self._amount(bet))
+            elif bet.kind == COME_ODDS:
+                come_odds.append((bet.point, self._amount(bet)))
+            elif bet.kind == COME_FLAT:
+                pending += 1
+        return state._replace(
+            pass_odds=tuple(sorted(pass_odds)),
+            pending=pending,
+            come_odds=tuple(sorted(come_odds))
+        )
+
+    def _amount(self, bet):
+        return self.table_min if bet.amount is None else bet.amount
+
+    def _moves_from(self, state, repeat=True):
+        """
+        Memoized [(probability, next state or None if the game ends,
+        bankroll change in units)] for one roll from `state`.
+
+        With `repeat` the agent is known to face the same decision again
+        (nothing was placed, and the bankroll that let it keep playing is
+        unchanged), so a roll that changes nothing just repeats the roll and
+        the moves are conditioned on the roll changing something; otherwise
+        the same state would be revisited forever.
+        """
+        cached = self._moves.get((state, repeat))
+        if cached is not None:
+            return cached
+
+        moves = {}
+        for roll, p in ROLL_PROBS.items():
+            key = self.roll(state, roll)
+            moves[key] = moves.get(key, 0.0) + p
+
+        stay = moves.pop((state, 0), 0.0) if repeat else 0.0
+        cached = [(p / (1.0 - stay), s, d) for (s, d), p in moves.items()]
+        self._moves[(state, repeat)] = cached
+        return cached
+
+    def roll(self, state, roll):
+        """
+        One roll from a table state, by play_game's rules: (next table
+        state, or None if the game ends; bankroll change in units).
+        """
+        tm = self.table_min
+        if state.point is None:
+            if roll in (7, 11):
+                return state, self._units(tm)
+            if roll in (2, 3, 12):
+                return None, 0
+            return ChainState(roll, (), 0, (), ()), 0
+
+        if roll == 7:
+            return None, 0
+
+        won = 0.0
+        outcome = f'win_{roll}'
+        if roll == state.point:
+            won += tm
+            for amt in state.pass_odds:
+                won += self._payout(get_bet(PASS_LINE_ODDS, amt), outcome)
+
+        flats = dict(state.come_flats)
+        if roll in flats:
+            won += flats[roll] * tm
+            for pt, amt in state.come_odds:
+                if pt == roll:
+                    won += self._payout(get_bet(COME_ODDS, amt, pt), outcome)
+
+        pending = state.pending
+        if pending:
+            if roll == 11:
+                won += pending * tm
+            elif roll not in (2, 3, 12):
+                flats[roll] = flats.get(roll, 0) + pending
+            pending = 0
+
+        next_state = state._replace(pending=pending, come_flats=tuple(sorted(flats.items())))
+        return next_state, self._units(won)
+
+    def _payout(self, bet, outcome):
+        return self.payout_table.get((bet.key, outcome), 0.0)
+
+    def _units(self, amount):
+        units = amount / self.unit
+        if units != int(units):
+            raise ValueError(f"Amount {amount} is not a multiple of the {self.unit} unit")
+        return int(units)
+
+
+def _accumulate(dists, key, lo, arr, weight=1.0):
+    # dists[key] += weight * arr placed at bankroll offset lo
+    current = dists.get(key)
+    if current is None:
+        dists[key] = (lo, arr * weight)
+        return
+    cur_lo, cur = current
+    new_lo = min(lo, cur_lo)
+    new_hi = max(lo + len(arr), cur_lo + len(cur))
+    if new_lo != cur_lo or new_hi != cur_lo + len(cur):
+        grown = np.zeros(new_hi - new_lo)
+        grown[cur_lo - new_lo:cur_lo - new_lo + len(cur)] = cur
+        cur, cur_lo = grown, new_lo
+        dists[key] = (cur_lo, cur)
+    cur[lo - cur_lo:lo - cur_lo + len(arr)] += arr * weight
+
+
+# --- Solving a state graph (see MarkovEvaluator._state_graph) ---
+
+def _successors_first(graph):
+    """
+    The graph's states with every state after the states it can roll to
+    (other than itself), or None if some states can roll back to each other.
+    """
+    order = []
+    visiting = set()
+    done = set()
+    stack = [(COME_OUT, iter(graph[COME_OUT][2]))]
+    visiting.add(COME_OUT)
+    while stack:
+        state, moves = stack[-1]
+        for _, nxt, _ in moves:
+            if nxt is None or nxt == state or nxt in done:
+                continue
+            if nxt in visiting:
+                return None
+            visiting.add(nxt)
+            stack.append((nxt, iter(graph[nxt][2])))
+            break
+        else:
+            stack.pop()
+            visiting.discard(state)
+            done.add(state)
+            order.append(state)
+    return order
+
+
+def _wager_tail_bound(graph, order, limit):
+    """
+    Chernoff bound on the probability that a game wagers `limit` units or
+    more in total: min over theta of E[exp(theta * total)] / exp(theta *
+    limit), with E[exp(theta * total)] solved per state like the net
+    result.
+    """
+    if limit <= 0:
+        return 1.0
+    thetas = CHERNOFF_THETAS
+    mgf = {}
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        for state in order:
+            _, wager, moves = graph[state]
+            rest = np.zeros(len(thetas))
+            stay = 0.0
+            for p, nxt, _ in moves:
+                if nxt == state:
+                    stay += p
+                else:
+                    rest += p * (1.0 if nxt is None else mgf[nxt])
+            growth = np.exp(thetas * wager)
+            denom = 1.0 - growth * stay
+            mgf[state] = np.where(denom > 0, growth * rest / denom, np.inf)
+        bounds = mgf[COME_OUT] * np.exp(-thetas * limit)
+    return float(min(1.0, np.nanmin(bounds)))
+
+
+def _net_distributions(graph, order, eps):
+    """
+    Distribution of the net result (in units) from the come-out, as (lowest
+    result, probabilities), solving every state after its successors.
+    Tails below `eps` are dropped per state.
+    """
+    # A state's distribution is kept until every state rolling to it is done
+    waiting = {}
+    for state in order:
+        for _, nxt, _ in graph[state][2]:
+            if nxt is not None and nxt != state:
+                waiting[nxt] = waiting.get(nxt, 0) + 1
+
+    dists = {}
+    for state in order:
+        _, wager, moves = graph[state]
+        terms = []
+        loops = []
+        for p, nxt, delta in moves:
+            shift = delta - wager
+            if nxt == state:
+                loops.append((p, shift))
+            elif nxt is None:
+                terms.append((p, shift, _POINT_MASS))
+            else:
+                lo, arr = dists[nxt]
+                terms.append((p, shift + lo, arr))
+
+        lo = min(start for _, start, _ in terms)
+        hi = max(start + len(arr) for _, start, arr in terms)
+        total = np.zeros(hi - lo)
+        for p, start, arr in terms:
+            total[start - lo:start - lo + len(arr)] += p * arr
+
+        if loops:
+            lo, total = _solve_loops(lo, total, loops, eps)
+        dists[state] = _trim(lo, total, eps)
+
+        for _, nxt, _ in moves:
+            if nxt is not None and nxt != state:
+                waiting[nxt] -= 1
+                if not waiting[nxt]:
+                    del dists[nxt]
+    return dists[COME_OUT]
+
+
+_POINT_MASS = np.ones(1)
+
+
+def _solve_loops(lo, total, loops, eps):
+    """
+    Solve x = total + sum(p * x shifted by d for p, d in loops): the state
+    rolling back to itself, each time shifting the result by d. Shifts of
+    0 just rescale; otherwise the geometric series is summed by FFT over a
+    span covering all but `eps` of it.
+    """
+    stay = sum(p for p, d in loops if not d)
+    shifts = tuple(sorted((d, p) for p, d in loops if d))
+    if not shifts:
+        return lo, total / (1.0 - stay)
+
+    ratio = sum(p for _, p in shifts) / (1.0 - stay)
+    repeats = int(np.ceil(np.log(eps) / np.log(ratio))) + 1
+    left = repeats * max(0, -shifts[0][0])
+    right = repeats * max(0, shifts[-1][0])
+    span = len(total) + left + right
+    size = _fft_size(span)
+
+    padded = np.zeros(size)
+    padded[left:left + len(total)] = total
+    solved = np.fft.irfft(np.fft.rfft(padded) / _loop_response(size, stay, shifts), size)[:span]
+    return lo - left, np.maximum(solved, 0.0)
+
+
+@lru_cache(maxsize=1024)
+def _loop_response(size, stay, shifts):
+    # Transfer function 1 - stay - sum(p * z**d) on the rfft frequencies;
+    # states with the same loops share it
+    freqs = np.arange(size // 2 + 1) / size
+    response = np.full(len(freqs), 1.0 - stay, dtype=complex)
+    for d, p in shifts:
+        response -= p * np.exp(-2j * np.pi * freqs * d)
+    return response
+
+
+def _fft_size(n):
+    # Smallest 2**a * 3**b >= n
+    best = 1 << (n - 1).bit_length()
+    threes = 1
+    while threes < best:
+        size = threes << max(0, (-(-n // threes) - 1).bit_length())
+        best = min(best, size)
+        threes *= 3
+    return best
+
+
+def _trim(lo, probs, eps):
+    # Drop up to eps/2 of probability from each end
+    head = np.searchsorted(np.cumsum(probs), eps / 2, side='right')
+    tail = np.searchsorted(np.cumsum(probs[::-1]), eps / 2, side='right')
+    end = max(head, len(probs) - tail)
+    return lo + head, probs[head:end].copy()
+
+
+def evaluate_fixed_policy(odds_multiple=1, max_come_bets=0, starting_bankroll=1000, table_minimum=10,
+                          walkaway_threshold=None, tol=1e-12):
+    """
+    Exact outcome distribution of FixedPolicyAgent with these settings.
+    """
+    evaluator = MarkovEvaluator(
+        fixed_policy(odds_multiple, max_come_bets),
+        starting_bankroll=starting_bankroll,
+        table_minimum=table_minimum,
+        walkaway_threshold=walkaway_threshold
+    )
+    return evaluator.evaluate(tol=tol)
+
+
+def evaluate_agent(agent, tol=1e-12, unit=1):
+    """
+    Exact outcome distribution of a game played by a deterministic agent
+    (FixedPolicyAgent, ClassicalAgent, ...), as set up.
+    """
+    return MarkovEvaluator.for_agent(agent, unit=unit).evaluate(tol=tol)
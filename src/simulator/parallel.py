@@ -0,0 +1,102 @@
+# src/simulator/parallel.py
+
+"""
+Run several agents' simulations side by side on a process pool.
+
+Every agent gets its own random stream spawned from one SeedSequence, so an
+agent's results depend only on the seed and its position in the spec list,
+never on which agents ran before it or which process finished first.
+"""
+
+import os
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from simulator.simulator import simulate_agent
+from simulator.dice import DiceTape
+from simulator.history import SPILL_AFTER
+
+AgentRun = namedtuple('AgentRun', ['key', 'history', 'elapsed', 'diagnostics'])
+
+
+def spawn_streams(seed, n):
+    """
+    n independent SeedSequences spawned from `seed` (an int or SeedSequence).
+    """
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return root.spawn(n)
+
+
+def seeded_rng(seed_seq):
+    """
+    Generator for one simulation stream. RandomAgent draws from the global
+    `random` module, so that is seeded from the same stream.
+    """
+    random.seed(int(seed_seq.generate_state(1)[0]))
+    return np.random.default_rng(seed_seq)
+
+
+def _run_agent(key, agent_class, params, seed_seq, num_games, diagnostics_formats, tape=None,
+               phase_timing=False, spill_after=SPILL_AFTER, checkpoint_dir=None, checkpoint_every=None,
+               resume=False):
+    rng = seeded_rng(seed_seq)
+    if tape is not None:
+        # Every agent replays the shared tape from the start
+        rng = DiceTape.load(tape).reader()
+    agent = agent_class(**params)
+    checkpoint_path = None if checkpoint_dir is None else os.path.join(checkpoint_dir, f"{key}.ckpt")
+
+    start = time.perf_counter()
+    history = simulate_agent(agent, rng, num_games=num_games, diagnostics_formats=diagnostics_formats,
+                             phase_timing=phase_timing, spill_after=spill_after,
+                             checkpoint_path=checkpoint_path, checkpoint_every=checkpoint_every, resume=resume,
+                             diagnostics_name=key)
+    elapsed = time.perf_counter() - start
+
+    diagnostics = {
+        fmt: os.path.join("data", f"{key}_diagnostics.{fmt}") for fmt in diagnostics_formats
+    }
+    return AgentRun(key, history, elapsed, diagnostics)
+
+
+def run_agents_parallel(agent_specs, seed, num_games, max_workers=None, diagnostics_formats=("csv",),
+                        tape=None, phase_timing=False, spill_after=SPILL_AFTER, checkpoint_dir=None,
+                        checkpoint_every=None, resume=False):
+    """
+    Simulate every agent in `agent_specs`, a list of (key, AgentClass, params)
+    tuples, and return their AgentRuns in spec order. Each run's
+    diagnostics go to data/<key>_diagnostics.*, so specs of the same agent
+    class do not share files.
+
+    With `tape` (the path of a saved DiceTape) all agents roll the same dice
+    instead of their own streams; the streams still seed RandomAgent's
+    choices. `phase_timing` adds play_game's per-phase timings to every
+    agent's diagnostics. Histories longer than `spill_after` games come
+    back backed by a file (see BankrollHistory); release() them when done.
+
+    With `checkpoint_dir`, each agent checkpoints to <dir>/<key>.ckpt every
+    `checkpoint_every` games and at the end; `resume` continues every agent
+    from its checkpoint (agents without one start over) with the same
+    results as an uninterrupted run.
+
+    Agents run in separate processes (at most `max_workers`, by default one
+    per agent up to the CPU count); max_workers=1 runs them in this process
+    and gives the same results.
+    """
+    streams = spawn_streams(seed, len(agent_specs))
+    jobs = [
+        (key, agent_class, params, stream, num_games, diagnostics_formats, tape, phase_timing, spill_after,
+         checkpoint_dir, checkpoint_every, resume)
+        for (key, agent_class, params), stream in zip(agent_specs, streams)
+    ]
+
+    if max_workers is None:
+        max_workers = min(len(jobs), os.cpu_count() or 1)
+    if max_workers <= 1 or len(jobs) <= 1:
+        return [_run_agent(*job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_run_agent, *job) for job in jobs]
+        return [future.result() for future in futures]
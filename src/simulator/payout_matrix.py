@@ -0,0 +1,102 @@
+# src/simulator/payout_matrix.py
+
+"""
+Payout tables compiled to a dense array indexed by bet code and outcome code.
+
+Payout tables are dicts keyed by ((bet label,), outcome). Looking one up
+builds and hashes that nested tuple every time, which adds up on the roll
+loop. A PayoutMatrix reads such a dict once and stores the payouts in a
+(bet code, outcome code) array, keeping the dict as `table` for anything
+that still wants label keys.
+"""
+
+import numpy as np
+from simulator.bets import BETS, Bet, parse_bet
+from simulator.payouts import PAYOUT_TABLE
+
+# Outcome labels used by the standard table, in code order
+OUTCOMES = ('win', 'lose', 'seven_out', 'win_4', 'win_5', 'win_6', 'win_8', 'win_9', 'win_10')
+OUTCOME_CODES = {outcome: code for code, outcome in enumerate(OUTCOMES)}
+
+WIN, LOSE, SEVEN_OUT = range(3)
+# Outcome code for a point or come point being hit
+WIN_CODES = {n: OUTCOME_CODES[f'win_{n}'] for n in (4, 5, 6, 8, 9, 10)}
+
+
+class PayoutMatrix:
+    """
+    Dense view of a payout dict.
+
+    `values[bet.code, outcome_code]` is the payout, 0.0 where the dict has
+    no entry; `rates` holds the same numbers as nested lists for scalar
+    lookups. Outcomes the standard codes do not cover get codes after them
+    (see outcome_code). Keys that do not name a bet label are only in the
+    dict. Bets registered after compiling have no row and pay 0.0, as they
+    cannot be in the dict either.
+
+    The matrix is a snapshot: compile a new one if the dict changes.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.outcome_codes = dict(OUTCOME_CODES)
+
+        entries = []
+        for key, payout in table.items():
+            try:
+                (label,), outcome = key
+                bet = parse_bet(label)
+            except (TypeError, ValueError):
+                continue
+            code = self.outcome_codes.setdefault(outcome, len(self.outcome_codes))
+            entries.append((bet.code, code, payout))
+
+        self.values = np.zeros((len(BETS), len(self.outcome_codes)))
+        for bet_code, outcome_code, payout in entries:
+            self.values[bet_code, outcome_code] = payout
+        self.values.setflags(write=False)
+        self.rates = self.values.tolist()
+
+    def __reduce__(self):
+        # The shared standard matrix unpickles as itself
+        if self is PAYOUT_MATRIX:
+            return 'PAYOUT_MATRIX'
+        return (PayoutMatrix, (self.table,))
+
+    def outcome_code(self, outcome):
+        # None for an outcome nothing in the table pays on
+        return self.outcome_codes.get(outcome)
+
+    def rate(self, bet, outcome):
+        """
+        Payout for a Bet (or label) under an outcome code or label.
+        """
+        if not isinstance(outcome, int):
+            outcome = self.outcome_codes.get(outcome)
+            if outcome is None:
+                return 0.0
+        code = (bet if isinstance(bet, Bet) else parse_bet(bet)).code
+        return self.rates[code][outcome] if code < len(self.rates) else 0.0
+
+    def matrix(self, bets, outcomes):
+        """
+        Payouts of `bets` (rows) under outcome labels (columns).
+        """
+        codes = np.array([(b if isinstance(b, Bet) else parse_bet(b)).code for b in bets], dtype=np.intp)
+        out = np.zeros((len(codes), len(outcomes)))
+        known = codes < len(self.values)
+        for j, outcome in enumerate(outcomes):
+            col = self.outcome_codes.get(outcome)
+            if col is not None:
+                out[known, j] = self.values[codes[known], col]
+        return out
+
+
+PAYOUT_MATRIX = PayoutMatrix(PAYOUT_TABLE)
+
+
+def compile_payouts(table):
+    """
+    PayoutMatrix for a payout dict; the standard table's is shared.
+    """
+    return PAYOUT_MATRIX if table is PAYOUT_TABLE else PayoutMatrix(table)
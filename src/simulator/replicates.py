@@ -0,0 +1,129 @@
+# src/simulator/replicates.py
+
+"""
+Monte Carlo replicates of one agent configuration.
+
+Each replicate is a full simulate_agent run with its own spawned stream.
+Per-game bankroll statistics are accumulated with Welford updates as
+replicates finish, so memory stays O(num_games) however many replicates
+are run.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+import numpy as np
+import pandas as pd
+from simulator.simulator import simulate_agent
+from simulator.parallel import spawn_streams, seeded_rng
+
+# Replicates per pool task. Partial statistics are merged in task order, so
+# results do not depend on how many workers ran them.
+CHUNK_SIZE = 16
+
+
+class StreamingStats:
+    """
+    Running count, mean, variance, min and max of bankroll per game index.
+    Histories may be shorter than `num_games` (a replicate that busts
+    stops early); each game only counts the replicates that reached it.
+    """
+
+    def __init__(self, num_games):
+        self.count = np.zeros(num_games, dtype=np.int64)
+        self.mean = np.zeros(num_games)
+        self.m2 = np.zeros(num_games)
+        self.min = np.full(num_games, np.inf)
+        self.max = np.full(num_games, -np.inf)
+
+    def update(self, history):
+        x = np.asarray(history, dtype=float)
+        n = len(x)
+        self.count[:n] += 1
+        delta = x - self.mean[:n]
+        self.mean[:n] += delta / self.count[:n]
+        self.m2[:n] += delta * (x - self.mean[:n])
+        np.minimum(self.min[:n], x, out=self.min[:n])
+        np.maximum(self.max[:n], x, out=self.max[:n])
+
+    def merge(self, other):
+        """
+        Fold in statistics gathered separately (Chan et al. pairwise update).
+        """
+        n_a, n_b = self.count, other.count
+        n = n_a + n_b
+        safe_n = np.maximum(n, 1)
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * n_b / safe_n
+        self.m2 = self.m2 + other.m2 + delta**2 * n_a * n_b / safe_n
+        self.count = n
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+
+    def summary(self, confidence=0.95):
+        """
+        Per-game summary with a normal-approximation confidence interval for
+        the mean, for every game at least one replicate reached. The
+        interval's confidence level is kept in its own column.
+        """
+        played = self.count > 0
+        count = self.count[played]
+        mean = self.mean[played]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.where(count > 1, np.sqrt(self.m2[played] / (count - 1)), np.nan)
+            half = NormalDist().inv_cdf(0.5 + confidence / 2) * std / np.sqrt(count)
+        return pd.DataFrame({
+            'game': np.flatnonzero(played),
+            'replicates': count,
+            'mean': mean,
+            'std': std,
+            'min': self.min[played],
+            'max': self.max[played],
+            'ci_low': mean - half,
+            'ci_high': mean + half,
+            'confidence': confidence,
+        })
+
+
+def _run_chunk(agent_class, params, seeds, num_games):
+    stats = StreamingStats(num_games)
+    for seed_seq in seeds:
+        rng = seeded_rng(seed_seq)
+        agent = agent_class(**params)
+        history = simulate_agent(agent, rng, num_games=num_games, diagnostics_formats=())
+        stats.update(history)
+        history.release()
+    return stats
+
+
+def run_replicates(agent_class, params, num_replicates, num_games, seed, max_workers=None):
+    """
+    Run `num_replicates` independent simulations of agent_class(**params) and
+    return their StreamingStats. Per-game diagnostics files are not written.
+    """
+    seeds = spawn_streams(seed, num_replicates)
+    chunks = [seeds[i:i + CHUNK_SIZE] for i in range(0, num_replicates, CHUNK_SIZE)]
+
+    if max_workers is None:
+        max_workers = min(len(chunks), os.cpu_count() or 1)
+
+    stats = StreamingStats(num_games)
+    if max_workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            stats.merge(_run_chunk(agent_class, params, chunk, num_games))
+        return stats
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_run_chunk, agent_class, params, chunk, num_games) for chunk in chunks]
+        for future in futures:
+            stats.merge(future.result())
+    return stats
+
+
+def write_summary(stats, path, confidence=0.95):
+    """
+    Save the per-game summary as CSV (data/<agent>_replicates.csv is what
+    bankroll_plot.py looks for).
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    stats.summary(confidence).to_csv(path, index=False)
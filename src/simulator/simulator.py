@@ -1,65 +1,110 @@
 # src/simulator/simulator.py
 
-from simulator.game_engine import play_game
-from utils.diagnostics import initialize_diagnostics_file, append_diagnostics_row
+from simulator.game_engine import play_game, PhaseTimings, PHASES
+from simulator.dice import DiceRoller
+from simulator.history import BankrollHistory, SPILL_AFTER
+from simulator.checkpoint import save_checkpoint, load_checkpoint, restore_checkpoint
+from utils.diagnostics import DiagnosticsSink, DIAGNOSTICS_COLUMNS
 import time
 import os
 
-def simulate_agent(agent, rng, num_games=100):
-    history = []
+# Extra diagnostics columns when phase timing is on
+PHASE_COLUMNS = tuple(
+    column for name in PHASES for column in ((f"{name}_sec", "float64"), (f"{name}_calls", "int64"))
+)
 
-    # Step 3: Initialize diagnostics file
-    diagnostics_path = os.path.join("data", f"{agent.name}_diagnostics.csv")
-    diagnostics_headers = [
-        "agent", "game_number", "bankroll",
-        "atomic_action_count", "composite_action_count",
-        "bets_placed", "total_wager",
-        "compute_cost_estimate", "decision_time_sec"
-    ]
-    initialize_diagnostics_file(diagnostics_path, diagnostics_headers)
+def compute_cost_estimate(agent, composite_count):
+    # Rough cost of one decision: d = composites scored, capped at max_dim;
+    # QBist scoring grows as d^5 and quantum scoring as d^3
+    d = min(composite_count, getattr(agent, "max_dim", 10))
+    if agent.name == "qbist":
+        return d**5
+    if agent.name == "quantum":
+        return d**3
+    return d
 
-    for game_number in range(num_games):
-        # Time the decision phase
-        start_time = time.perf_counter()
-        action = agent.choose_action()
-        decision_time = time.perf_counter() - start_time
+def simulate_agent(agent, rng, num_games=100, diagnostics_formats=("csv",), phase_timing=False,
+                   spill_after=SPILL_AFTER, spill_dir=None, checkpoint_path=None, checkpoint_every=None,
+                   resume=False, diagnostics_name=None):
+    # Final bankroll per game; spills to a memmap in spill_dir past spill_after games
+    history = BankrollHistory(min(num_games, spill_after), spill_after=spill_after, spill_dir=spill_dir)
+    timings = PhaseTimings() if phase_timing else None
+    columns = DIAGNOSTICS_COLUMNS + PHASE_COLUMNS if phase_timing else DIAGNOSTICS_COLUMNS
+    rolls = rng if hasattr(rng, 'roll') else DiceRoller(rng)
+    if checkpoint_path is not None and not hasattr(rolls, 'getstate'):
+        raise TypeError("Checkpointing needs a roll source with getstate()/setstate()")
 
-        # Play the game and get final bankroll
-        final_bankroll = play_game(agent, rng)
-        history.append(final_bankroll)
+    # With resume, pick up from the last checkpoint (every `checkpoint_every`
+    # games and at the end) as if the run had never stopped
+    first_game = 0
+    resume_from = None
+    if resume and checkpoint_path is not None and os.path.exists(checkpoint_path):
+        saved = load_checkpoint(checkpoint_path)
+        restore_checkpoint(saved, agent, rolls)
+        history.extend(saved['history'])
+        if saved['stopped']:
+            return history
+        first_game = saved['games_played']
+        resume_from = saved['diagnostics']
 
-        # Step 4: Collect diagnostics
-        atomic_count = (
-            len(agent.action_gen.latest_atomic_actions)
-            if hasattr(agent.action_gen, "latest_atomic_actions")
-            else None
-        )
-        composite_count = len(agent.legal_actions)
-        bets_placed = len(agent.bets)
-        total_wager = sum(bet['amount'] for bet in agent.bets)
+    # Step 3: Open the diagnostics sink (data/<name>_diagnostics.csv / .colbin, by default
+    # named after the agent; runs that share an agent name need their own)
+    diagnostics_path = os.path.join("data", f"{diagnostics_name or agent.name}_diagnostics")
+    with DiagnosticsSink(diagnostics_path, columns=columns, formats=diagnostics_formats,
+                         resume_from=resume_from) as diagnostics:
+        stopped = False
+        for game_number in range(first_game, num_games):
+            # Time the decision phase
+            start_time = time.perf_counter()
+            action = agent.choose_action()
+            decision_time = time.perf_counter() - start_time
 
-        d = min(composite_count, getattr(agent, "max_dim", 10))
-        if agent.name == "qbist":
-            compute_cost = d**5
-        elif agent.name == "quantum":
-            compute_cost = d**3
-        else:
-            compute_cost = d
+            # Play the game and get final bankroll
+            if timings is not None:
+                timings.reset()
+            final_bankroll = play_game(agent, rolls, timings)
+            history.append(final_bankroll)
 
-        append_diagnostics_row(diagnostics_path, [
-            agent.name,
-            game_number,
-            final_bankroll,
-            atomic_count,
-            composite_count,
-            bets_placed,
-            total_wager,
-            compute_cost,
-            round(decision_time, 6)
-        ])
+            # Step 4: Collect diagnostics
+            action_gen = getattr(agent, "action_gen", None)
+            atomic_count = (
+                len(action_gen.latest_atomic_actions)
+                if hasattr(action_gen, "latest_atomic_actions")
+                else None
+            )
+            composite_count = len(agent.legal_actions)
+            bets_placed = len(agent.bets)
+            total_wager = sum(bet['amount'] for bet in agent.bets)
 
-        # stop early if bust or walkaway
-        if not agent.can_continue():
-            break
+            compute_cost = compute_cost_estimate(agent, composite_count)
+
+            row = [
+                agent.name,
+                game_number,
+                final_bankroll,
+                atomic_count,
+                composite_count,
+                bets_placed,
+                total_wager,
+                compute_cost,
+                round(decision_time, 6)
+            ]
+            if timings is not None:
+                # Time spent in each phase of this game, and how often it ran
+                for seconds, calls in zip(timings.seconds, timings.calls):
+                    row += [seconds, calls]
+            diagnostics.append(row)
+
+            # stop early if bust or walkaway
+            if not agent.can_continue():
+                stopped = True
+                break
+
+            if checkpoint_path is not None and checkpoint_every and (game_number + 1) % checkpoint_every == 0:
+                save_checkpoint(checkpoint_path, agent, rolls, game_number + 1, history, diagnostics.checkpoint())
+
+        if checkpoint_path is not None:
+            save_checkpoint(checkpoint_path, agent, rolls, len(history), history, diagnostics.checkpoint(),
+                            stopped=stopped)
 
     return history
@@ -0,0 +1,220 @@
+# src/simulator/sweep.py
+
+"""
+Parameter sweeps over agent configurations, with results cached on disk.
+
+A sweep spec names agents (as in config.json) and a grid of parameter
+values. expand_grid() crosses every agent with the grid values its
+constructor accepts, giving one SweepCell per configuration. run_sweep()
+then runs the cells on a process pool, most expensive first (see
+expected_cost), and stores each cell's bankroll history under the cell's
+content hash. The hash covers the agent, its parameters, the seed, the
+number of games and the simulator's source code, so re-running or
+extending a sweep only computes cells that have no results yet.
+
+    {
+      "num_games": 500,
+      "seed": 42,
+      "params": {"starting_bankroll": 1000},
+      "agents": {"classical": {"module": "agents.classical_agent", "name": "ClassicalAgent"}},
+      "grid": {"table_minimum": [5, 10, 25], "max_combo_size": [3, 6]}
+    }
+"""
+
+import hashlib
+import importlib
+import inspect
+import itertools
+import json
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from simulator.action_space import ActionSpace
+from simulator.parallel import seeded_rng
+from simulator.simulator import simulate_agent, compute_cost_estimate
+
+SWEEP_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'sweeps')
+
+# Source trees whose code determines a cell's results
+CODE_PACKAGES = ('agents', 'simulator', 'utils')
+
+# Atomic actions at a typical point decision (pass line odds, a come bet and
+# odds on one come point), used to size composite spaces for cost estimates
+TYPICAL_ATOMIC_ACTIONS = 7
+# Cost of playing out one game, in compute_cost_estimate's units
+GAME_COST = 10
+
+SweepCell = namedtuple('SweepCell', ['agent', 'module', 'name', 'params', 'num_games', 'seed'])
+
+
+@lru_cache(maxsize=1)
+def code_version():
+    """
+    Digest of every .py file in the simulator's source packages.
+    """
+    src = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    digest = hashlib.sha1()
+    for package in CODE_PACKAGES:
+        for root, dirs, files in os.walk(os.path.join(src, package)):
+            dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+            for name in sorted(files):
+                if name.endswith('.py'):
+                    path = os.path.join(root, name)
+                    digest.update(os.path.relpath(path, src).replace(os.sep, '/').encode())
+                    with open(path, 'rb') as f:
+                        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _agent_class(cell):
+    return getattr(importlib.import_module(cell.module), cell.name)
+
+
+def accepted_params(agent_class):
+    """
+    Names of the keyword arguments agent_class and its bases take.
+    """
+    names = set()
+    for cls in agent_class.__mro__:
+        init = cls.__dict__.get('__init__')
+        if init is None:
+            continue
+        for param in inspect.signature(init).parameters.values():
+            if param.kind in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY) and param.name != 'self':
+                names.add(param.name)
+    return names
+
+
+def expand_grid(spec):
+    """
+    One SweepCell per agent and combination of the grid values its
+    constructor accepts. Grid values override the spec's shared "params",
+    which override the agent's own "params".
+    """
+    grid = spec.get('grid', {})
+    cells = []
+    for agent_key, agent_info in spec['agents'].items():
+        cell = SweepCell(agent_key, agent_info['module'], agent_info['name'], None,
+                         spec['num_games'], spec['seed'])
+        accepted = accepted_params(_agent_class(cell))
+        axes = [name for name in grid if name in accepted]
+        base = dict(agent_info.get('params', {}), **spec.get('params', {}))
+        for values in itertools.product(*(grid[name] for name in axes)):
+            params = dict(base, **dict(zip(axes, values)))
+            cells.append(cell._replace(params=params))
+    return cells
+
+
+def _config(cell):
+    # Everything but the code that determines a cell's results
+    return json.dumps({
+        'module': cell.module, 'name': cell.name, 'params': cell.params,
+        'num_games': cell.num_games, 'seed': cell.seed,
+    }, sort_keys=True)
+
+
+def cell_hash(cell):
+    """
+    Content hash naming the cell's results on disk.
+    """
+    return hashlib.sha1(f'{_config(cell)}|{code_version()}'.encode()).hexdigest()
+
+
+def cell_seed(cell):
+    """
+    SeedSequence for a cell, from the sweep seed and the cell's
+    configuration, so adding cells never changes the others' streams.
+    """
+    key = hashlib.sha1(_config(cell).encode()).digest()
+    return np.random.SeedSequence(cell.seed, spawn_key=tuple(int.from_bytes(key[i:i + 4], 'little')
+                                                             for i in range(0, 16, 4)))
+
+
+def expected_cost(cell):
+    """
+    Relative cost of running a cell: games times the cost of a game plus
+    one decision at a typical table state (see compute_cost_estimate).
+    """
+    agent = _agent_class(cell)(**cell.params)
+    cache = getattr(agent, 'action_cache', None)
+    max_combo_size = cache.max_combo_size if cache is not None else 1
+    composites = len(ActionSpace(range(TYPICAL_ATOMIC_ACTIONS), max_combo_size))
+    return cell.num_games * (GAME_COST + compute_cost_estimate(agent, composites))
+
+
+def _run_cell(cell):
+    rng = seeded_rng(cell_seed(cell))
+    agent = _agent_class(cell)(**cell.params)
+    start = time.perf_counter()
+    history = simulate_agent(agent, rng, num_games=cell.num_games, diagnostics_formats=())
+    elapsed = time.perf_counter() - start
+    values = np.array(history.values)
+    history.release()
+    return values, elapsed
+
+
+def _paths(results_dir, digest):
+    return os.path.join(results_dir, f'{digest}.npy'), os.path.join(results_dir, f'{digest}.json')
+
+
+def _save_result(results_dir, digest, cell, values, elapsed):
+    history_path, meta_path = _paths(results_dir, digest)
+    tmp = f'{history_path}.{os.getpid()}.tmp.npy'
+    np.save(tmp, values)
+    os.replace(tmp, history_path)
+
+    # The metadata file goes last: its presence marks a finished cell
+    meta = dict(cell._asdict(), hash=digest, code_version=code_version(), elapsed=elapsed)
+    tmp = f'{meta_path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(meta, f, indent=2, sort_keys=True)
+    os.replace(tmp, meta_path)
+
+
+def load_history(results_dir, digest):
+    return np.load(_paths(results_dir, digest)[0])
+
+
+def run_sweep(spec, results_dir=SWEEP_DIR, max_workers=None):
+    """
+    Run every cell of `spec` that has no results in `results_dir` and
+    return a DataFrame with one row per cell (cached or not): its agent and
+    parameters, hash, whether it was cached, and the games played with the
+    mean and final bankroll.
+
+    Cells are submitted most expensive first so the longest ones do not
+    start last; max_workers=1 runs them in this process.
+    """
+    os.makedirs(results_dir, exist_ok=True)
+    cells = expand_grid(spec)
+    digests = [cell_hash(cell) for cell in cells]
+    cached = [os.path.exists(_paths(results_dir, digest)[1]) for digest in digests]
+
+    todo = [i for i, done in enumerate(cached) if not done]
+    todo.sort(key=lambda i: expected_cost(cells[i]), reverse=True)
+
+    if max_workers is None:
+        max_workers = min(len(todo), os.cpu_count() or 1)
+    if max_workers <= 1 or len(todo) <= 1:
+        for i in todo:
+            _save_result(results_dir, digests[i], cells[i], *_run_cell(cells[i]))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(_run_cell, cells[i]): i for i in todo}
+            for future in as_completed(futures):
+                i = futures[future]
+                _save_result(results_dir, digests[i], cells[i], *future.result())
+
+    rows = []
+    for cell, digest, was_cached in zip(cells, digests, cached):
+        history = load_history(results_dir, digest)
+        rows.append(dict(
+            agent=cell.agent, **cell.params, hash=digest, cached=was_cached, games=len(history),
+            mean_bankroll=history.mean() if len(history) else np.nan,
+            final_bankroll=history[-1] if len(history) else np.nan,
+        ))
+    return pd.DataFrame(rows)
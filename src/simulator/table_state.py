@@ -0,0 +1,83 @@
+# src/simulator/table_state.py
+
+from bisect import insort
+from simulator.bets import bet_of, COME_FLAT, PASS_LINE_ODDS, COME_ODDS
+
+
+class TableState:
+    """
+    Betting state an agent needs to build its action space, kept up to date
+    as bets are placed and resolved instead of being re-derived from
+    agent.bets on every roll.
+
+    `dirty` is set whenever something that shapes the action space changes
+    (a bet placed, a come bet moving or resolving, a new point) and cleared
+    by the engine when the agent makes a decision.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.pass_line_odds_levels = []
+        self.come_odds_levels = {}      # come point -> sorted odds amounts placed
+        self.pending_come = 0           # come bets waiting for their number
+        self.come_bets = 0              # come flat bets on the table, pending or not
+        self.dirty = True
+
+    def record_bet(self, bet, amount):
+        # Update levels for a newly placed Bet
+        if bet.kind == PASS_LINE_ODDS:
+            insort(self.pass_line_odds_levels, amount)
+        elif bet.kind == COME_ODDS:
+            insort(self.come_odds_levels.setdefault(bet.point, []), amount)
+        elif bet.kind == COME_FLAT:
+            self.pending_come += 1
+            self.come_bets += 1
+        self.dirty = True
+
+    def come_bet_moved(self):
+        # A pending come bet travelled to its number
+        self.pending_come -= 1
+        self.dirty = True
+
+    def come_bet_resolved(self):
+        # A pending come bet won on 11 or lost on craps and left the table
+        self.pending_come -= 1
+        self.come_bets -= 1
+        self.dirty = True
+
+    def point_set(self):
+        self.dirty = True
+
+    @classmethod
+    def from_bets(cls, placed_bets):
+        """
+        TableState for a list of placed-bet dicts; a come flat without a
+        'point' is still pending.
+        """
+        table = cls()
+        for placed in placed_bets:
+            bet = bet_of(placed)
+            table.record_bet(bet, placed['amount'])
+            if bet.kind == COME_FLAT and 'point' in placed:
+                table.come_bet_moved()
+        return table
+
+    def game_state(self, current_point, active_come_points, table_min, pending_only=True):
+        """
+        Game-state dict in the shape AtomicActionGenerator expects.
+        'come_flat_active' (which stops another come bet) means a come bet
+        is pending, or with pending_only=False that any come bet is on the
+        table. The levels are copies, so the dict keeps describing the table
+        as it was when taken.
+        """
+        return {
+            'pass_line_odds_levels': list(self.pass_line_odds_levels),
+            'come_flat_active': (self.pending_come if pending_only else self.come_bets) > 0,
+            'active_come_points': sorted(active_come_points),
+            'come_odds_levels': {str(pt): list(self.come_odds_levels.get(pt, ()))
+                                 for pt in sorted(active_come_points)},
+            'current_point': current_point,
+            'table_min': table_min,
+        }
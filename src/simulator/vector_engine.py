@@ -0,0 +1,162 @@
+# src/simulator/vector_engine.py
+
+"""
+Lockstep NumPy engine for fixed betting policies.
+
+Plays many independent games at once: the table state of every game lives in
+arrays and each step advances all unfinished games by one roll. The rules
+mirror game_engine.play_game, odds payouts come from payouts.PAYOUT_TABLE and
+the policy is the one played by agents.fixed_policy_agent.FixedPolicyAgent.
+"""
+
+import numpy as np
+from simulator.atomic_actions import legal_odds_bet_amounts, MAX_MULTIPLIER
+from simulator.payouts import PAYOUT_TABLE
+from simulator.bets import get_bet, PASS_LINE_ODDS, COME_ODDS
+
+POINT_NUMBERS = (4, 5, 6, 8, 9, 10)
+
+# Arrays indexed by dice sum use 13 slots so a roll can index them directly
+NUM_SUMS = 13
+
+
+def odds_tables(odds_multiple):
+    """
+    Odds wager and winning payout per point number for a constant odds
+    multiple, as arrays indexed by dice sum (zero off the points).
+    """
+    wager = np.zeros(NUM_SUMS)
+    pass_win = np.zeros(NUM_SUMS)
+    come_win = np.zeros(NUM_SUMS)
+    if odds_multiple:
+        for pt in POINT_NUMBERS:
+            amt = legal_odds_bet_amounts(pt, odds_multiple)[-1]
+            wager[pt] = amt
+            outcome = f'win_{pt}'
+            pass_win[pt] = PAYOUT_TABLE.get((get_bet(PASS_LINE_ODDS, amt).key, outcome), 0.0)
+            come_win[pt] = PAYOUT_TABLE.get((get_bet(COME_ODDS, amt, pt).key, outcome), 0.0)
+    return wager, pass_win, come_win
+
+
+def play_games_vectorized(
+    num_games,
+    rng=None,
+    odds_multiple=1,
+    max_come_bets=0,
+    starting_bankroll=1000,
+    table_minimum=10,
+    walkaway_threshold=None,
+    rolls=None
+):
+    """
+    Play `num_games` independent games of the fixed policy and return the
+    final bankroll of each game as a float array.
+
+    Dice come from `rng` (a NumPy Generator) unless `rolls` is given: a
+    (steps, num_games) array of pre-drawn dice sums where column i is the
+    sequence of rolls consumed by game i. Every unfinished game consumes
+    exactly one roll per step, so column i can be replayed through play_game
+    to reproduce game i.
+    """
+    if not 0 <= odds_multiple <= MAX_MULTIPLIER:
+        raise ValueError(f"odds_multiple must be between 0 and {MAX_MULTIPLIER}")
+    if rng is None and rolls is None:
+        raise ValueError("Either rng or rolls must be given")
+
+    tm = float(table_minimum)
+    odds_wager, pass_win, come_win = odds_tables(odds_multiple)
+
+    final = np.empty(num_games)
+    ids = np.arange(num_games)
+
+    bankroll = np.full(num_games, float(starting_bankroll))
+    bankroll -= tm * (bankroll >= tm)  # pass line flat bet
+
+    point = np.zeros(num_games, dtype=np.int64)          # 0 while coming out
+    pass_odds = np.zeros(num_games, dtype=bool)
+    pending = np.zeros(num_games, dtype=bool)             # come bet awaiting a number
+    come_total = np.zeros(num_games, dtype=np.int64)      # pending + established come bets
+    come_flats = np.zeros((num_games, NUM_SUMS), dtype=np.int64)
+    come_odds = np.zeros((num_games, NUM_SUMS), dtype=bool)
+    use_come = max_come_bets > 0
+
+    step = 0
+    while ids.size:
+        # --- Point round: walk away or bust before deciding ---
+        in_point = point > 0
+        can_continue = bankroll >= tm
+        if walkaway_threshold is not None:
+            can_continue &= bankroll < walkaway_threshold
+        done = in_point & ~can_continue
+
+        # --- Policy decision (all-or-nothing, like place_bets) ---
+        place_pass = in_point & ~pass_odds & (odds_multiple > 0)
+        wager = place_pass * odds_wager[point]
+        if use_come:
+            place_come_odds = (come_flats > 0) & ~come_odds & (odds_multiple > 0)
+            place_come = in_point & ~pending & (come_total < max_come_bets)
+            wager += place_come_odds @ odds_wager + place_come * tm
+        place = in_point & ~done & (wager > 0) & (bankroll >= wager)
+
+        bankroll -= wager * place
+        pass_odds |= place_pass & place
+        if use_come:
+            come_odds |= place_come_odds & place[:, None]
+            pending |= place_come & place
+            come_total += place_come & place
+
+        # --- Roll ---
+        active = ~done
+        if rolls is not None:
+            if step >= len(rolls):
+                raise ValueError("Ran out of pre-drawn rolls")
+            roll = np.asarray(rolls[step])[ids]
+        else:
+            roll = rng.integers(1, 7, size=(ids.size, 2)).sum(axis=1)
+        step += 1
+
+        # --- Come-out round ---
+        coming_out = active & ~in_point
+        bankroll += tm * (coming_out & ((roll == 7) | (roll == 11)))
+        done |= coming_out & ((roll == 2) | (roll == 3) | (roll == 12))
+        establish = coming_out & (roll != 7) & (roll != 11) & (roll != 2) & (roll != 3) & (roll != 12)
+        point[establish] = roll[establish]
+
+        # --- Point round ---
+        rolling = active & in_point
+        seven_out = rolling & (roll == 7)
+        done |= seven_out
+        rolling &= ~seven_out
+
+        hit = rolling & (roll == point)
+        bankroll += hit * (tm + pass_odds * pass_win[point])
+
+        if use_come:
+            rows = np.arange(ids.size)
+            bankroll += rolling * (
+                come_flats[rows, roll] * tm + come_odds[rows, roll] * come_win[roll]
+            )
+
+            moving = rolling & pending
+            natural = moving & (roll == 11)
+            bankroll += natural * tm
+            craps = moving & ((roll == 2) | (roll == 3) | (roll == 12))
+            come_total -= natural | craps
+            to_point = moving & ~natural & ~craps
+            come_flats[rows[to_point], roll[to_point]] += 1
+            pending &= ~moving
+
+        # --- Retire finished games and compact the live arrays ---
+        if done.any():
+            final[ids[done]] = bankroll[done]
+            keep = ~done
+            ids = ids[keep]
+            bankroll = bankroll[keep]
+            point = point[keep]
+            pass_odds = pass_odds[keep]
+            pending = pending[keep]
+            come_total = come_total[keep]
+            come_flats = come_flats[keep]
+            come_odds = come_odds[keep]
+
+    return final
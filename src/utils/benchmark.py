@@ -0,0 +1,186 @@
+# src/utils/benchmark.py
+
+"""
+Timing suite for the simulation hot paths.
+
+Every benchmark reports the best-of-`repeat` time per call in seconds, so
+results can be saved as a JSON baseline and compared on a later run. A
+benchmark is flagged as a regression when it is more than `tolerance`
+slower than the baseline.
+"""
+
+import json
+import os
+import platform
+import tempfile
+import time
+from datetime import datetime, timezone
+import numpy as np
+
+from simulator import game_engine
+from simulator.atomic_actions import AtomicActionGenerator
+from simulator.dice import DiceRoller
+from simulator.events import EventLogWriter
+from simulator.simulator import simulate_agent
+from simulator.payouts import PAYOUT_TABLE
+from agents.random_agent import RandomAgent
+from agents.classical_agent import ClassicalAgent
+from agents.quantum_agent import QuantumAgent
+from agents.qbist_agent import QBistAgent
+
+DEFAULT_COMBO_SIZES = (2, 3, 4, 6)
+DEFAULT_DIMS = (2, 4, 6, 8)
+DEFAULT_TOLERANCE = 0.25
+
+# Table states the decision benchmarks are run from: a typical mid-game
+# table, and a crowded one with enough atomic actions for large max_dim
+TABLES = {
+    'mid': (6, {5, 9}),
+    'crowded': (6, {4, 5, 8, 9, 10}),
+}
+
+
+# Agents as the simulation scripts build them, for whole-game throughput
+MACRO_AGENTS = {
+    'random': RandomAgent,
+    'classical': lambda: ClassicalAgent(payout_table=PAYOUT_TABLE),
+    'quantum': QuantumAgent,
+    'qbist': QBistAgent,
+}
+
+
+def time_call(fn, repeat=5, min_time=0.05):
+    """
+    Best time per call of fn() over `repeat` runs, each looping fn long
+    enough to take at least `min_time` seconds.
+    """
+    fn()  # warm caches (SIC files, action spaces) outside the timing
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+
+def _seat(agent, table='mid'):
+    # Put an agent at a table with a point and come points established
+    point, come_points = TABLES[table]
+    agent.start_new_game()
+    agent.current_point = point
+    agent.point_established = True
+    agent.active_come_points = set(come_points)
+    agent.update_action_space()
+    return agent
+
+
+def _agent_cases(combo_sizes, dims):
+    # (benchmark label, agent factory, table) for every swept configuration
+    cases = []
+    for k in combo_sizes:
+        cases.append((f'random[k={k}]', lambda k=k: RandomAgent(max_combo_size=k), 'mid'))
+        cases.append((f'classical[k={k}]', lambda k=k: ClassicalAgent(
+            payout_table=PAYOUT_TABLE, max_combo_size=k), 'mid'))
+        cases.append((f'classical_bnb[k={k}]', lambda k=k: ClassicalAgent(
+            payout_table=PAYOUT_TABLE, max_combo_size=k, search='branch_and_bound'), 'mid'))
+    for d in dims:
+        cases.append((f'quantum[d={d}]', lambda d=d: QuantumAgent(max_dim=d), 'crowded'))
+        cases.append((f'qbist[d={d}]', lambda d=d: QBistAgent(max_dim=d), 'crowded'))
+    return cases
+
+
+def run_suite(combo_sizes=DEFAULT_COMBO_SIZES, dims=DEFAULT_DIMS, games=200, repeat=5, min_time=0.05,
+              seed=0):
+    """
+    Run every benchmark and return {name: seconds per call}.
+    """
+    results = {}
+
+    def bench(name, fn):
+        results[name] = time_call(fn, repeat=repeat, min_time=min_time)
+
+    # --- Micro: dice, game state, atomic actions ---
+    rng = np.random.default_rng(seed)
+    bench('roll_dice', lambda: game_engine.roll_dice(rng))
+    roller = DiceRoller(np.random.default_rng(seed))
+    bench('dice_roller.roll', roller.roll)
+
+    state_agent = _seat(ClassicalAgent(payout_table=PAYOUT_TABLE))
+    for action in state_agent.choose_action() or ():
+        state_agent.add_bet(action, state_agent._get_bet_amount(action))
+    bench('game_state', state_agent.game_state)
+    bench('build_game_state', lambda: game_engine.build_game_state(state_agent))
+
+    generator = AtomicActionGenerator()
+    game_state = state_agent.game_state()
+    bench('generate_atomic_actions', lambda: generator.generate_atomic_actions(game_state))
+
+    # --- Event log writer (per event, flushes included) ---
+    with tempfile.TemporaryDirectory() as directory:
+        with EventLogWriter(os.path.join(directory, 'bench.log')) as log:
+            bench('event_log.report', lambda: log.report(game_engine.BET_WON, 6, game_engine.PASS_LINE, 5.0))
+
+    # --- Per-agent decisions, swept over max_combo_size / max_dim ---
+    for label, factory, table in _agent_cases(combo_sizes, dims):
+        agent = _seat(factory(), table)
+        bench(f'{label}.update_action_space', agent.update_action_space)
+        bench(f'{label}.choose_action', agent.choose_action)
+
+    # --- Macro: whole games and simulate_agent throughput (per game) ---
+    for label, factory in MACRO_AGENTS.items():
+        agent = factory()
+        roller = DiceRoller(np.random.default_rng(seed))
+        bench(f'{label}.play_game', lambda: game_engine.play_game(agent, roller))
+
+        def simulate(agent=agent):
+            simulate_agent(agent, np.random.default_rng(seed), num_games=games, diagnostics_formats=())
+
+        results[f'{label}.simulate_agent'] = time_call(simulate, repeat=repeat, min_time=min_time) / games
+
+    return results
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+
+
+def save_results(path, results):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Rows of (name, baseline seconds, current seconds, ratio, regressed) for
+    every benchmark present in both runs.
+    """
+    rows = []
+    for name in sorted(set(results) & set(baseline)):
+        ratio = results[name] / baseline[name] if baseline[name] else float('inf')
+        rows.append((name, baseline[name], results[name], ratio, ratio > 1 + tolerance))
+    return rows
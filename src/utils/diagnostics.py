@@ -1,5 +1,9 @@
 import os
 import csv
+import json
+import struct
+import time
+import numpy as np
 
 def initialize_diagnostics_file(output_path, headers):
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
@@ -11,3 +15,231 @@ def append_diagnostics_row(output_path, row_data):
     with open(output_path, 'a', newline='') as f:
         writer = csv.writer(f)
         writer.writerow(row_data)
+
+
+# --- Buffered sink ---
+
+DIAGNOSTICS_COLUMNS = (
+    ("agent", "str"),
+    ("game_number", "int64"),
+    ("bankroll", "float64"),
+    ("atomic_action_count", "int64"),
+    ("composite_action_count", "int64"),
+    ("bets_placed", "int64"),
+    ("total_wager", "float64"),
+    ("compute_cost_estimate", "int64"),
+    ("decision_time_sec", "float64"),
+)
+
+DIAGNOSTICS_FORMATS = ("csv", "colbin")
+
+# Binary columnar layout (.colbin):
+#   magic, uint32 header length, JSON header {"columns": [[name, dtype], ...]}
+#   then one block per flush: uint32 row count and, for every column, the
+#   packed validity bits followed by the values (strings as uint16 width +
+#   fixed-width UTF-8)
+COLBIN_MAGIC = b"QCDIAG1\n"
+
+
+class DiagnosticsSink:
+    """
+    Collects one diagnostics row per game in typed column buffers and writes
+    them out in batches, once `flush_rows` rows are buffered or
+    `flush_interval` seconds have passed since the last write.
+
+    Files are written to `base_path` + '.csv' and/or '.colbin' depending on
+    `formats`. None marks a missing value (an empty CSV field). Use as a
+    context manager, or call close(), so the last batch is written however
+    the run ends.
+
+    `resume_from` takes a state from checkpoint(): the files are cut back to
+    where they were then and appended to, instead of being started afresh.
+    """
+
+    def __init__(self, base_path, columns=DIAGNOSTICS_COLUMNS, formats=("csv",),
+                 flush_rows=4096, flush_interval=5.0, resume_from=None):
+        unknown = set(formats) - set(DIAGNOSTICS_FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown diagnostics formats: {sorted(unknown)}")
+
+        self.columns = tuple(columns)
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.rows_written = 0
+        self.closed = False
+        self.paths = {fmt: f"{base_path}.{fmt}" for fmt in formats}
+
+        self._values = [
+            np.empty(flush_rows, dtype=object if dtype == "str" else dtype)
+            for _, dtype in self.columns
+        ]
+        self._valid = np.ones((len(self.columns), flush_rows), dtype=bool)
+        self._size = 0
+        self._last_flush = time.monotonic()
+
+        directory = os.path.dirname(base_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if resume_from is not None:
+            self.rows_written = resume_from["rows_written"]
+
+        self._csv_file = None
+        self._csv_writer = None
+        if "csv" in self.paths:
+            if resume_from is None:
+                self._csv_file = open(self.paths["csv"], 'w', newline='')
+                self._csv_writer = csv.writer(self._csv_file)
+                self._csv_writer.writerow([name for name, _ in self.columns])
+            else:
+                self._csv_file = self._reopen("csv", resume_from, 'a')
+                self._csv_writer = csv.writer(self._csv_file)
+
+        self._bin_file = None
+        if "colbin" in self.paths:
+            if resume_from is None:
+                self._bin_file = open(self.paths["colbin"], 'wb')
+                header = json.dumps({"columns": [list(col) for col in self.columns]}).encode()
+                self._bin_file.write(COLBIN_MAGIC + struct.pack("<I", len(header)) + header)
+            else:
+                self._bin_file = self._reopen("colbin", resume_from, 'ab')
+
+    def _reopen(self, fmt, resume_from, mode):
+        # Truncate a file to its checkpointed size and open it for appending
+        path = self.paths[fmt]
+        size = resume_from["sizes"].get(fmt)
+        if size is None or not os.path.exists(path) or os.path.getsize(path) < size:
+            raise ValueError(f"Cannot resume {path}: it is missing or shorter than at the checkpoint")
+        os.truncate(path, size)
+        return open(path, mode, newline='') if 'b' not in mode else open(path, mode)
+
+    def checkpoint(self):
+        """
+        Write out every buffered row and return the state (rows written and
+        file sizes) that resume_from takes to carry on from this point.
+        """
+        self.flush()
+        sizes = {}
+        for fmt, f in (("csv", self._csv_file), ("colbin", self._bin_file)):
+            if f is not None:
+                sizes[fmt] = os.fstat(f.fileno()).st_size
+        return {"rows_written": self.rows_written, "sizes": sizes}
+
+    def append(self, row):
+        """
+        Buffer one row, given in column order.
+        """
+        i = self._size
+        for c, value in enumerate(row):
+            if value is None:
+                self._valid[c, i] = False
+                if self.columns[c][1] != "str":
+                    value = 0
+            self._values[c][i] = value
+        self._size += 1
+
+        if self._size >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        n = self._size
+        if n:
+            if self._csv_writer is not None:
+                self._write_csv(n)
+            if self._bin_file is not None:
+                self._write_colbin(n)
+            self.rows_written += n
+            self._size = 0
+            self._valid[:] = True
+
+        for f in (self._csv_file, self._bin_file):
+            if f is not None:
+                f.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        for f in (self._csv_file, self._bin_file):
+            if f is not None:
+                f.close()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _write_csv(self, n):
+        cols = []
+        for values, valid in zip(self._values, self._valid):
+            col = values[:n].tolist()
+            if not valid[:n].all():
+                col = [v if ok else None for v, ok in zip(col, valid[:n])]
+            cols.append(col)
+        self._csv_writer.writerows(zip(*cols))
+
+    def _write_colbin(self, n):
+        f = self._bin_file
+        f.write(struct.pack("<I", n))
+        for (_, dtype), values, valid in zip(self.columns, self._values, self._valid):
+            f.write(np.packbits(valid[:n]).tobytes())
+            if dtype == "str":
+                encoded = np.array(["" if v is None else str(v) for v in values[:n]], dtype=str)
+                encoded = np.char.encode(encoded, "utf-8")
+                f.write(struct.pack("<H", encoded.dtype.itemsize))
+                f.write(encoded.tobytes())
+            else:
+                f.write(values[:n].astype(np.dtype(dtype).newbyteorder("<"), copy=False).tobytes())
+
+
+def read_columnar(path):
+    """
+    Read a .colbin diagnostics file into {column: masked array}; missing
+    values are masked.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if not data.startswith(COLBIN_MAGIC):
+        raise ValueError(f"{path} is not a columnar diagnostics file")
+    pos = len(COLBIN_MAGIC)
+    (header_len,) = struct.unpack_from("<I", data, pos)
+    pos += 4
+    columns = json.loads(data[pos:pos + header_len])["columns"]
+    pos += header_len
+
+    chunks = {name: [] for name, _ in columns}
+    masks = {name: [] for name, _ in columns}
+    while pos < len(data):
+        (n,) = struct.unpack_from("<I", data, pos)
+        pos += 4
+        for name, dtype in columns:
+            nbytes = (n + 7) // 8
+            valid = np.unpackbits(np.frombuffer(data, np.uint8, nbytes, pos), count=n).astype(bool)
+            pos += nbytes
+            if dtype == "str":
+                (width,) = struct.unpack_from("<H", data, pos)
+                pos += 2
+                raw = np.frombuffer(data, f"S{width}", n, pos) if width else np.zeros(n, "S1")
+                pos += width * n
+                values = np.char.decode(raw, "utf-8")
+            else:
+                dt = np.dtype(dtype).newbyteorder("<")
+                values = np.frombuffer(data, dt, n, pos)
+                pos += dt.itemsize * n
+            chunks[name].append(values)
+            masks[name].append(~valid)
+
+    result = {}
+    for name, dtype in columns:
+        if chunks[name]:
+            values = np.concatenate(chunks[name])
+            mask = np.concatenate(masks[name])
+        else:
+            values = np.empty(0, dtype=str if dtype == "str" else dtype)
+            mask = np.zeros(0, dtype=bool)
+        result[name] = np.ma.masked_array(values, mask=mask)
+    return result
@@ -1,7 +1,67 @@
 # THANK YOU MATT WEISS!!
-from qbism import sic_povm
+import os
+import numpy as np
 
-def load_sic(d: int):
+# SIC elements are expensive to build at larger dimensions, so they are kept
+# in memory for the life of the process and on disk between runs
+SIC_CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'sic_cache')
+
+# Keyed by (d, cache directory), so each directory's files are read on their own
+_SIC_TENSORS = {}
+_SIC_FRAME_SUMS = {}
+
+
+def _cache_key(d, cache_dir):
+    return d, os.path.abspath(SIC_CACHE_DIR if cache_dir is None else cache_dir)
+
+
+def _compute_sic(d):
     from qbism import sic_povm
-    sic_qobjs = sic_povm(d)
-    return [H.full() for H in sic_qobjs]  # converts Qobj to np.ndarray
+    return np.stack([H.full() for H in sic_povm(d)])  # converts Qobj to np.ndarray
+
+
+def sic_tensor(d: int, cache_dir=None):
+    """
+    SIC-POVM elements for dimension d stacked into a read-only (d², d, d)
+    array. Looked up in memory, then in `cache_dir` (sic_<d>.npz), and only
+    computed with qbism if neither has it.
+    """
+    key = _cache_key(d, cache_dir)
+    tensor = _SIC_TENSORS.get(key)
+    if tensor is not None:
+        return tensor
+
+    cache_dir = key[1]
+    path = os.path.join(cache_dir, f'sic_{d}.npz')
+    if os.path.exists(path):
+        with np.load(path) as stored:
+            tensor = stored['elements']
+    else:
+        tensor = _compute_sic(d)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write under a temporary name so a concurrent reader never sees a partial file
+        tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+        np.savez(tmp_path, elements=tensor)
+        os.replace(tmp_path, path)
+
+    tensor.setflags(write=False)
+    _SIC_TENSORS[key] = tensor
+    return tensor
+
+
+def sic_frame_sum(d: int, cache_dir=None):
+    """
+    Sum of the SIC elements for dimension d, so that the urgleichung sum
+    Σ_i tr(E H_i) can be evaluated as a single tr(E Σ_i H_i).
+    """
+    key = _cache_key(d, cache_dir)
+    total = _SIC_FRAME_SUMS.get(key)
+    if total is None:
+        total = sic_tensor(d, cache_dir).sum(axis=0)
+        total.setflags(write=False)
+        _SIC_FRAME_SUMS[key] = total
+    return total
+
+
+def load_sic(d: int):
+    return list(sic_tensor(d))
@@ -0,0 +1,133 @@
+# tests/test_action_space.py
+
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from simulator.action_cache import ActionSpaceCache, get_action_cache, state_key, enumerate_composites
+from simulator.action_space import ActionSpace
+from simulator.atomic_actions import AtomicActionGenerator
+
+
+def make_state(point=6, come_points=(), pending=False, pass_levels=(), come_levels=None):
+    return {
+        'pass_line_odds_levels': list(pass_levels),
+        'come_flat_active': pending,
+        'active_come_points': list(come_points),
+        'come_odds_levels': come_levels or {},
+        'current_point': point,
+        'table_min': 10,
+    }
+
+
+def test_cache_matches_fresh_enumeration():
+    cache = ActionSpaceCache(max_combo_size=3)
+    state = make_state(point=5, come_points=[4, 9], come_levels={'4': [1]})
+
+    atomic, composites = cache.lookup(state)
+
+    expected_atomic = AtomicActionGenerator().generate_atomic_actions(state)
+    expected = [c for r in range(1, 4) for c in combinations(expected_atomic, r)]
+    assert atomic == expected_atomic
+    assert composites == expected
+
+
+def test_cache_counts_hits_and_evicts_least_recent():
+    cache = ActionSpaceCache(max_combo_size=2, maxsize=2)
+    a, b, c = make_state(point=4), make_state(point=5), make_state(point=6)
+
+    first = cache.lookup(a)
+    assert cache.lookup(a)[1] is first[1]
+    cache.lookup(b)
+    cache.lookup(c)  # evicts a
+
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 3, 2)
+    assert cache.lookup(a)[1] is not first[1]
+
+
+def test_state_key_ignores_level_order_and_table_min():
+    s1 = make_state(come_points=[5], come_levels={'5': [4, 2]})
+    s2 = dict(make_state(come_points=[5], come_levels={'5': [2, 4]}), table_min=25)
+    assert state_key(s1) == state_key(s2)
+
+
+def test_agents_with_same_config_share_a_cache():
+    from agents.classical_agent import ClassicalAgent
+    from agents.random_agent import RandomAgent
+
+    assert ClassicalAgent(max_combo_size=4).action_cache is RandomAgent(max_combo_size=4).action_cache
+    assert get_action_cache(4) is not get_action_cache(5)
+
+
+@pytest.mark.parametrize("num_atomic, max_combo_size", [(0, 3), (4, 6), (9, 4), (12, 12)])
+def test_action_space_indexes_like_the_composite_list(num_atomic, max_combo_size):
+    atomic = [f'a{i}' for i in range(num_atomic)]
+    composites = enumerate_composites(atomic, max_combo_size)
+    space = ActionSpace(atomic, max_combo_size)
+
+    assert len(space) == len(composites)
+    assert list(space) == composites
+    assert [space[i] for i in range(len(space))] == composites
+    if composites:
+        assert space[-1] == composites[-1]
+        assert space[1:5] == composites[1:5]
+    for i, combo in enumerate(composites):
+        assert space.index(combo) == i
+        assert space.rank_mask(space.mask(i)) == i
+        assert space.from_mask(sum(1 << int(a[1:]) for a in combo)) == combo
+    with pytest.raises(IndexError):
+        space[len(composites)]
+    assert ('a0', 'a0') not in space
+
+
+def test_action_space_filters_by_budget_and_samples_uniformly():
+    atomic = [f'a{i}' for i in range(8)]
+    costs = [1, 5, 2, 6, 3, 3, 10, 4]
+    space = ActionSpace(atomic, 4)
+    cost = dict(zip(atomic, costs))
+
+    expected = [c for c in space if sum(cost[a] for a in c) <= 9 and 'a2' not in c]
+    assert list(space.filter(lambda c: 'a2' not in c, costs=costs, budget=9)) == expected
+
+    counts = np.zeros(len(space))
+    rng = np.random.default_rng(5)
+    for _ in range(40_000):
+        counts[space.index(space.sample(rng))] += 1
+    # Chi-square against the uniform distribution: with k - 1 degrees of
+    # freedom the statistic has mean k - 1 and sd sqrt(2(k - 1))
+    expected = 40_000 / len(space)
+    chi2 = ((counts - expected) ** 2 / expected).sum()
+    dof = len(space) - 1
+    assert chi2 < dof + 5 * np.sqrt(2 * dof)
+
+    # A draw that skipped a slice of the space would fail the same bound
+    skewed = counts.copy()
+    skewed[:10] = 0
+    skewed[10:] *= 40_000 / skewed.sum()
+    assert ((skewed - expected) ** 2 / expected).sum() > dof + 5 * np.sqrt(2 * dof)
+
+
+def test_random_agent_draws_from_the_space_without_listing_it():
+    import random
+    from agents.random_agent import RandomAgent
+
+    agent = RandomAgent(max_combo_size=10, rng=np.random.default_rng(0))
+    agent.current_point = 6
+    agent.point_established = True
+    agent.table.point_set()
+    agent.update_action_space()
+    space = agent.legal_actions
+    assert isinstance(space, ActionSpace) and space.atomic
+    assert agent.choose_action() in space
+
+    # With the random module the draw is random.choice's over the full list
+    agent.rng = None
+    random.seed(3)
+    drawn = agent.choose_action()
+    random.seed(3)
+    assert drawn == random.choice(list(space))
+
+    agent.bankroll = 0
+    assert agent.choose_action() is None
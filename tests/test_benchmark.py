@@ -0,0 +1,23 @@
+# tests/test_benchmark.py
+
+from utils.benchmark import compare, time_call, save_results, load_results
+
+
+def test_compare_flags_only_slowdowns_beyond_tolerance():
+    baseline = {'roll_dice': 1e-6, 'play_game': 1e-3, 'removed': 1.0}
+    results = {'roll_dice': 1.2e-6, 'play_game': 2e-3, 'added': 1.0}
+
+    rows = {name: (ratio, regressed) for name, _, _, ratio, regressed in compare(results, baseline, 0.25)}
+    assert set(rows) == {'roll_dice', 'play_game'}
+    assert rows['roll_dice'][1] is False
+    assert rows['play_game'] == (2.0, True)
+
+
+def test_results_round_trip_and_timing(tmp_path):
+    calls = []
+    seconds = time_call(lambda: calls.append(1), repeat=2, min_time=0.001)
+    assert seconds > 0 and len(calls) > 2
+
+    path = str(tmp_path / "bench" / "baseline.json")
+    save_results(path, {'noop': seconds})
+    assert load_results(path) == {'noop': seconds}
@@ -0,0 +1,59 @@
+# tests/test_compiled.py
+
+import pytest
+import numpy as np
+
+from simulator.compiled import (
+    compile_fixed_policy, compile_policy, agent_policy, play_compiled, play_compiled_vectorized
+)
+from simulator.dice import DiceTape
+from simulator.game_engine import play_game
+from simulator.vector_engine import play_games_vectorized
+from agents.fixed_policy_agent import FixedPolicyAgent
+
+
+@pytest.mark.parametrize("odds_multiple, max_come_bets, starting_bankroll, walkaway", [
+    (0, 0, 1000, None),
+    (2, 2, 1000, None),
+    (3, 4, 45, 150),
+])
+def test_compiled_policy_plays_like_play_game(tmp_path, odds_multiple, max_come_bets, starting_bankroll,
+                                              walkaway):
+    compiled = compile_fixed_policy(odds_multiple, max_come_bets, cache_dir=str(tmp_path))
+    agent = FixedPolicyAgent(odds_multiple=odds_multiple, max_come_bets=max_come_bets,
+                             starting_bankroll=starting_bankroll, walkaway_threshold=walkaway)
+
+    tape = DiceTape.generate(np.random.default_rng(11), 20_000)
+    reference, replay = tape.reader(), tape.reader()
+    for _ in range(500):
+        assert play_compiled(compiled, replay, starting_bankroll, walkaway) == play_game(agent, reference)
+    assert replay.cursor == reference.cursor
+
+    # Same dice consumption as the lockstep engine
+    expected = play_games_vectorized(400, np.random.default_rng(3), odds_multiple, max_come_bets,
+                                     starting_bankroll, walkaway_threshold=walkaway)
+    finals = play_compiled_vectorized(compiled, 400, np.random.default_rng(3), starting_bankroll, walkaway)
+    assert np.array_equal(finals, expected)
+
+
+def test_compiled_tables_are_cached_and_agents_compile_alike(tmp_path):
+    first = compile_fixed_policy(2, 2, cache_dir=str(tmp_path))
+    assert len(list(tmp_path.iterdir())) == 1
+    cached = compile_fixed_policy(2, 2, cache_dir=str(tmp_path))
+    assert cached.states == first.states and cached.actions == first.actions
+    assert np.array_equal(cached.next_state, first.next_state)
+    assert np.array_equal(cached.payout, first.payout)
+
+    # Another configuration gets its own file
+    compile_fixed_policy(2, 2, table_minimum=25, cache_dir=str(tmp_path))
+    assert len(list(tmp_path.iterdir())) == 2
+
+    # Asking the agent itself gives the same tables as the policy function
+    from_agent = compile_policy(agent_policy(FixedPolicyAgent(odds_multiple=2, max_come_bets=2)))
+    assert from_agent.actions == first.actions
+    assert np.array_equal(from_agent.next_state, first.next_state)
+    assert np.array_equal(from_agent.wager, first.wager)
+
+    from agents.random_agent import RandomAgent
+    with pytest.raises(ValueError):
+        agent_policy(RandomAgent())
@@ -0,0 +1,57 @@
+# tests/test_diagnostics.py
+
+import csv
+import numpy as np
+
+from utils.diagnostics import DiagnosticsSink, read_columnar
+
+COLUMNS = (("agent", "str"), ("game_number", "int64"), ("count", "int64"), ("bankroll", "float64"))
+
+
+def test_sink_writes_csv_and_columnar(tmp_path):
+    base = tmp_path / "agent_diagnostics"
+    rows = [["classical", i, None if i % 3 == 0 else i * 2, 1000.0 - i] for i in range(10)]
+
+    with DiagnosticsSink(str(base), columns=COLUMNS, formats=("csv", "colbin"), flush_rows=4) as sink:
+        for row in rows:
+            sink.append(row)
+        # Two full batches are already on disk, the rest waits for close
+        assert sink.rows_written == 8
+    assert sink.rows_written == 10
+
+    with open(f"{base}.csv", newline="") as f:
+        lines = list(csv.reader(f))
+    assert lines[0] == [name for name, _ in COLUMNS]
+    assert lines[1] == ["classical", "0", "", "1000.0"]
+    assert len(lines) == 11
+
+    cols = read_columnar(f"{base}.colbin")
+    assert list(cols["agent"]) == ["classical"] * 10
+    assert cols["game_number"].tolist() == list(range(10))
+    assert cols["count"].tolist() == [row[2] for row in rows]
+    assert np.array_equal(cols["bankroll"], [row[3] for row in rows])
+
+
+def test_sink_flushes_on_time_threshold(tmp_path):
+    base = tmp_path / "timed"
+    sink = DiagnosticsSink(str(base), columns=COLUMNS, flush_rows=1000, flush_interval=0.0)
+    sink.append(["random", 0, 1, 990.0])
+    assert sink.rows_written == 1
+    sink.close()
+    sink.close()
+    assert sink.closed
+
+
+def test_simulate_agent_reports_phase_timings(tmp_path, monkeypatch):
+    from simulator.simulator import simulate_agent
+    from agents.classical_agent import ClassicalAgent
+
+    monkeypatch.chdir(tmp_path)
+    agent = ClassicalAgent(starting_bankroll=1000, table_minimum=10)
+    simulate_agent(agent, np.random.default_rng(1), num_games=5, diagnostics_formats=("colbin",),
+                   phase_timing=True)
+
+    cols = read_columnar("data/classical_diagnostics.colbin")
+    assert len(cols["roll_calls"]) == 5
+    assert (cols["roll_calls"] == cols["resolve_calls"]).all()
+    assert (cols["choose_sec"] >= 0).all()
@@ -0,0 +1,112 @@
+# tests/test_events.py
+
+import random
+
+import numpy as np
+import pytest
+
+from agents.fixed_policy_agent import FixedPolicyAgent
+from agents.random_agent import RandomAgent
+from agents.classical_agent import ClassicalAgent
+from agents.quantum_agent import QuantumAgent
+from agents.qbist_agent import QBistAgent
+from simulator.events import (
+    play_game_events, record_games, EventLogReader, EventLogWriter, GAME_START, GAME_END, ROLL, BET_PLACED, BET_WON,
+    SEVEN_OUT, POINT_SET
+)
+from simulator.simulator import simulate_agent
+from simulator.dice import DiceRoller
+from simulator.game_engine import play_game
+from utils.benchmark import time_call
+
+
+def test_event_stream_replays_play_game(tmp_path):
+    path = tmp_path / "events.log"
+    expected = simulate_agent(FixedPolicyAgent(odds_multiple=2, max_come_bets=2),
+                              np.random.default_rng(9), num_games=200, diagnostics_formats=())
+    history = record_games(FixedPolicyAgent(odds_multiple=2, max_come_bets=2),
+                           np.random.default_rng(9), 200, str(path), flush_events=64)
+
+    assert history == expected
+    log = EventLogReader(str(path))
+    assert list(log.final_bankrolls()) == expected
+
+    # Every game's cash flow adds up to its final bankroll
+    for game in log.games():
+        kind, amount = game['kind'], game['amount']
+        assert kind[0] == GAME_START and kind[-1] == GAME_END
+        net = amount[kind == BET_WON].sum() + amount[kind == SEVEN_OUT].sum() - amount[kind == BET_PLACED].sum()
+        assert amount[0] + net == amount[-1]
+
+    # The logged dice replay the same games
+    replay = simulate_agent(FixedPolicyAgent(odds_multiple=2, max_come_bets=2),
+                            log.dice_tape().reader(), num_games=200, diagnostics_formats=())
+    assert replay == expected
+
+
+def test_events_carry_bets_and_numbers():
+    # Point of 6, then a 6 pays the pass line and its odds
+    rolls = iter([6, 6, 7])
+
+    class Scripted:
+        def roll(self):
+            return next(rolls)
+
+    agent = FixedPolicyAgent(odds_multiple=1)
+    events = list(play_game_events(agent, Scripted()))
+    names = [event.name for event in events]
+
+    assert names[:4] == ['game_start', 'bet_placed', 'roll', 'point_set']
+    assert events[3].kind == POINT_SET and events[3].number == 6
+    assert events[4].kind == BET_PLACED and events[4].bet.label == 'pass_line_odds_$5'
+    won = [event for event in events if event.kind == BET_WON]
+    assert [event.bet.label for event in won] == ['pass_line_flat', 'pass_line_odds_$5']
+    assert all(event.number == 6 for event in won)
+    assert sum(event.kind == ROLL for event in events) == 3
+    assert names[-1] == 'game_end' and events[-1].amount == agent.bankroll
+
+
+def test_event_stream_is_lazy():
+    # Asking for the first events plays only as far as they need
+    rolls = []
+
+    class Counting:
+        def roll(self):
+            rolls.append(6 if not rolls else 7)
+            return rolls[-1]
+
+    events = play_game_events(FixedPolicyAgent(odds_multiple=1), Counting())
+    assert [next(events).name for _ in range(4)] == ['game_start', 'bet_placed', 'roll', 'point_set']
+    assert len(rolls) == 1
+
+    rest = list(events)
+    assert rest[-1].name == 'game_end' and len(rolls) == 2
+
+
+def test_event_log_writer_throughput(tmp_path):
+    with EventLogWriter(str(tmp_path / "events.log"), flush_events=1 << 12) as log:
+        seconds = time_call(lambda: log.report(ROLL, 6, None, 0.0), repeat=3, min_time=0.05)
+    # About a microsecond per event here; a floor well below that catches
+    # the writer falling back to per-event objects or writes
+    assert 1 / seconds > 250_000
+
+
+@pytest.mark.parametrize("AgentClass, num_games", [
+    (FixedPolicyAgent, 60), (RandomAgent, 60), (ClassicalAgent, 60), (QuantumAgent, 30), (QBistAgent, 5)
+])
+def test_recorded_games_match_play_game_for_every_agent(tmp_path, AgentClass, num_games):
+    random.seed(4)
+    agent = AgentClass()
+    rolls = DiceRoller(np.random.default_rng(8))
+    expected = [play_game(agent, rolls) for _ in range(num_games)]
+
+    random.seed(4)
+    history = record_games(AgentClass(), np.random.default_rng(8), num_games, str(tmp_path / "events.log"))
+    assert history == expected
+
+    log = EventLogReader(str(tmp_path / "events.log"))
+    for game, final in zip(log.games(), expected):
+        kind, amount = game['kind'], game['amount']
+        net = amount[kind == BET_WON].sum() + amount[kind == SEVEN_OUT].sum() - amount[kind == BET_PLACED].sum()
+        assert amount[0] + net == pytest.approx(final, rel=1e-12)
+        assert amount[-1] == final
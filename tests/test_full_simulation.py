@@ -49,3 +49,188 @@ def test_full_simulation(AgentClass):
     for bet in agent.bets:
         assert bet['amount'] >= table_minimum, "Bet amount less than table minimum"
         assert isinstance(bet['type'], str), "Bet type is not string"
+
+
+def test_parallel_runs_are_deterministic_and_ordered():
+    from simulator.parallel import run_agents_parallel
+
+    specs = [
+        ("random", RandomAgent, dict(starting_bankroll=1000, table_minimum=10)),
+        ("classical", ClassicalAgent, dict(starting_bankroll=1000, table_minimum=10)),
+    ]
+    pooled = run_agents_parallel(specs, seed=7, num_games=20, max_workers=2)
+    inline = run_agents_parallel(specs, seed=7, num_games=20, max_workers=1)
+
+    assert [run.key for run in pooled] == ["random", "classical"]
+    assert [run.history for run in pooled] == [run.history for run in inline]
+
+    # An agent's stream depends on its position, not on the other agents
+    alone = run_agents_parallel(specs[:1], seed=7, num_games=20, max_workers=1)
+    assert alone[0].history == inline[0].history
+
+
+def test_streaming_stats_match_batch_statistics():
+    from simulator.replicates import StreamingStats
+
+    rng = np.random.default_rng(0)
+    histories = [rng.normal(1000, 50, size=rng.integers(5, 11)) for _ in range(30)]
+
+    halves = [StreamingStats(10), StreamingStats(10)]
+    for i, history in enumerate(histories):
+        halves[i % 2].update(history)
+    halves[0].merge(halves[1])
+    summary = halves[0].summary()
+
+    for game, row in summary.iterrows():
+        values = [h[game] for h in histories if len(h) > game]
+        assert row['replicates'] == len(values)
+        assert row['mean'] == pytest.approx(np.mean(values))
+        assert row['std'] == pytest.approx(np.std(values, ddof=1))
+        assert row['min'] == min(values) and row['max'] == max(values)
+        assert row['ci_low'] < row['mean'] < row['ci_high']
+
+    # The level travels with the interval, and a lower one is narrower
+    narrow = halves[0].summary(confidence=0.5)
+    assert (narrow['confidence'] == 0.5).all() and (summary['confidence'] == 0.95).all()
+    assert (narrow['ci_high'] - narrow['ci_low'] < summary['ci_high'] - summary['ci_low']).all()
+
+
+def test_replicates_do_not_depend_on_worker_count():
+    from simulator.replicates import run_replicates
+
+    params = dict(starting_bankroll=1000, table_minimum=10)
+    inline = run_replicates(ClassicalAgent, params, 20, 15, seed=3, max_workers=1).summary()
+    pooled = run_replicates(ClassicalAgent, params, 20, 15, seed=3, max_workers=2).summary()
+    assert inline.equals(pooled)
+    assert inline['replicates'].iloc[0] == 20
+
+
+def test_history_spills_to_memmap_and_crosses_processes(tmp_path):
+    import os
+    import pickle
+    from agents.fixed_policy_agent import FixedPolicyAgent
+    from simulator.parallel import run_agents_parallel
+
+    agent = FixedPolicyAgent(odds_multiple=1)
+    in_memory = simulate_agent(agent, np.random.default_rng(2), num_games=300, diagnostics_formats=())
+    spilled = simulate_agent(agent, np.random.default_rng(2), num_games=300, diagnostics_formats=(),
+                             spill_after=64, spill_dir=str(tmp_path))
+
+    assert not in_memory.spilled and spilled.spilled
+    assert spilled == in_memory and len(spilled) == 300
+    assert np.shares_memory(np.asarray(spilled), spilled.values)
+
+    # A spilled history is passed by file, not by value
+    copy = pickle.loads(pickle.dumps(spilled))
+    assert copy.path == spilled.path and copy == in_memory
+
+    specs = [("fixed", FixedPolicyAgent, dict(odds_multiple=1)), ("flat", FixedPolicyAgent, dict(odds_multiple=0))]
+    pooled = run_agents_parallel(specs, seed=4, num_games=200, max_workers=2, diagnostics_formats=(),
+                                 spill_after=32)
+    inline = run_agents_parallel(specs, seed=4, num_games=200, max_workers=1, diagnostics_formats=())
+    assert all(run.history.spilled for run in pooled)
+    assert [run.history for run in pooled] == [run.history for run in inline]
+
+    for history in [spilled] + [run.history for run in pooled]:
+        path = history.path
+        history.release()
+        assert not os.path.exists(path)
+
+
+@pytest.mark.parametrize("AgentClass", [RandomAgent, ClassicalAgent])
+def test_resumed_run_matches_uninterrupted_run(tmp_path, monkeypatch, AgentClass):
+    import random
+    from simulator.dice import DiceRoller
+    from utils.diagnostics import read_columnar
+
+    monkeypatch.chdir(tmp_path)
+    formats = ("csv", "colbin")
+
+    class Crash(Exception):
+        pass
+
+    class FailingRoller(DiceRoller):
+        # Dies partway through a game, after `limit` rolls
+        def __init__(self, rng, limit):
+            super().__init__(rng)
+            self.limit = limit
+
+        def roll(self):
+            self.limit -= 1
+            if self.limit < 0:
+                raise Crash()
+            return super().roll()
+
+    def read_outputs(name):
+        with open(f"data/{name}_diagnostics.csv") as f:
+            # Everything but the decision time column
+            csv_rows = [line.rsplit(",", 1)[0] for line in f]
+        columns = read_columnar(f"data/{name}_diagnostics.colbin")
+        return csv_rows, {k: v.tolist() for k, v in columns.items() if k != "decision_time_sec"}
+
+    random.seed(1)
+    agent = AgentClass(starting_bankroll=1000, table_minimum=10)
+    expected = simulate_agent(agent, np.random.default_rng(5), num_games=60, diagnostics_formats=formats)
+    expected_outputs = read_outputs(agent.name)
+
+    checkpoint = str(tmp_path / "run.ckpt")
+    random.seed(1)
+    agent = AgentClass(starting_bankroll=1000, table_minimum=10)
+    with pytest.raises(Crash):
+        simulate_agent(agent, FailingRoller(np.random.default_rng(5), 150), num_games=60,
+                       diagnostics_formats=formats, checkpoint_path=checkpoint, checkpoint_every=7)
+
+    # A fresh process: new agent, differently seeded streams
+    random.seed(99)
+    agent = AgentClass(starting_bankroll=1000, table_minimum=10)
+    resumed = simulate_agent(agent, np.random.default_rng(0), num_games=60, diagnostics_formats=formats,
+                             checkpoint_path=checkpoint, checkpoint_every=7, resume=True)
+
+    assert resumed == expected
+    assert read_outputs(agent.name) == expected_outputs
+
+    # Resuming a finished run changes nothing
+    again = simulate_agent(AgentClass(starting_bankroll=1000, table_minimum=10), np.random.default_rng(0),
+                           num_games=60, diagnostics_formats=formats, checkpoint_path=checkpoint, resume=True)
+    assert again == expected
+    assert read_outputs(agent.name) == expected_outputs
+
+
+def test_checkpoint_holds_run_state_and_refuses_other_setups(tmp_path, monkeypatch):
+    from simulator.checkpoint import load_checkpoint
+
+    monkeypatch.chdir(tmp_path)
+    checkpoint = str(tmp_path / "run.ckpt")
+    simulate_agent(ClassicalAgent(table_minimum=10), np.random.default_rng(3), num_games=5,
+                   diagnostics_formats=(), checkpoint_path=checkpoint)
+
+    # Only what carries between games is saved, not the agent's caches
+    saved = load_checkpoint(checkpoint)
+    assert set(saved['agent']) == {'bankroll', 'decision_state'}
+
+    # Defaults spelled out are the same setup; a different one is refused
+    simulate_agent(ClassicalAgent(table_minimum=10, max_combo_size=6), np.random.default_rng(3), num_games=5,
+                   diagnostics_formats=(), checkpoint_path=checkpoint, resume=True)
+    with pytest.raises(ValueError, match="table_minimum"):
+        simulate_agent(ClassicalAgent(table_minimum=25), np.random.default_rng(3), num_games=5,
+                       diagnostics_formats=(), checkpoint_path=checkpoint, resume=True)
+
+
+def test_specs_of_one_class_keep_separate_diagnostics(tmp_path, monkeypatch):
+    from simulator.parallel import run_agents_parallel
+
+    monkeypatch.chdir(tmp_path)
+    specs = [
+        ("cheap", ClassicalAgent, dict(table_minimum=5)),
+        ("steep", ClassicalAgent, dict(table_minimum=25)),
+    ]
+    first = run_agents_parallel(specs, seed=2, num_games=30, max_workers=2, checkpoint_dir="ck",
+                                checkpoint_every=4)
+    outputs = {run.key: open(run.diagnostics["csv"]).read() for run in first}
+    assert set(outputs) == {"cheap", "steep"} and outputs["cheap"] != outputs["steep"]
+
+    resumed = run_agents_parallel(specs, seed=2, num_games=30, max_workers=2, checkpoint_dir="ck",
+                                  checkpoint_every=4, resume=True)
+    assert [run.history for run in resumed] == [run.history for run in first]
+    for run in resumed:
+        assert open(run.diagnostics["csv"]).read().count("\n") == outputs[run.key].count("\n")
@@ -23,3 +23,232 @@ def test_build_game_state_structure():
     assert state['come_odds_levels'] == {'6': [10]}       # updated from {6: [2]}
     assert state['current_point'] == 5
     assert state['table_min'] == 10
+
+def test_dice_roller_matches_scalar_rolls():
+    import numpy as np
+    from simulator.dice import DiceRoller
+
+    rng = np.random.default_rng(7)
+    expected = [game_engine.roll_dice(rng) for _ in range(25)]
+
+    # Small block size forces several refills
+    roller = DiceRoller(np.random.default_rng(7), block_size=4)
+    rolls = [roller.roll() for _ in range(25)]
+
+    assert rolls == expected
+    assert all(2 <= r <= 12 for r in rolls)
+
+def test_play_game_accepts_roll_source():
+    import numpy as np
+    from simulator.dice import DiceRoller
+    from agents.classical_agent import ClassicalAgent
+
+    a = ClassicalAgent(starting_bankroll=1000, table_minimum=10)
+    b = ClassicalAgent(starting_bankroll=1000, table_minimum=10)
+    rng = np.random.default_rng(3)
+    roller = DiceRoller(np.random.default_rng(3))
+
+    for _ in range(20):
+        assert game_engine.play_game(a, rng) == game_engine.play_game(b, roller)
+
+def test_bet_records_are_interned():
+    from simulator.bets import parse_bet, get_bet, COME_ODDS, PASS_LINE_ODDS
+
+    bet = parse_bet('come_odds_$10_6')
+    assert bet is get_bet(COME_ODDS, 10, 6)
+    assert (bet.kind, bet.amount, bet.point) == (COME_ODDS, 10, 6)
+    assert bet.label == 'come_odds_$10_6'
+    assert parse_bet('pass_line_odds_$6') is get_bet(PASS_LINE_ODDS, 6)
+    assert game_engine.parse_come_odds_bet('come_odds_$10_6') == (10, 6)
+    assert game_engine.parse_pass_line_odds_bet('come_flat') is None
+
+def test_atomic_actions_are_bet_records():
+    from simulator.atomic_actions import AtomicActionGenerator
+    from simulator.bets import Bet
+
+    state = {
+        'pass_line_odds_levels': [5],
+        'come_flat_active': False,
+        'active_come_points': [4],
+        'come_odds_levels': {'4': [2]},
+        'current_point': 6,
+    }
+    actions = AtomicActionGenerator().generate_atomic_actions(state)
+
+    assert all(isinstance(a, Bet) for a in actions)
+    assert [a.label for a in actions] == [
+        'pass_line_odds_$10', 'pass_line_odds_$15', 'come_flat',
+        'come_odds_$1_4', 'come_odds_$3_4',
+    ]
+
+def test_table_state_tracks_placed_and_moved_bets():
+    from agents.classical_agent import ClassicalAgent
+
+    agent = ClassicalAgent(starting_bankroll=1000, table_minimum=10)
+    agent.start_new_game()
+    agent.current_point = 6
+    agent.add_bet('pass_line_odds_$10', 10)
+    agent.add_bet('come_flat', 10)
+    assert agent.game_state()['come_flat_active'] is True
+
+    # The come bet travels to the 5 and gets backed with odds
+    agent.active_come_points.add(5)
+    agent.table.come_bet_moved()
+    agent.bets.move_pending(5)
+    agent.add_bet('come_odds_$4_5', 4)
+
+    state = agent.game_state()
+    assert state['pass_line_odds_levels'] == [10]
+    assert state['come_flat_active'] is False
+    assert state['active_come_points'] == [5]
+    assert state['come_odds_levels'] == {'5': [4]}
+    assert agent.table.come_bets == 1
+    assert game_engine.build_game_state(agent) == state
+
+    # Random, Quantum and QBist agents treat any come bet as blocking another
+    from agents.random_agent import RandomAgent
+    blocked = RandomAgent(starting_bankroll=1000, table_minimum=10)
+    blocked.start_new_game()
+    blocked.current_point = 6
+    blocked.add_bet('come_flat', 10)
+    blocked.active_come_points.add(5)
+    blocked.table.come_bet_moved()
+    blocked.bets.move_pending(5)
+    assert blocked.game_state()['come_flat_active'] is True
+    assert game_engine.build_game_state(blocked) == blocked.game_state()
+
+def test_play_game_skips_unchanged_decisions():
+    import numpy as np
+    from agents.classical_agent import ClassicalAgent
+
+    class CountingAgent(ClassicalAgent):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.decisions = 0
+
+        def choose_action(self):
+            self.decisions += 1
+            return super().choose_action()
+
+    results = {}
+    for reuse in (True, False):
+        agent = CountingAgent(starting_bankroll=1000, table_minimum=10)
+        agent.deterministic_policy = reuse
+        rng = np.random.default_rng(99)
+        finals = [game_engine.play_game(agent, rng) for _ in range(30)]
+        results[reuse] = (finals, agent.decisions)
+
+    assert results[True][0] == results[False][0]
+    assert results[True][1] < results[False][1]
+
+
+def test_dice_tape_replays_the_roller_sequence(tmp_path):
+    import numpy as np
+    import pytest
+    from simulator.dice import DiceRoller, DiceTape
+
+    path = str(tmp_path / "tape.npy")
+    tape = DiceTape.generate(np.random.default_rng(11), 5000, path=path, block_size=999)
+    roller = DiceRoller(np.random.default_rng(11))
+    expected = [roller.roll() for _ in range(5000)]
+
+    reader = DiceTape.load(path).reader(block_size=64)
+    assert [reader.roll() for _ in range(5000)] == expected
+    assert reader.cursor == 5000
+    with pytest.raises(ValueError):
+        reader.roll()
+
+    # Readers are independent and can start anywhere
+    a, b = tape.reader(), tape.reader(start=10)
+    assert [a.roll() for _ in range(12)][10:] == [b.roll(), b.roll()]
+    assert (a.cursor, b.cursor) == (12, 12)
+
+
+def test_agents_share_dice_through_a_tape():
+    import numpy as np
+    from simulator.dice import DiceTape
+    from simulator.simulator import simulate_agent
+    from agents.classical_agent import ClassicalAgent
+
+    tape = DiceTape.generate(np.random.default_rng(5), 20000)
+    histories = []
+    for _ in range(2):
+        agent = ClassicalAgent(starting_bankroll=1000, table_minimum=10)
+        histories.append(simulate_agent(agent, tape.reader(), num_games=30))
+    assert histories[0] == histories[1]
+
+    agent = ClassicalAgent(starting_bankroll=1000, table_minimum=10)
+    assert simulate_agent(agent, np.random.default_rng(5), num_games=30) == histories[0]
+
+
+def test_phase_timings_count_every_phase():
+    import numpy as np
+    from simulator.dice import DiceRoller
+    from simulator.game_engine import PhaseTimings, PHASES, ROLL, RESOLVE, UPDATE, CHOOSE
+    from agents.classical_agent import ClassicalAgent
+
+    agent = ClassicalAgent(starting_bankroll=1000, table_minimum=10)
+    plain = game_engine.play_game(agent, DiceRoller(np.random.default_rng(4)))
+
+    timings = PhaseTimings()
+    rolls = DiceRoller(np.random.default_rng(4))
+    assert game_engine.play_game(agent, rolls, timings) == plain
+
+    # Every roll is resolved, and every decision is an update and a choice
+    assert timings.calls[ROLL] == timings.calls[RESOLVE] > 0
+    assert timings.calls[UPDATE] == timings.calls[CHOOSE]
+    assert all(seconds >= 0 for seconds in timings.seconds)
+    assert set(timings.as_dict()) == {f'{p}_{k}' for p in PHASES for k in ('sec', 'calls')}
+
+def test_payout_matrix_matches_payout_table():
+    from simulator.payouts import PAYOUT_TABLE
+    from simulator.payout_matrix import PAYOUT_MATRIX, PayoutMatrix
+    from simulator.bets import parse_bet
+    from agents.classical_agent import ClassicalAgent
+
+    for ((label,), outcome), payout in PAYOUT_TABLE.items():
+        assert PAYOUT_MATRIX.rate(parse_bet(label), outcome) == payout
+    assert PAYOUT_MATRIX.rate('come_flat', 'win_6') == 0.0
+    assert PAYOUT_MATRIX.rate('come_flat', 'no_such_outcome') == 0.0
+
+    # Outcomes outside the standard set get their own codes
+    custom = PayoutMatrix({(('come_flat',), 'hop_11'): 15.0})
+    assert custom.rate('come_flat', 'hop_11') == 15.0
+    assert custom.matrix(['come_flat', 'pass_line_flat'], ['hop_11', 'win']).tolist() == [[15.0, 0.0], [0.0, 0.0]]
+
+    # Replacing an agent's payout dict recompiles it
+    agent = ClassicalAgent()
+    assert agent.payout_table == {} and agent.payouts.rate('come_flat', 'win') == 0.0
+    agent.payout_table = {(('come_flat',), 'win'): 2.0}
+    assert agent.payouts.rate('come_flat', 'win') == 2.0
+    assert agent.lookup_payout(('come_flat',), 'win') == 2.0
+
+def test_bet_ledger_buckets_and_settlement():
+    from simulator.ledger import BetLedger
+    from agents.classical_agent import ClassicalAgent
+
+    agent = ClassicalAgent()
+    agent.bets = [{'type': 'pass_line_flat', 'amount': 10}]
+    assert isinstance(agent.bets, BetLedger)
+    agent.add_bet('pass_line_odds_$5', 5)
+    agent.add_bet('come_flat', 10)
+    agent.add_bet('come_flat', 10)
+
+    ledger = agent.bets
+    assert [b.label for _, b in ledger.pass_odds] == ['pass_line_odds_$5']
+    assert len(ledger.pending) == 2
+    assert ledger.move_pending(8) == 2
+    assert [placed.get('point') for placed, _ in ledger.numbers[8]] == [8, 8]
+    agent.add_bet('come_odds_$10_8', 10)
+    agent.add_bet('come_flat', 10)
+    assert [b.label for _, b in ledger.numbers[8]] == ['come_flat', 'come_flat', 'come_odds_$10_8']
+
+    # Pending come bets leave the list in one pass
+    dropped = ledger.drop_pending()
+    assert len(dropped) == 1 and len(ledger) == 5 and not ledger.pending
+
+    # Negative multiples lose, positive ones pay amount * multiple
+    paid = ledger.settle([1.0, -1.0, 0.0, 0.5, -1.0])
+    assert paid == 15.0
+    assert [placed['type'] for placed in ledger] == ['pass_line_flat', 'come_flat', 'come_flat']
+    assert not ledger.pass_odds and [b.label for _, b in ledger.numbers[8]] == ['come_flat', 'come_flat']
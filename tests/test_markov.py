@@ -0,0 +1,79 @@
+# tests/test_markov.py
+
+import pytest
+import numpy as np
+
+from agents.classical_agent import ClassicalAgent
+from agents.fixed_policy_agent import FixedPolicyAgent
+from simulator.markov import (MarkovEvaluator, COME_OUT, evaluate_agent, evaluate_fixed_policy,
+                              fixed_policy)
+from simulator.payouts import PAYOUT_TABLE
+from simulator.vector_engine import play_games_vectorized
+from utils.benchmark import time_call
+
+
+def test_flat_only_policy_matches_closed_form():
+    ways = {4: 3, 5: 4, 6: 5, 8: 5, 9: 4, 10: 3}
+    result = evaluate_fixed_policy(odds_multiple=0, max_come_bets=0)
+
+    # No win at all: craps on the first roll, or a point that sevens out
+    p_no_win = 4 / 36 + sum(w / 36 * 6 / (w + 6) for w in ways.values())
+    assert result.net_results[-10.0] == pytest.approx(p_no_win, abs=1e-12)
+
+    # 7/11 wins before leaving the come-out, then point hits before the seven
+    expected_wins = 8 / 28 + sum(w / 28 * w / 6 for w in ways.values())
+    assert result.expected_bankroll == pytest.approx(990 + 10 * expected_wins, abs=1e-9)
+    assert sum(result.net_results.values()) + result.truncated_mass == pytest.approx(1.0, abs=1e-12)
+    assert result.bust_probability == 0.0
+
+
+@pytest.mark.parametrize("odds_multiple, max_come_bets, starting_bankroll, walkaway", [
+    (1, 0, 20, None),
+    (2, 1, 40, None),
+    (3, 2, 45, 120),
+])
+def test_exact_evaluation_agrees_with_simulation(odds_multiple, max_come_bets, starting_bankroll, walkaway):
+    result = evaluate_fixed_policy(odds_multiple, max_come_bets, starting_bankroll=starting_bankroll,
+                                   walkaway_threshold=walkaway)
+    finals = play_games_vectorized(200_000, np.random.default_rng(9), odds_multiple, max_come_bets,
+                                   starting_bankroll=starting_bankroll, walkaway_threshold=walkaway)
+
+    se = finals.std() / np.sqrt(len(finals))
+    assert abs(result.expected_bankroll - finals.mean()) < 5 * se
+    bust = (finals < 10).mean()
+    assert abs(result.bust_probability - bust) < 5 * np.sqrt(bust * (1 - bust) / len(finals))
+
+
+def test_solving_by_table_state_matches_roll_by_roll():
+    evaluator = MarkovEvaluator(fixed_policy(2, 2))
+    by_state = evaluator.evaluate(method='by_state')
+    rolled = evaluator.evaluate(method='roll_by_roll')
+
+    # Roll by roll leaves up to tol of mass (worth ~1000 each) unresolved
+    assert by_state.expected_bankroll == pytest.approx(rolled.expected_bankroll, abs=1e-6)
+    for net, p in rolled.net_results.items():
+        assert by_state.net_results.get(net, 0.0) == pytest.approx(p, abs=1e-12)
+
+
+def test_evaluation_is_fast_at_a_large_bankroll():
+    # Solved once per table state, not once per (table state, bankroll)
+    seconds = time_call(lambda: evaluate_fixed_policy(2, 2, starting_bankroll=1000), repeat=3)
+    assert seconds < 0.5
+
+
+def test_agents_evaluate_without_an_adapter():
+    fixed = evaluate_agent(FixedPolicyAgent(odds_multiple=2, max_come_bets=1))
+    assert fixed.net_results == pytest.approx(evaluate_fixed_policy(2, 1).net_results, abs=1e-12)
+
+    # Under the point model the pass line is the only bet worth taking
+    classical = ClassicalAgent(payout_table=PAYOUT_TABLE, ev_model='point')
+    assert MarkovEvaluator.for_agent(classical).decisions(COME_OUT._replace(point=6)) == [(5, 0, None)]
+    assert evaluate_agent(classical).net_results == pytest.approx(
+        evaluate_fixed_policy(odds_multiple=0, max_come_bets=0).net_results, abs=1e-12)
+
+
+def test_policy_without_a_finite_chain_is_refused():
+    # A come bet at every decision reaches ever more table states
+    evaluator = MarkovEvaluator(fixed_policy(0, 1000), starting_bankroll=40, walkaway_threshold=60)
+    with pytest.raises(ValueError):
+        evaluator.evaluate(max_states=500)
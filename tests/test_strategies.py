@@ -5,6 +5,7 @@ from agents.random_agent import RandomAgent
 from agents.classical_agent import ClassicalAgent
 from agents.quantum_agent import QuantumAgent
 from agents.qbist_agent import QBistAgent
+from simulator.action_cache import incidence_matrix
 
 def test_random_agent_action_choice():
     agent = RandomAgent(starting_bankroll=1000, table_minimum=10)
@@ -54,3 +55,161 @@ def test_qbist_agent_choose_action():
     agent.legal_actions = [('pass_line_flat',), ('come_flat',)]
     chosen = agent.choose_action()
     assert chosen in agent.legal_actions
+
+def test_classical_agent_bulk_ev_matches_per_combo_ev():
+    from simulator.payouts import PAYOUT_TABLE
+
+    # compute_expected_value scores a combo under outcome_probs
+    agent = ClassicalAgent(payout_table=PAYOUT_TABLE, starting_bankroll=1000,
+                           table_minimum=10, max_combo_size=4, ev_model='outcomes')
+    agent.start_new_game()
+    agent.current_point = 6
+    agent.active_come_points = {5, 9}
+    agent.update_action_space()
+
+    atomic, incidence = agent._composite_matrix()
+    bulk = agent.composite_expected_values(atomic, incidence)
+    looped = [agent.compute_expected_value(combo) for combo in agent.legal_actions]
+    assert list(bulk) == looped
+
+    # Same pick as the exhaustive loop: max EV, then minimal wager, then first
+    def wager(combo):
+        return sum(agent._get_bet_amount(bet) for bet in combo)
+    best_ev = max(looped)
+    expected = min((c for c, ev in zip(agent.legal_actions, looped) if ev == best_ev), key=wager)
+    assert agent.choose_action() == expected
+
+@pytest.mark.parametrize("bankroll", [1000, 95, 40, 12, 5])
+def test_classical_agent_branch_and_bound_matches_exhaustive(bankroll):
+    from simulator.payouts import PAYOUT_TABLE
+
+    agents = [
+        ClassicalAgent(payout_table=PAYOUT_TABLE, starting_bankroll=1000, table_minimum=10,
+                       max_combo_size=4, search=search)
+        for search in ('exhaustive', 'branch_and_bound')
+    ]
+    for point, come_points in [(6, set()), (4, {5, 9}), (10, {4, 6, 8})]:
+        picks = []
+        for agent in agents:
+            agent.start_new_game()
+            agent.current_point = point
+            agent.active_come_points = come_points
+            agent.bankroll = bankroll
+            agent.update_action_space()
+            picks.append(agent.choose_action())
+        assert picks[0] == picks[1]
+        if picks[0] is not None:
+            assert sum(agents[0]._get_bet_amount(bet) for bet in picks[0]) <= bankroll
+
+def test_classical_agent_rejects_unknown_search():
+    with pytest.raises(ValueError):
+        ClassicalAgent(search="greedy")
+
+def test_point_ev_table_matches_true_odds():
+    from simulator.ev_table import point_ev_table, POINT_INDEX
+    from simulator.atomic_actions import legal_odds_bet_amounts
+    from simulator.bets import get_bet, COME_FLAT, PASS_LINE_FLAT, PASS_LINE_ODDS, COME_ODDS
+
+    table = point_ev_table(10)
+    # The pass line's house edge is 7/495 of the flat bet, before and after the point
+    for bet in (get_bet(PASS_LINE_FLAT), get_bet(COME_FLAT)):
+        assert table[bet.code] == pytest.approx(-10 * 7 / 495)
+    # Odds bets are paid at true odds, so every legal one is worth nothing
+    for point in (4, 5, 6, 8, 9, 10):
+        for amount in legal_odds_bet_amounts(point, 3):
+            assert table[get_bet(PASS_LINE_ODDS, amount).code, POINT_INDEX[point]] == pytest.approx(0, abs=1e-12)
+            assert table[get_bet(COME_ODDS, amount, point).code] == pytest.approx(0, abs=1e-12)
+
+
+def test_classical_agent_point_ev_model():
+    from simulator.payouts import PAYOUT_TABLE
+
+    agents = [
+        ClassicalAgent(payout_table=PAYOUT_TABLE, max_combo_size=3, ev_model='point', search=search)
+        for search in ('exhaustive', 'branch_and_bound')
+    ]
+    for agent in agents:
+        agent.start_new_game()
+        agent.current_point = 5
+        agent.active_come_points = {8}
+        agent.update_action_space()
+    picks = [agent.choose_action() for agent in agents]
+
+    # Zero-EV odds beat the come bet; the cheapest one wins the tie
+    assert picks[0] == picks[1]
+    assert [bet.label for bet in picks[0]] == ['pass_line_odds_$2']
+    with pytest.raises(ValueError):
+        ClassicalAgent(ev_model="kelly")
+
+def test_quantum_agent_batched_overlaps_match_projectors():
+    import numpy as np
+    from simulator.bets import as_bet
+
+    rng = np.random.default_rng(3)
+    m = rng.normal(size=(6, 6)) + 1j * rng.normal(size=(6, 6))
+    rho = m @ m.conj().T
+    agent = QuantumAgent(starting_bankroll=1000, table_minimum=10, max_dim=4, rho=rho / np.trace(rho))
+    agent.start_new_game()
+    agent.current_point = 6
+    agent.active_come_points = {5, 9}
+    agent.update_action_space()
+
+    atomic_set = sorted({as_bet(a) for combo in agent.legal_actions for a in combo})
+    d = min(len(atomic_set), agent.max_dim)
+    overlaps = agent.action_overlaps(incidence_matrix(agent.legal_actions, atomic_set)[1], d)
+
+    state = agent.density_matrix(d)
+    for combo, overlap in zip(agent.legal_actions, overlaps):
+        vec = np.zeros((d, 1))
+        for bet in combo:
+            idx = atomic_set.index(as_bet(bet))
+            if idx < d:
+                vec[idx, 0] = 1 / np.sqrt(len(combo))
+        assert overlap == pytest.approx(np.trace(state @ vec @ vec.T).real)
+
+def test_qbist_agent_batched_scores_match_sic_sum():
+    import numpy as np
+    from simulator.bets import as_bet
+    from utils.sic_utils import sic_tensor
+
+    agent = QBistAgent(starting_bankroll=1000, table_minimum=10, max_dim=4)
+    agent.start_new_game()
+    agent.current_point = 6
+    agent.active_come_points = {5, 9}
+    agent.update_action_space()
+
+    atomic_set = sorted({as_bet(a) for combo in agent.legal_actions for a in combo})
+    d = 4
+    scores = agent.urgleichung_scores(incidence_matrix(agent.legal_actions, atomic_set)[1], d)
+
+    sic = sic_tensor(d)
+    assert sic.shape == (d**2, d, d)
+    for combo, score in zip(agent.legal_actions, scores):
+        vec = np.zeros((d, 1))
+        for bet in combo:
+            idx = atomic_set.index(as_bet(bet))
+            if idx < d:
+                vec[idx, 0] = 1 / np.sqrt(len(combo))
+        E_A = vec @ vec.T
+        tr_sum = sum(np.trace(E_A @ H_i) for H_i in sic)
+        assert score == pytest.approx(((d + 1) / d**2 * tr_sum - 1).real)
+
+def test_sic_tensor_is_cached_on_disk(tmp_path, monkeypatch):
+    import numpy as np
+    from utils import sic_utils
+
+    monkeypatch.setattr(sic_utils, "_SIC_TENSORS", {})
+    first = sic_utils.sic_tensor(3, cache_dir=tmp_path)
+    assert (tmp_path / "sic_3.npz").exists()
+
+    # A fresh process reads the file instead of recomputing
+    monkeypatch.setattr(sic_utils, "_SIC_TENSORS", {})
+    monkeypatch.setattr(sic_utils, "_compute_sic", lambda d: pytest.fail("recomputed SIC"))
+    again = sic_utils.sic_tensor(3, cache_dir=tmp_path)
+    assert np.array_equal(first, again)
+    assert sic_utils.sic_tensor(3, cache_dir=tmp_path) is again
+
+    # Another directory is not served from the first one's memo
+    monkeypatch.setattr(sic_utils, "_compute_sic", lambda d: np.array(first))
+    other = sic_utils.sic_tensor(3, cache_dir=tmp_path / "other")
+    assert other is not again and (tmp_path / "other" / "sic_3.npz").exists()
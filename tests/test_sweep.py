@@ -0,0 +1,60 @@
+# tests/test_sweep.py
+
+import numpy as np
+
+from simulator.sweep import expand_grid, run_sweep, expected_cost, load_history
+
+
+def make_spec(table_minimums, max_dims=(4,)):
+    return {
+        "num_games": 15,
+        "seed": 11,
+        "params": {"starting_bankroll": 500},
+        "agents": {
+            "fixed": {"module": "agents.fixed_policy_agent", "name": "FixedPolicyAgent",
+                      "params": {"odds_multiple": 2}},
+            "classical": {"module": "agents.classical_agent", "name": "ClassicalAgent"},
+            "quantum": {"module": "agents.quantum_agent", "name": "QuantumAgent"},
+        },
+        "grid": {"table_minimum": list(table_minimums), "max_combo_size": [2, 3], "max_dim": list(max_dims)},
+    }
+
+
+def test_grid_expands_over_the_parameters_each_agent_takes():
+    cells = expand_grid(make_spec([5, 10], max_dims=[3, 5]))
+
+    by_agent = {}
+    for cell in cells:
+        by_agent.setdefault(cell.agent, []).append(cell.params)
+    assert len(by_agent["fixed"]) == 2          # table_minimum only
+    assert len(by_agent["classical"]) == 4      # and max_combo_size
+    assert len(by_agent["quantum"]) == 4        # and max_dim
+    assert by_agent["fixed"][0] == {"odds_multiple": 2, "starting_bankroll": 500, "table_minimum": 5}
+    assert all("max_dim" not in params for params in by_agent["classical"])
+
+    quantum = [c for c in cells if c.agent == "quantum"]
+    assert expected_cost(quantum[1]) > expected_cost(quantum[0])   # max_dim 5 vs 3
+    assert max(cells, key=expected_cost).agent == "quantum"
+
+
+def test_sweep_only_computes_new_cells(tmp_path):
+    first = run_sweep(make_spec([5, 10]), results_dir=str(tmp_path), max_workers=1)
+    assert len(first) == 2 + 4 + 2 and not first["cached"].any()
+    assert (first["games"] > 0).all()
+
+    again = run_sweep(make_spec([5, 10]), results_dir=str(tmp_path), max_workers=1)
+    assert again["cached"].all()
+    assert again.drop(columns="cached").equals(first.drop(columns="cached"))
+
+    # Extending the grid computes only the new table minimum, on a pool
+    extended = run_sweep(make_spec([5, 10, 25]), results_dir=str(tmp_path), max_workers=2)
+    assert len(extended) == 12
+    assert (~extended["cached"]).sum() == 4
+    assert set(extended.loc[~extended["cached"], "table_minimum"]) == {25}
+
+    # A cell's results do not depend on the rest of the grid
+    alone = run_sweep(dict(make_spec([25]), grid={"table_minimum": [25], "max_combo_size": [2, 3],
+                                                  "max_dim": [4]}), results_dir=str(tmp_path / "alone"))
+    for digest in alone["hash"]:
+        assert np.array_equal(load_history(str(tmp_path / "alone"), digest),
+                              load_history(str(tmp_path), digest))
@@ -0,0 +1,63 @@
+# tests/test_vector_engine.py
+
+import pytest
+import numpy as np
+
+from simulator.vector_engine import play_games_vectorized
+from simulator.game_engine import play_game
+from agents.fixed_policy_agent import FixedPolicyAgent
+
+
+class ColumnRolls:
+    # Roll source replaying one column of a pre-drawn roll matrix
+    def __init__(self, column):
+        self.column = list(column)
+        self.pos = 0
+
+    def roll(self):
+        r = self.column[self.pos]
+        self.pos += 1
+        return r
+
+
+@pytest.mark.parametrize("odds_multiple, max_come_bets, starting_bankroll", [
+    (0, 0, 1000),
+    (1, 0, 1000),
+    (2, 2, 1000),
+    (3, 5, 40),
+])
+def test_vectorized_games_match_play_game(odds_multiple, max_come_bets, starting_bankroll):
+    num_games = 200
+    rng = np.random.default_rng(2024)
+    rolls = rng.integers(1, 7, size=(400, num_games, 2)).sum(axis=-1)
+
+    finals = play_games_vectorized(
+        num_games,
+        odds_multiple=odds_multiple,
+        max_come_bets=max_come_bets,
+        starting_bankroll=starting_bankroll,
+        table_minimum=10,
+        rolls=rolls
+    )
+
+    agent = FixedPolicyAgent(
+        odds_multiple=odds_multiple,
+        max_come_bets=max_come_bets,
+        starting_bankroll=starting_bankroll,
+        table_minimum=10
+    )
+    expected = [play_game(agent, ColumnRolls(rolls[:, i])) for i in range(num_games)]
+
+    np.testing.assert_array_equal(finals, expected)
+
+
+def test_vectorized_games_are_reproducible():
+    a = play_games_vectorized(1000, np.random.default_rng(5), odds_multiple=2, max_come_bets=3)
+    b = play_games_vectorized(1000, np.random.default_rng(5), odds_multiple=2, max_come_bets=3)
+    np.testing.assert_array_equal(a, b)
+    assert np.all(a >= 0)
+
+
+def test_vectorized_rejects_unknown_odds_multiple():
+    with pytest.raises(ValueError):
+        play_games_vectorized(10, np.random.default_rng(0), odds_multiple=5)